@@ -1,21 +1,85 @@
-from flask import Flask, jsonify
+import logging
+import signal
+from flask import Flask
 from flask_cors import CORS
 from config import Config
 from database.connection import Database
+from database.invalidation_bus import InvalidationBus
+from database.notify_listener import NotifyListener
 from controllers.auth_controller import auth_bp
 from controllers.password_reset_controller import password_reset_bp
+from middlewares.metrics import init_metrics
+from middlewares.profiler import init_profiler
+from services.auth_event_log import AuthEventLog
+from services.email_filter import EmailFilter
+from services.email_service import EmailService
+from services.email_validation import EmailValidation
+from services.email_templates import EmailTemplates
+from services.hashing import PasswordHasher
+from services.health_monitor import LIVE, HealthMonitor
+from services.reset_attempt_tracker import ResetAttemptTracker
+from services.token_revocation import TokenRevocation
+from utils.json_provider import OrjsonProvider
+from utils.lifecycle import Lifecycle
+from utils.log import setup_logging, shutdown_logging
+from utils.static_responses import INTERNAL_ERROR, NOT_FOUND, ROOT_INDEX
+
+logger = logging.getLogger(__name__)
 
 def create_app():
     """Factory para crear la aplicación Flask"""
     
+    # Logging estructurado con escritura en segundo plano (uno por proceso)
+    setup_logging()
+    
     app = Flask(__name__)
     
     # Configuración
     app.config.from_object(Config)
     
+    # JSON con orjson (fechas y UUID nativos)
+    app.json = OrjsonProvider(app)
+    
     # CORS
     CORS(app, origins=Config.CORS_ORIGINS, supports_credentials=True)
     
+    # Latencias, peticiones en curso y códigos por endpoint en /metrics
+    init_metrics(app)
+    
+    # Perfilado de peticiones individuales (solo si PROFILING_ENABLED)
+    init_profiler(app)
+    
+    # Peticiones en curso (para drenarlas al apagar)
+    Lifecycle.init_app(app)
+    
+    # Compilar plantillas de email una sola vez al arrancar
+    EmailTemplates.preload()
+    
+    # Pool de conexiones del proceso: los hilos de fondo no comparten la conexión
+    # de las peticiones (con gunicorn ya lo creó post_fork y esto no hace nada)
+    Database.init_pool()
+    
+    # Contadores de intentos de códigos de recuperación (en memoria + sincronización)
+    ResetAttemptTracker.start()
+    
+    # Filtro de emails registrados (se construye en segundo plano)
+    EmailFilter.start()
+    
+    # Eventos de autenticación: buffer en memoria, COPY por lotes en segundo plano
+    AuthEventLog.start()
+    
+    # Tokens revocados en memoria, sincronizados entre workers con LISTEN/NOTIFY
+    TokenRevocation.start()
+    
+    # Cachés locales (usuarios) invalidadas por los demás workers con NOTIFY
+    InvalidationBus.start()
+    
+    # Estado de salud cacheado, actualizado por una sonda en segundo plano
+    HealthMonitor.start()
+    
+    # Apagado ordenado: hilos de fondo, estado pendiente y por último conexiones
+    register_shutdown_hooks()
+    
     # Registrar blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(password_reset_bp)  # ← ESTE ES EL IMPORTANTE
@@ -23,55 +87,52 @@ def create_app():
     # Ruta de prueba
     @app.route('/health', methods=['GET'])
     def health_check():
-        """Endpoint para verificar el estado del servidor"""
-        db_status = Database.test_connection()
-        return jsonify({
-            'status': 'ok' if db_status else 'error',
-            'database': 'connected' if db_status else 'disconnected',
-            'message': 'API Ánima funcionando correctamente' if db_status else 'Error de conexión a BD'
-        }), 200 if db_status else 500
+        """Endpoint para verificar el estado del servidor (resultado de la última sonda)"""
+        return HealthMonitor.health().response()
+    
+    @app.route('/livez', methods=['GET'])
+    def liveness():
+        """El proceso responde (sin E/S)"""
+        return LIVE.response()
+    
+    @app.route('/readyz', methods=['GET'])
+    def readiness():
+        """Listo para recibir tráfico: BD, pool y cola de emails (cacheado)"""
+        return HealthMonitor.readiness().response()
     
     @app.route('/', methods=['GET'])
     def root():
         """Ruta raíz"""
-        return jsonify({
-            'message': 'API Ánima - Backend',
-            'version': '1.0.0',
-            'endpoints': {
-                'health': '/health',
-                'auth': {
-                    'register': '/auth/register',
-                    'login': '/auth/login',
-                    'verify': '/auth/verify',
-                    'me': '/auth/me'
-                },
-                'password_reset': {
-                    'request': '/auth/password/request-reset',
-                    'verify': '/auth/password/verify-code',
-                    'reset': '/auth/password/reset-password',
-                    'resend': '/auth/password/resend-code'
-                }
-            }
-        }), 200
+        return ROOT_INDEX.response()
     
     # Manejador de errores 404
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({
-            'success': False,
-            'message': 'Endpoint no encontrado'
-        }), 404
+        return NOT_FOUND.response()
     
     # Manejador de errores 500
     @app.errorhandler(500)
     def internal_error(error):
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+        return INTERNAL_ERROR.response()
     
     return app
 
+def register_shutdown_hooks():
+    """Recursos del proceso que se liberan en Lifecycle.shutdown()"""
+    Lifecycle.register('health_monitor', HealthMonitor.stop, phase='stop')
+    Lifecycle.register('mx_resolver', EmailValidation.shutdown, phase='stop')
+    Lifecycle.register('email_filter', EmailFilter.stop, phase='stop')
+    Lifecycle.register('notify_listener', NotifyListener.stop, phase='stop')
+    Lifecycle.register('auth_events', AuthEventLog.stop, phase='flush')
+    Lifecycle.register('reset_attempts', ResetAttemptTracker.stop, phase='flush')
+    Lifecycle.register('hashing', PasswordHasher.shutdown, phase='flush')
+    Lifecycle.register('email_transport', lambda: EmailService.set_transport(None), phase='flush')
+    Lifecycle.register('database', Database.close_connection, phase='close')
+    Lifecycle.register('logging', shutdown_logging, phase='final')
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
 def main():
     """Función principal para ejecutar la aplicación"""
     
@@ -79,24 +140,30 @@ def main():
     app = create_app()
     
     # Probar conexión a base de datos
-    print("\n🔍 Verificando conexión a base de datos...")
+    logger.info("🔍 Verificando conexión a base de datos...")
     if Database.test_connection():
-        print("✅ Base de datos conectada correctamente\n")
+        logger.info("✅ Base de datos conectada correctamente")
     else:
-        print("❌ Error al conectar con la base de datos\n")
+        logger.error("❌ Error al conectar con la base de datos")
         return
     
     # Mostrar rutas registradas
-    print("📋 Rutas registradas:")
     with app.app_context():
-        for rule in app.url_map.iter_rules():
-            if rule.endpoint != 'static':
-                print(f"   {rule.methods} {rule.rule}")
+        routes = [
+            f"{','.join(sorted(rule.methods))} {rule.rule}"
+            for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+        ]
+    logger.info("📋 Rutas registradas", extra={'routes': routes})
     
     # Iniciar servidor
-    print(f"\n🚀 Servidor iniciando en http://{Config.HOST}:{Config.PORT}")
-    print(f"🌍 Entorno: {'Desarrollo' if Config.DEBUG else 'Producción'}")
-    print(f"🔐 CORS habilitado para: {', '.join(Config.CORS_ORIGINS)}\n")
+    logger.info(f"🚀 Servidor iniciando en http://{Config.HOST}:{Config.PORT}", extra={
+        'environment': 'Desarrollo' if Config.DEBUG else 'Producción',
+        'cors_origins': Config.CORS_ORIGINS,
+    })
+    logger.info("💡 Servidor de desarrollo (un proceso); en producción usa: python serve.py")
+    
+    # SIGTERM sigue el mismo camino que Ctrl+C
+    signal.signal(signal.SIGTERM, _raise_interrupt)
     
     try:
         app.run(
@@ -105,9 +172,9 @@ def main():
             debug=Config.DEBUG
         )
     except KeyboardInterrupt:
-        print("\n\n⏹️  Servidor detenido")
+        logger.info("⏹️  Servidor detenido")
     finally:
-        Database.close_connection()
+        Lifecycle.shutdown()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Punto de entrada ASGI (variante asíncrona con Quart)
+
+Uso:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Cada worker abre su propio pool asíncrono al arrancar.
+"""
+from asgi_app import create_asgi_app
+
+app = create_asgi_app()
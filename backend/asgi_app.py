@@ -0,0 +1,111 @@
+from quart import Quart, Response
+from quart_cors import cors
+from config import Config
+from database.async_connection import AsyncDatabase
+from database.connection import Database
+from database.invalidation_bus import InvalidationBus
+from database.notify_listener import NotifyListener
+from controllers.async_auth_controller import auth_bp
+from controllers.async_password_reset_controller import password_reset_bp
+from middlewares.metrics import init_metrics_async
+from services.auth_event_log import AuthEventLog
+from services.email_filter import EmailFilter
+from services.email_templates import EmailTemplates
+from services.email_validation import EmailValidation
+from services.health_monitor import LIVE, HealthMonitor
+from services.hashing import PasswordHasher
+from services.reset_attempt_tracker import ResetAttemptTracker
+from services.token_revocation import TokenRevocation
+from utils.json_provider import OrjsonProvider
+from utils.lifecycle import Lifecycle
+from utils.log import setup_logging, shutdown_logging
+from utils.static_responses import INTERNAL_ERROR, NOT_FOUND, ROOT_INDEX
+
+def create_asgi_app():
+    """Factory para crear la variante ASGI (Quart) de la aplicación
+
+    Expone las mismas rutas y respuestas que create_app; las vistas son
+    corrutinas que esperan la base de datos en un pool asíncrono.
+    """
+    
+    setup_logging()
+    
+    app = Quart(__name__)
+    
+    # Configuración
+    app.config.from_object(Config)
+    
+    # JSON con orjson (fechas y UUID nativos)
+    app.json = OrjsonProvider(app)
+    
+    # CORS
+    app = cors(app, allow_origin=Config.CORS_ORIGINS, allow_credentials=True)
+    
+    # Métricas por endpoint (con --workers, definir PROMETHEUS_MULTIPROC_DIR)
+    init_metrics_async(app)
+    
+    # Registrar blueprints
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(password_reset_bp)
+    
+    @app.before_serving
+    async def startup():
+        """Recursos por proceso: se crean en cada worker de uvicorn"""
+        EmailTemplates.preload()
+        await AsyncDatabase.init_pool()
+        # Los hilos de fondo escriben con el cliente síncrono: pool propio del worker
+        Database.init_pool()
+        ResetAttemptTracker.start()
+        EmailFilter.start()
+        AuthEventLog.start()
+        TokenRevocation.start()
+        InvalidationBus.start()
+        HealthMonitor.start(pool_stats=AsyncDatabase.pool_stats)
+        Lifecycle.register('health_monitor', HealthMonitor.stop, phase='stop')
+        Lifecycle.register('mx_resolver', EmailValidation.shutdown, phase='stop')
+        Lifecycle.register('email_filter', EmailFilter.stop, phase='stop')
+        Lifecycle.register('notify_listener', NotifyListener.stop, phase='stop')
+        Lifecycle.register('auth_events', AuthEventLog.stop, phase='flush')
+        Lifecycle.register('reset_attempts', ResetAttemptTracker.stop, phase='flush')
+        Lifecycle.register('hashing', PasswordHasher.shutdown, phase='flush')
+        Lifecycle.register('database', Database.close_connection, phase='close')
+        Lifecycle.register('logging', shutdown_logging, phase='final')
+    
+    @app.after_serving
+    async def shutdown():
+        # uvicorn ya drenó las peticiones en curso
+        await AsyncDatabase.close_pool()
+        Lifecycle.shutdown(drain_seconds=0)
+    
+    # Ruta de prueba
+    @app.route('/health', methods=['GET'])
+    async def health_check():
+        """Endpoint para verificar el estado del servidor (resultado de la última sonda)"""
+        return HealthMonitor.health().response(Response)
+    
+    @app.route('/livez', methods=['GET'])
+    async def liveness():
+        """El proceso responde (sin E/S)"""
+        return LIVE.response(Response)
+    
+    @app.route('/readyz', methods=['GET'])
+    async def readiness():
+        """Listo para recibir tráfico: BD, pool y cola de emails (cacheado)"""
+        return HealthMonitor.readiness().response(Response)
+    
+    @app.route('/', methods=['GET'])
+    async def root():
+        """Ruta raíz"""
+        return ROOT_INDEX.response(Response)
+    
+    # Manejador de errores 404
+    @app.errorhandler(404)
+    async def not_found(error):
+        return NOT_FOUND.response(Response)
+    
+    # Manejador de errores 500
+    @app.errorhandler(500)
+    async def internal_error(error):
+        return INTERNAL_ERROR.response(Response)
+    
+    return app
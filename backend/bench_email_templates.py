@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de renderizado de emails
+
+Uso:
+    python bench_email_templates.py [iteraciones]
+
+Compara mensajes renderizados por segundo entre el método anterior
+(sustitución + árbol MIMEMultipart completo por envío) y las plantillas
+precompiladas con esqueleto MIME en caché.
+"""
+
+import os
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formataddr
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.email_templates import EmailTemplates, TEMPLATE_DEFINITIONS, TEMPLATES_DIR
+
+FROM_HEADER = formataddr(('Ánima', 'anima@example.com'), 'utf-8')
+TO_EMAIL = 'usuario@example.com'
+CONTEXT = {'user_name': 'Usuario de Prueba', 'code': '123456'}
+
+
+def legacy_render(subject: str, text_source: str, html_source: str) -> bytes:
+    """Reproduce el envío anterior: cuerpos nuevos y árbol MIME completo por mensaje"""
+    text_content = text_source.replace('{{ user_name }}', CONTEXT['user_name']).replace('{{ code }}', CONTEXT['code'])
+    html_content = html_source.replace('{{ user_name }}', CONTEXT['user_name']).replace('{{ code }}', CONTEXT['code'])
+
+    message = MIMEMultipart('alternative')
+    message['Subject'] = subject
+    message['From'] = FROM_HEADER
+    message['To'] = TO_EMAIL
+    message.attach(MIMEText(text_content, 'plain', 'utf-8'))
+    message.attach(MIMEText(html_content, 'html', 'utf-8'))
+    return message.as_bytes()
+
+
+def measure(label: str, fn, iterations: int) -> float:
+    fn()  # calentamiento
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"   {label:<28} {rate:>12,.0f} mensajes/s   ({elapsed * 1e6 / iterations:,.1f} µs/mensaje)")
+    return rate
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    definition = TEMPLATE_DEFINITIONS['password_reset']
+    with open(os.path.join(TEMPLATES_DIR, definition['text']), encoding='utf-8') as f:
+        text_source = f.read()
+    with open(os.path.join(TEMPLATES_DIR, definition['html']), encoding='utf-8') as f:
+        html_source = f.read()
+
+    start = time.perf_counter()
+    EmailTemplates.preload()
+    print(f"\n📦 Plantillas compiladas en {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    template = EmailTemplates.get('password_reset')
+
+    print(f"\n⏱️  password_reset, {iterations:,} iteraciones")
+    legacy = measure('MIMEMultipart por envío', lambda: legacy_render(definition['subject'], text_source, html_source), iterations)
+    compiled = measure('plantilla precompilada', lambda: template.build_message(FROM_HEADER, TO_EMAIL, CONTEXT), iterations)
+    print(f"\n🚀 Mejora: {compiled / legacy:.1f}x\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de transportes de email
+
+Uso:
+    python bench_email_transports.py [mensajes]
+    python bench_email_transports.py --endpoint EMAIL [peticiones]
+
+El primer modo envía el mismo mensaje de recuperación por los transportes
+locales (memoria, maildir y servidor SMTP local) y compara los tiempos.
+El modo --endpoint mide /auth/password/request-reset con el transporte en
+memoria, de modo que se mide nuestro código y no la latencia de Gmail
+(requiere base de datos y un usuario registrado con ese email). Salvo que
+se defina PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS, el intervalo mínimo
+entre envíos se desactiva: si no, cada petición tras la primera mediría
+el atajo del envío reciente y no la emisión del código.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Antes de importar Config: cada petición del modo --endpoint emite un código
+os.environ.setdefault('PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS', '0')
+
+from services.email_service import EmailService
+from services.email_templates import EmailTemplates
+from services.email_transports import LocalSMTPTransport, MaildirTransport, MemoryTransport
+
+CONTEXT = {'user_name': 'Usuario de Prueba', 'code': '123456'}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench_transport(transport, message: bytes, count: int) -> None:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        transport.deliver('anima@example.com', ['usuario@example.com'], message)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    print(f"   {transport.name:<8} {count / elapsed:>10,.0f} envíos/s   "
+          f"p50 {percentile(latencies, 50) * 1000:6.3f} ms   p99 {percentile(latencies, 99) * 1000:6.3f} ms")
+    transport.close()
+
+
+def bench_endpoint(email: str, count: int) -> None:
+    from app import create_app
+
+    transport = MemoryTransport(max_messages=10)
+    EmailService.set_transport(transport)
+    app = create_app()
+
+    latencies = []
+    with app.test_client() as client:
+        for _ in range(count):
+            t0 = time.perf_counter()
+            resp = client.post('/auth/password/request-reset', json={'email': email})
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                print(f"❌ Respuesta inesperada {resp.status_code}: {resp.get_json()}")
+                return
+
+    total = sum(latencies)
+    print(f"\n⏱️  /auth/password/request-reset x {count}")
+    print(f"   {count / total:,.0f} peticiones/s   p50 {percentile(latencies, 50) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"   Transporte: {transport.stats()}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--endpoint':
+        if len(sys.argv) < 3:
+            print(__doc__)
+            sys.exit(1)
+        bench_endpoint(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 200)
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    message = EmailTemplates.get('password_reset').build_message('anima@example.com', 'usuario@example.com', CONTEXT)
+
+    print(f"\n⏱️  {count:,} mensajes de {len(message):,} bytes por transporte")
+    with tempfile.TemporaryDirectory() as maildir:
+        for transport in (MemoryTransport(), MaildirTransport(maildir), LocalSMTPTransport()):
+            bench_transport(transport, message, count)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark del registro de usuarios
+
+Uso:
+    python bench_registration.py [registros] [--rtt-ms N] [--dns-ms N] [--db]
+
+Compara la latencia por registro entre el flujo anterior (validación doble,
+consulta email_exists y luego INSERT) y el actual (una sola validación,
+INSERT ... ON CONFLICT DO NOTHING y bcrypt solapado con la consulta DNS).
+
+Sin --db la base de datos y el DNS se simulan con esperas de --rtt-ms y
+--dns-ms (con --dns-ms > 0 se activa la comprobación de entregabilidad).
+Con --db se usan consultas reales y los usuarios creados se borran al final.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from config import Config
+from repositories.user_repository import UserRepository
+from services.email_validation import EmailValidation
+from services.hashing import PasswordHasher
+from services.user_service import UserService
+
+BENCH_DOMAIN = 'bench-registro.example.com'
+
+
+def legacy_validate(name: str, email: str, password: str, dns_seconds: float):
+    """Validación anterior: email_validator completo, con su consulta DNS"""
+    if not name or len(name.strip()) < 2:
+        return "El nombre debe tener al menos 2 caracteres"
+    validated, _error = EmailValidation.check_syntax(email)
+    if validated is None:
+        return "El formato del email no es válido"
+    if dns_seconds:
+        time.sleep(dns_seconds)
+    if not password or len(password) < 6:
+        return "La contraseña debe tener al menos 6 caracteres"
+    return None
+
+
+def legacy_register(name: str, email: str, password: str, dns_seconds: float):
+    # AuthService.register validaba y UserService.create_user volvía a validar
+    if legacy_validate(name, email, password, dns_seconds):
+        return None
+    if legacy_validate(name, email, password, dns_seconds):
+        return None
+    if UserRepository.email_exists(email):
+        return None
+    password_hash = PasswordHasher.hash_password(password)
+    return UserRepository.create(name.strip(), email.lower().strip(), password_hash)
+
+
+def simulate_backends(rtt_seconds: float, dns_seconds: float, simulate_db: bool):
+    """Sustituye DNS (y la base de datos si simulate_db) por esperas fijas"""
+    def email_exists(email):
+        time.sleep(rtt_seconds)
+        return False
+
+    def create(name, email, password_hash):
+        time.sleep(rtt_seconds)
+        return email
+
+    def resolve(domain):
+        time.sleep(dns_seconds)
+        return True
+
+    if simulate_db:
+        UserRepository.email_exists = staticmethod(email_exists)
+        UserRepository.create = staticmethod(create)
+    EmailValidation._resolve = staticmethod(resolve)
+
+
+def measure(label: str, register, count: int, baseline: float = None) -> float:
+    samples = []
+    for _ in range(count):
+        # Dominio distinto en cada registro: sin aciertos en la caché de MX
+        email = f"bench-{uuid.uuid4().hex[:12]}@{uuid.uuid4().hex[:8]}.{BENCH_DOMAIN}"
+        start = time.perf_counter()
+        register('Usuario Bench', email, 'secreto-123')
+        samples.append((time.perf_counter() - start) * 1000)
+    median = statistics.median(samples)
+    speedup = f"   ({baseline / median:.2f}x)" if baseline else ""
+    print(f"   {label:<34} mediana {median:8.1f} ms   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.1f} ms{speedup}")
+    return median
+
+
+def cleanup():
+    from database.connection import Database
+    with Database.get_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM users WHERE email LIKE %s", (f"bench-%.{BENCH_DOMAIN}",))
+        print(f"\n🧹 {cursor.rowcount} usuarios de prueba eliminados")
+    Database.close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del registro de usuarios')
+    parser.add_argument('count', nargs='?', type=int, default=10, help='Registros por variante')
+    parser.add_argument('--rtt-ms', type=float, default=1, help='Latencia simulada por consulta')
+    parser.add_argument('--dns-ms', type=float, default=0, help='Latencia simulada del DNS (0 = sin comprobar MX)')
+    parser.add_argument('--db', action='store_true', help='Usar la base de datos real')
+    args = parser.parse_args()
+
+    count = args.count
+    rtt_seconds = args.rtt_ms / 1000
+    dns_seconds = args.dns_ms / 1000
+    use_db = args.db
+
+    Config.EMAIL_CHECK_DELIVERABILITY = dns_seconds > 0
+    simulate_backends(rtt_seconds, dns_seconds, simulate_db=not use_db)
+    backend = 'PostgreSQL real' if use_db else f'BD simulada ({args.rtt_ms:g} ms por consulta)'
+
+    print(f"\n⏱️  {count} registros, {backend}, DNS {'%g ms' % (dns_seconds * 1000) if dns_seconds else 'desactivado'}")
+    PasswordHasher.hash_password('calentamiento')
+    try:
+        legacy = measure('validación doble + email_exists', lambda n, e, p: legacy_register(n, e, p, dns_seconds), count)
+        measure('una pasada + ON CONFLICT', UserService.create_user, count, legacy)
+    finally:
+        EmailValidation.shutdown()
+        PasswordHasher.shutdown()
+        if use_db:
+            cleanup()
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark de materialización de usuarios
+
+Uso:
+    python bench_user_rows.py [filas] [--db]
+
+Compara filas decodificadas por segundo y bytes por instancia entre el método
+anterior (dict_row + User.from_db_row sobre un objeto con __dict__) y el
+User con slots construido directamente por la row factory user_row.
+Con --db además lee filas reales de la tabla users con ambas row factories.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from models.user import USER_COLUMNS, User
+
+COLUMNS = [name.strip() for name in USER_COLUMNS.split(',')]
+
+
+class LegacyUser:
+    """Reproduce el modelo anterior: atributos en __dict__"""
+
+    def __init__(self, id=None, name=None, email=None, password_hash=None,
+                 created_at=None, updated_at=None, is_active=True, last_login=None):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.password_hash = password_hash
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.is_active = is_active
+        self.last_login = last_login
+
+    @staticmethod
+    def from_db_row(row):
+        if not row:
+            return None
+        return LegacyUser(
+            id=row.get('id'),
+            name=row.get('name'),
+            email=row.get('email'),
+            password_hash=row.get('password_hash'),
+            created_at=row.get('created_at'),
+            updated_at=row.get('updated_at'),
+            is_active=row.get('is_active'),
+            last_login=row.get('last_login')
+        )
+
+
+def legacy_decode(values: tuple):
+    """dict_row arma un dict por fila y luego se copia campo a campo"""
+    return LegacyUser.from_db_row(dict(zip(COLUMNS, values)))
+
+
+def slotted_decode(values: tuple):
+    """Lo mismo que hace args_row(User) con cada fila"""
+    return User(*values)
+
+
+def sample_rows(count: int) -> list:
+    now = datetime.now()
+    return [
+        (uuid.uuid4(), f'Usuario {i}', f'usuario{i}@example.com',
+         '$2b$12$' + 'x' * 53, now, now, True, now)
+        for i in range(count)
+    ]
+
+
+def measure(label: str, decode, rows: list) -> float:
+    for values in rows[:1000]:
+        decode(values)  # calentamiento
+    start = time.perf_counter()
+    for values in rows:
+        decode(values)
+    elapsed = time.perf_counter() - start
+    rate = len(rows) / elapsed
+    print(f"   {label:<32} {rate:>12,.0f} filas/s   ({elapsed * 1e9 / len(rows):,.0f} ns/fila)")
+    return rate
+
+
+def bytes_per_instance(decode, rows: list) -> float:
+    """Memoria retenida por las instancias (los valores de la fila ya existen)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [decode(values) for values in rows]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # Descontar la lista que las contiene
+    total -= sys.getsizeof(instances)
+    return total / len(instances)
+
+
+def bench_db(limit: int):
+    """Lee filas reales de users con dict_row + from_db_row y con user_row"""
+    from psycopg.rows import dict_row
+    from database.connection import Database
+    from models.user import user_row
+
+    query = f"SELECT {USER_COLUMNS} FROM users LIMIT %s"
+
+    def fetch(row_factory, convert):
+        with Database.get_cursor(row_factory=row_factory) as cursor:
+            start = time.perf_counter()
+            cursor.execute(query, (limit,))
+            users = [convert(row) for row in cursor.fetchall()]
+            return users, time.perf_counter() - start
+
+    fetch(user_row, lambda row: row)  # calentamiento (conexión y plan)
+    legacy, legacy_elapsed = fetch(dict_row, User.from_db_row)
+    slotted, slotted_elapsed = fetch(user_row, lambda row: row)
+
+    if not slotted:
+        print("   ⚠️  La tabla users está vacía")
+        return
+    print(f"   {'dict_row + from_db_row':<32} {len(legacy) / legacy_elapsed:>12,.0f} filas/s")
+    print(f"   {'user_row (args_row)':<32} {len(slotted) / slotted_elapsed:>12,.0f} filas/s")
+    Database.close_connection()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    count = int(args[0]) if args else 200000
+    rows = sample_rows(count)
+
+    print(f"\n⏱️  Decodificación de {count:,} filas")
+    legacy = measure('dict_row + from_db_row', legacy_decode, rows)
+    slotted = measure('User con slots (args_row)', slotted_decode, rows)
+    print(f"\n🚀 Mejora: {slotted / legacy:.1f}x")
+
+    sample = rows[:min(count, 20000)]
+    legacy_bytes = bytes_per_instance(LegacyUser.from_db_row, [dict(zip(COLUMNS, values)) for values in sample])
+    slotted_bytes = bytes_per_instance(slotted_decode, sample)
+    print("\n💾 Bytes por instancia")
+    print(f"   {'objeto con __dict__':<32} {legacy_bytes:>8,.0f} B")
+    print(f"   {'User con slots':<32} {slotted_bytes:>8,.0f} B")
+
+    if '--db' in sys.argv:
+        print("\n🗄️  Lectura real desde PostgreSQL")
+        bench_db(count)
+    print()
+
+
+if __name__ == '__main__':
+    main()
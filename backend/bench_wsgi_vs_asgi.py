@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark WSGI (gunicorn) vs ASGI (uvicorn) bajo concurrencia
+
+Uso:
+    python bench_wsgi_vs_asgi.py WSGI_URL ASGI_URL [peticiones] [concurrencia]
+
+Ejemplo (con ambos servidores levantados y la misma base de datos):
+    python serve.py --bind 127.0.0.1:5000
+    uvicorn asgi:app --port 5001 --workers 4
+    python bench_wsgi_vs_asgi.py http://127.0.0.1:5000 http://127.0.0.1:5001 2000 64
+
+Para cada servidor lanza la misma mezcla de peticiones (health, login fallido y
+solicitud de recuperación con un email inexistente) desde varios hilos y
+compara peticiones/s y latencias. Antes mide una respuesta de cada ruta para
+comprobar que ambas variantes devuelven el mismo estado y cuerpo.
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+REQUESTS = [
+    ('GET', '/health', None),
+    ('POST', '/auth/login', {'email': 'bench@example.com', 'password': 'incorrecta'}),
+    ('POST', '/auth/password/request-reset', {'email': 'no-existe@example.com'}),
+    ('POST', '/auth/password/verify-code', {'email': 'no-existe@example.com', 'code': '000000'}),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def call(base_url: str, method: str, path: str, body):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def check_contracts(wsgi_url: str, asgi_url: str) -> bool:
+    ok = True
+    for method, path, body in REQUESTS:
+        wsgi = call(wsgi_url, method, path, body)
+        asgi = call(asgi_url, method, path, body)
+        same = wsgi == asgi
+        ok = ok and same
+        print(f"   {'✅' if same else '❌'} {method} {path} -> {wsgi[0]} / {asgi[0]}")
+    return ok
+
+
+def run_load(base_url: str, total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        nonlocal errors
+        local = []
+        local_errors = 0
+        for i in counter:
+            method, path, body = REQUESTS[i % len(REQUESTS)]
+            t0 = time.perf_counter()
+            try:
+                status, _ = call(base_url, method, path, body)
+                if status >= 500:
+                    local_errors += 1
+            except Exception:
+                local_errors += 1
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies, errors
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    wsgi_url, asgi_url = sys.argv[1].rstrip('/'), sys.argv[2].rstrip('/')
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+
+    print("\n🔍 Comparando contratos (estado y cuerpo)...")
+    if not check_contracts(wsgi_url, asgi_url):
+        print("⚠️  Las respuestas difieren entre variantes")
+
+    print(f"\n⏱️  {total} peticiones, {concurrency} clientes concurrentes\n")
+    for name, url in (('WSGI', wsgi_url), ('ASGI', asgi_url)):
+        elapsed, latencies, errors = run_load(url, total, concurrency)
+        print(f"   {name}  {total / elapsed:>8,.0f} req/s   "
+              f"p50 {percentile(latencies, 50) * 1000:7.1f} ms   "
+              f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   errores {errors}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -18,19 +19,131 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'pguser')
     DB_PASSWORD = os.getenv('DB_PASSWORD', 'pgpassword')
     
+    # Pool de conexiones por worker (modo producción)
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', str(int(os.getenv('GUNICORN_THREADS', '4')) + 2)))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    ASYNC_DB_POOL_MAX_SIZE = int(os.getenv('ASYNC_DB_POOL_MAX_SIZE', '20'))
+    
+    # Hilos para bcrypt en la variante ASGI
+    HASHING_WORKERS = int(os.getenv('HASHING_WORKERS', str(os.cpu_count() or 1)))
+    
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-jwt-secret-key-change-in-production')
     JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
     JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', '24'))
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=JWT_EXPIRATION_HOURS)
     
+    # Tokens revocados antes de vencer (services/token_revocation.py)
+    TOKEN_REVOCATION_PRUNE_SECONDS = float(os.getenv('TOKEN_REVOCATION_PRUNE_SECONDS', '60'))
+    TOKEN_REVOCATION_COMPACT_THRESHOLD = int(os.getenv('TOKEN_REVOCATION_COMPACT_THRESHOLD', '1024'))
+    
+    # Espera máxima entre reconexiones del listener de NOTIFY (database/notify_listener.py)
+    NOTIFY_RECONNECT_MAX_SECONDS = float(os.getenv('NOTIFY_RECONNECT_MAX_SECONDS', '30'))
+    
+    # Cachés en memoria invalidadas entre workers (database/invalidation_bus.py)
+    CACHE_INVALIDATION_ENABLED = os.getenv('CACHE_INVALIDATION_ENABLED', 'True') == 'True'
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+    USER_CACHE_TTL_SECONDS = float(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+    
+    # Tamaño máximo del cuerpo JSON de las peticiones (utils/schemas.py)
+    MAX_JSON_BODY_BYTES = int(os.getenv('MAX_JSON_BODY_BYTES', '16384'))
+    
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
     
+    # Email outbox (dispatcher)
+    EMAIL_DISPATCHER_BATCH_SIZE = int(os.getenv('EMAIL_DISPATCHER_BATCH_SIZE', '50'))
+    EMAIL_DISPATCHER_POLL_SECONDS = float(os.getenv('EMAIL_DISPATCHER_POLL_SECONDS', '30'))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', '5'))
+    EMAIL_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_RETRY_BASE_SECONDS', '30'))
+    EMAIL_STALE_SECONDS = int(os.getenv('EMAIL_STALE_SECONDS', '300'))
+    EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', '7'))  # filas ya resueltas
+    EMAIL_OUTBOX_PURGE_SECONDS = float(os.getenv('EMAIL_OUTBOX_PURGE_SECONDS', '3600'))
+    RESET_CODE_EXPIRATION_MINUTES = int(os.getenv('RESET_CODE_EXPIRATION_MINUTES', '15'))  # igual que create_reset_token
+    
+    # Validación de emails (services/email_validation.py)
+    EMAIL_CHECK_DELIVERABILITY = os.getenv('EMAIL_CHECK_DELIVERABILITY', 'False') == 'True'  # consulta MX del dominio
+    EMAIL_DNS_TIMEOUT_SECONDS = float(os.getenv('EMAIL_DNS_TIMEOUT_SECONDS', '2'))
+    EMAIL_DNS_WORKERS = int(os.getenv('EMAIL_DNS_WORKERS', '4'))
+    EMAIL_MX_CACHE_SIZE = int(os.getenv('EMAIL_MX_CACHE_SIZE', '10000'))
+    EMAIL_MX_CACHE_TTL_SECONDS = float(os.getenv('EMAIL_MX_CACHE_TTL_SECONDS', '3600'))
+    EMAIL_MX_NEGATIVE_TTL_SECONDS = float(os.getenv('EMAIL_MX_NEGATIVE_TTL_SECONDS', '300'))
+    
+    # Filtro de Bloom de emails registrados (services/email_filter.py)
+    EMAIL_FILTER_ENABLED = os.getenv('EMAIL_FILTER_ENABLED', 'True') == 'True'
+    EMAIL_FILTER_FP_RATE = float(os.getenv('EMAIL_FILTER_FP_RATE', '0.01'))
+    EMAIL_FILTER_MIN_CAPACITY = int(os.getenv('EMAIL_FILTER_MIN_CAPACITY', '10000'))
+    EMAIL_FILTER_SCAN_BATCH = int(os.getenv('EMAIL_FILTER_SCAN_BATCH', '5000'))
+    EMAIL_FILTER_REFRESH_SECONDS = float(os.getenv('EMAIL_FILTER_REFRESH_SECONDS', '5'))
+    EMAIL_FILTER_REBUILD_SECONDS = float(os.getenv('EMAIL_FILTER_REBUILD_SECONDS', '21600'))
+    EMAIL_FILTER_WATERMARK_OVERLAP_SECONDS = float(os.getenv('EMAIL_FILTER_WATERMARK_OVERLAP_SECONDS', '120'))
+    
+    # Intentos de códigos de recuperación
+    RESET_CODE_MAX_ATTEMPTS = int(os.getenv('RESET_CODE_MAX_ATTEMPTS', '5'))
+    RESET_ATTEMPTS_TTL_MINUTES = int(os.getenv('RESET_ATTEMPTS_TTL_MINUTES', '15'))
+    RESET_ATTEMPTS_FLUSH_SECONDS = float(os.getenv('RESET_ATTEMPTS_FLUSH_SECONDS', '10'))
+    RESET_ATTEMPTS_MAX_ENTRIES = int(os.getenv('RESET_ATTEMPTS_MAX_ENTRIES', '100000'))
+    
+    # Registro de eventos de autenticación por lotes (services/auth_event_log.py)
+    AUTH_EVENTS_ENABLED = os.getenv('AUTH_EVENTS_ENABLED', 'True') == 'True'
+    AUTH_EVENTS_BUFFER_SIZE = int(os.getenv('AUTH_EVENTS_BUFFER_SIZE', '10000'))
+    AUTH_EVENTS_BATCH_SIZE = int(os.getenv('AUTH_EVENTS_BATCH_SIZE', '500'))
+    AUTH_EVENTS_FLUSH_SECONDS = float(os.getenv('AUTH_EVENTS_FLUSH_SECONDS', '2'))
+    AUTH_EVENTS_PARTITION_MONTHS_AHEAD = int(os.getenv('AUTH_EVENTS_PARTITION_MONTHS_AHEAD', '1'))
+    AUTH_EVENTS_RETENTION_MONTHS = int(os.getenv('AUTH_EVENTS_RETENTION_MONTHS', '12'))  # 0 = sin límite
+    
+    # Segundos mínimos entre envíos de código al mismo email (0 desactiva)
+    PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS = float(os.getenv('PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS', '30'))
+    
+    # Plazo para terminar las peticiones en curso al apagar (utils/lifecycle.py)
+    SHUTDOWN_DRAIN_SECONDS = float(os.getenv('SHUTDOWN_DRAIN_SECONDS', '25'))
+    
+    # Sonda de salud en segundo plano (/health, /readyz)
+    HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv('HEALTH_PROBE_INTERVAL_SECONDS', '5'))
+    HEALTH_PROBE_TIMEOUT_SECONDS = float(os.getenv('HEALTH_PROBE_TIMEOUT_SECONDS', '2'))
+    HEALTH_STALE_SECONDS = float(os.getenv('HEALTH_STALE_SECONDS', '15'))
+    
+    # Perfilado bajo demanda (middlewares/profiler.py)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')  # valor de la cabecera X-Profile
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_MODE = os.getenv('PROFILING_MODE', 'cprofile')  # 'cprofile' o 'sample'
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', '1'))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'anima-profiles'))
+    PROFILING_TOP_N = int(os.getenv('PROFILING_TOP_N', '40'))
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '200'))
+    
+    # Logging (utils/log.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' o 'text'
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # modulo=NIVEL separados por comas
+    LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')  # modulo=fracción separados por comas
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+    
     # Server
     PORT = int(os.getenv('PORT', '5000'))
     HOST = os.getenv('HOST', '0.0.0.0')
     
+    # Servidor de producción (gunicorn, prefork)
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', str((os.cpu_count() or 1) * 2 + 1)))
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '4'))
+    GUNICORN_MAX_REQUESTS = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+    GUNICORN_MAX_REQUESTS_JITTER = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+    GUNICORN_TIMEOUT = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+    GUNICORN_GRACEFUL_TIMEOUT = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+    
+    # Directorio de métricas compartido por los workers (prometheus_client multiproceso)
+    METRICS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'anima-metrics'))
+    
+    # Migraciones de esquema (migrate.py)
+    MIGRATION_LOCK_TIMEOUT_MS = int(os.getenv('MIGRATION_LOCK_TIMEOUT_MS', '3000'))
+    MIGRATION_LOCK_RETRIES = int(os.getenv('MIGRATION_LOCK_RETRIES', '5'))
+    MIGRATION_RETRY_BACKOFF_SECONDS = float(os.getenv('MIGRATION_RETRY_BACKOFF_SECONDS', '2'))
+    
+    # Presupuesto de tiempo de import de la app en un worker nuevo (import_check.py --profile)
+    STARTUP_IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '400'))
+    
     @staticmethod
     def get_db_url():
         """Genera la URL de conexión a la base de datos"""
@@ -0,0 +1,215 @@
+import logging
+from quart import Blueprint, Response, g, request, jsonify
+from controllers import schemas
+from services.auth_event_log import AuthEventLog
+from services.auth_service import AuthService
+from services.async_auth_service import AsyncAuthService
+from functools import wraps
+from repositories.async_user_repository import AsyncUserRepository
+from utils.http_cache import HTTPCache
+from utils.schemas import validate_body_async
+from utils.static_responses import INTERNAL_ERROR, INVALID_TOKEN_FORMAT, TOKEN_INVALID, TOKEN_REQUIRED, USER_NOT_FOUND
+
+logger = logging.getLogger(__name__)
+
+# Mismas rutas, mensajes y códigos que controllers/auth_controller.py
+auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+
+def token_required(f):
+    """
+    Decorador para proteger rutas que requieren autenticación (versión asíncrona)
+    """
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = None
+        
+        # Obtener token del header
+        if 'Authorization' in request.headers:
+            auth_header = request.headers['Authorization']
+            try:
+                token = auth_header.split(" ")[1]  # Bearer <token>
+            except IndexError:
+                return INVALID_TOKEN_FORMAT.response(Response)
+        
+        if not token:
+            return TOKEN_REQUIRED.response(Response)
+        
+        # Verificar token (HMAC en memoria, no bloquea)
+        payload = AuthService.verify_token(token)
+        
+        if not payload:
+            return TOKEN_INVALID.response(Response)
+        
+        # Obtener usuario
+        user = await AsyncUserRepository.find_by_id(payload['user_id'])
+        
+        if not user:
+            return USER_NOT_FOUND.response(Response)
+        
+        # Payload disponible para el endpoint (jti y exp para /logout)
+        g.token_payload = payload
+        
+        # Pasar usuario al endpoint
+        return await f(user, *args, **kwargs)
+    
+    return decorated
+
+@auth_bp.route('/register', methods=['POST'])
+@validate_body_async(schemas.REGISTER)
+async def register(body):
+    """
+    Endpoint para registro de usuarios
+    
+    Body:
+        name (str): Nombre del usuario
+        email (str): Email del usuario
+        password (str): Contraseña del usuario
+        
+    Returns:
+        JSON con el usuario creado y token
+    """
+    try:
+        name = body['name']
+        email = body['email']
+        password = body['password']
+        
+        # Registrar usuario
+        user, token, error = await AsyncAuthService.register(name, email, password)
+        AuthEventLog.record('register_failed' if error else 'register_succeeded', error is None, email=email, user_id=user.id if user else None, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        # Respuesta exitosa
+        return jsonify({
+            'success': True,
+            'message': 'Usuario registrado exitosamente',
+            'user': user.to_dict(),
+            'token': token
+        }), 201
+        
+    except Exception as e:
+        logger.error(f"❌ Error en endpoint register: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+@auth_bp.route('/login', methods=['POST'])
+@validate_body_async(schemas.LOGIN)
+async def login(body):
+    """
+    Endpoint para login de usuarios
+    
+    Body:
+        email (str): Email del usuario
+        password (str): Contraseña del usuario
+        
+    Returns:
+        JSON con el usuario y token
+    """
+    try:
+        email = body['email']
+        password = body['password']
+        
+        # Autenticar usuario
+        user, token, error = await AsyncAuthService.login(email, password)
+        AuthEventLog.record('login_failed' if error else 'login_succeeded', error is None, email=email, user_id=user.id if user else None, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 401
+        
+        # Respuesta exitosa
+        return jsonify({
+            'success': True,
+            'message': 'Inicio de sesión exitoso',
+            'user': user.to_dict(),
+            'token': token
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error en endpoint login: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+async def logout(current_user):
+    """
+    Endpoint para cerrar sesión (revoca el token actual hasta que venza)
+    
+    Headers:
+        Authorization: Bearer <token>
+        
+    Returns:
+        JSON con el resultado de la operación
+    """
+    try:
+        success, error = await AsyncAuthService.logout(g.token_payload)
+        AuthEventLog.record('logout', error is None, email=current_user.email, user_id=current_user.id, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Sesión cerrada correctamente'
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error en endpoint logout: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+@auth_bp.route('/verify', methods=['GET'])
+@token_required
+async def verify_token(current_user):
+    """
+    Endpoint para verificar si un token es válido
+    
+    Headers:
+        Authorization: Bearer <token>
+        
+    Headers opcionales:
+        If-None-Match: ETag recibido antes (responde 304 si no cambió)
+        
+    Returns:
+        JSON con información del usuario
+    """
+    etag = HTTPCache.user_etag(current_user, 'verify')
+    if HTTPCache.is_fresh(request, etag):
+        return HTTPCache.not_modified(Response, etag)
+    
+    return HTTPCache.tag(jsonify({
+        'success': True,
+        'message': 'Token válido',
+        'user': current_user.to_dict()
+    }), etag), 200
+
+@auth_bp.route('/me', methods=['GET'])
+@token_required
+async def get_current_user(current_user):
+    """
+    Endpoint para obtener información del usuario actual
+    
+    Headers:
+        Authorization: Bearer <token>
+        
+    Headers opcionales:
+        If-None-Match: ETag recibido antes (responde 304 si no cambió)
+        
+    Returns:
+        JSON con información del usuario
+    """
+    etag = HTTPCache.user_etag(current_user, 'me')
+    if HTTPCache.is_fresh(request, etag):
+        return HTTPCache.not_modified(Response, etag)
+    
+    return HTTPCache.tag(jsonify({
+        'success': True,
+        'user': current_user.to_dict()
+    }), etag), 200
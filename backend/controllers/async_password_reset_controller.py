@@ -0,0 +1,158 @@
+import logging
+from quart import Blueprint, Response, request, jsonify
+from controllers import schemas
+from services.auth_event_log import AuthEventLog
+from services.async_password_reset_service import AsyncPasswordResetService
+from utils.schemas import validate_body_async
+from utils.static_responses import INTERNAL_ERROR
+
+logger = logging.getLogger(__name__)
+
+# Mismas rutas, mensajes y códigos que controllers/password_reset_controller.py
+password_reset_bp = Blueprint('password_reset', __name__, url_prefix='/auth/password')
+
+@password_reset_bp.route('/request-reset', methods=['POST'])
+@validate_body_async(schemas.EMAIL_ONLY)
+async def request_reset(body):
+    """
+    Endpoint para solicitar código de recuperación de contraseña
+    
+    Body:
+        email (str): Email del usuario
+        
+    Returns:
+        JSON con el resultado de la operación
+    """
+    try:
+        email = body['email']
+        
+        # Solicitar código
+        success, error = await AsyncPasswordResetService.request_password_reset(email)
+        AuthEventLog.record('password_reset_requested', error is None, email=email, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        # Siempre responder con éxito (seguridad)
+        return jsonify({
+            'success': True,
+            'message': 'Si el email existe, recibirás un código de verificación'
+        }), 200
+        
+    except Exception as e:
+        logger.exception(f"❌ Error en endpoint request_reset: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+
+@password_reset_bp.route('/verify-code', methods=['POST'])
+@validate_body_async(schemas.VERIFY_CODE)
+async def verify_code(body):
+    """
+    Endpoint para verificar código de recuperación
+    
+    Body:
+        email (str): Email del usuario
+        code (str): Código de verificación
+        
+    Returns:
+        JSON con el resultado de la verificación
+    """
+    try:
+        email = body['email']
+        code = body['code']
+        
+        # Verificar código
+        success, error = await AsyncPasswordResetService.verify_reset_code(email, code)
+        AuthEventLog.record('reset_code_failed' if error else 'reset_code_verified', error is None, email=email, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Código verificado correctamente'
+        }), 200
+        
+    except Exception as e:
+        logger.exception(f"❌ Error en endpoint verify_code: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+
+@password_reset_bp.route('/reset-password', methods=['POST'])
+@validate_body_async(schemas.RESET_PASSWORD)
+async def reset_password(body):
+    """
+    Endpoint para restablecer la contraseña
+    
+    Body:
+        email (str): Email del usuario
+        code (str): Código de verificación
+        new_password (str): Nueva contraseña
+        
+    Returns:
+        JSON con el resultado de la operación
+    """
+    try:
+        email = body['email']
+        code = body['code']
+        new_password = body['new_password']
+        
+        # Restablecer contraseña
+        success, error = await AsyncPasswordResetService.reset_password(email, code, new_password)
+        AuthEventLog.record('password_reset_failed' if error else 'password_reset_completed', error is None, email=email, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Contraseña actualizada exitosamente'
+        }), 200
+        
+    except Exception as e:
+        logger.exception(f"❌ Error en endpoint reset_password: {e}")
+        return INTERNAL_ERROR.response(Response)
+
+
+@password_reset_bp.route('/resend-code', methods=['POST'])
+@validate_body_async(schemas.EMAIL_ONLY)
+async def resend_code(body):
+    """
+    Endpoint para reenviar código de recuperación
+    
+    Body:
+        email (str): Email del usuario
+        
+    Returns:
+        JSON con el resultado de la operación
+    """
+    try:
+        email = body['email']
+        
+        # Reenviar código
+        success, error = await AsyncPasswordResetService.resend_code(email)
+        AuthEventLog.record('password_reset_requested', error is None, email=email, detail=error or 'resend', request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Código reenviado correctamente'
+        }), 200
+        
+    except Exception as e:
+        logger.exception(f"❌ Error en endpoint resend_code: {e}")
+        return INTERNAL_ERROR.response(Response)
\ No newline at end of file
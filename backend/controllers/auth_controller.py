@@ -1,7 +1,15 @@
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, current_app, g, request, jsonify
+from controllers import schemas
+from services.auth_event_log import AuthEventLog
 from services.auth_service import AuthService
 from functools import wraps
 from repositories.user_repository import UserRepository
+from utils.http_cache import HTTPCache
+from utils.schemas import validate_body
+from utils.static_responses import INTERNAL_ERROR, INVALID_TOKEN_FORMAT, TOKEN_INVALID, TOKEN_REQUIRED, USER_NOT_FOUND
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -19,34 +27,25 @@ def token_required(f):
             try:
                 token = auth_header.split(" ")[1]  # Bearer <token>
             except IndexError:
-                return jsonify({
-                    'success': False,
-                    'message': 'Formato de token inválido'
-                }), 401
+                return INVALID_TOKEN_FORMAT.response()
         
         if not token:
-            return jsonify({
-                'success': False,
-                'message': 'Token de autenticación requerido'
-            }), 401
+            return TOKEN_REQUIRED.response()
         
         # Verificar token
         payload = AuthService.verify_token(token)
         
         if not payload:
-            return jsonify({
-                'success': False,
-                'message': 'Token inválido o expirado'
-            }), 401
+            return TOKEN_INVALID.response()
         
         # Obtener usuario
         user = UserRepository.find_by_id(payload['user_id'])
         
         if not user:
-            return jsonify({
-                'success': False,
-                'message': 'Usuario no encontrado'
-            }), 401
+            return USER_NOT_FOUND.response()
+        
+        # Payload disponible para el endpoint (jti y exp para /logout)
+        g.token_payload = payload
         
         # Pasar usuario al endpoint
         return f(user, *args, **kwargs)
@@ -54,7 +53,8 @@ def token_required(f):
     return decorated
 
 @auth_bp.route('/register', methods=['POST'])
-def register():
+@validate_body(schemas.REGISTER)
+def register(body):
     """
     Endpoint para registro de usuarios
     
@@ -67,28 +67,13 @@ def register():
         JSON con el usuario creado y token
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener datos del request
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        password = data.get('password', '')
-        
-        # Validar campos requeridos
-        if not name or not email or not password:
-            return jsonify({
-                'success': False,
-                'message': 'Nombre, email y contraseña son obligatorios'
-            }), 400
+        name = body['name']
+        email = body['email']
+        password = body['password']
         
         # Registrar usuario
         user, token, error = AuthService.register(name, email, password)
+        AuthEventLog.record('register_failed' if error else 'register_succeeded', error is None, email=email, user_id=user.id if user else None, detail=error, request=request)
         
         if error:
             return jsonify({
@@ -105,14 +90,12 @@ def register():
         }), 201
         
     except Exception as e:
-        print(f"❌ Error en endpoint register: {e}")
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+        logger.error(f"❌ Error en endpoint register: {e}")
+        return INTERNAL_ERROR.response()
 
 @auth_bp.route('/login', methods=['POST'])
-def login():
+@validate_body(schemas.LOGIN)
+def login(body):
     """
     Endpoint para login de usuarios
     
@@ -124,27 +107,12 @@ def login():
         JSON con el usuario y token
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener datos del request
-        email = data.get('email', '').strip()
-        password = data.get('password', '')
-        
-        # Validar campos requeridos
-        if not email or not password:
-            return jsonify({
-                'success': False,
-                'message': 'Email y contraseña son obligatorios'
-            }), 400
+        email = body['email']
+        password = body['password']
         
         # Autenticar usuario
         user, token, error = AuthService.login(email, password)
+        AuthEventLog.record('login_failed' if error else 'login_succeeded', error is None, email=email, user_id=user.id if user else None, detail=error, request=request)
         
         if error:
             return jsonify({
@@ -161,11 +129,39 @@ def login():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error en endpoint login: {e}")
+        logger.error(f"❌ Error en endpoint login: {e}")
+        return INTERNAL_ERROR.response()
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+def logout(current_user):
+    """
+    Endpoint para cerrar sesión (revoca el token actual hasta que venza)
+    
+    Headers:
+        Authorization: Bearer <token>
+        
+    Returns:
+        JSON con el resultado de la operación
+    """
+    try:
+        success, error = AuthService.logout(g.token_payload)
+        AuthEventLog.record('logout', error is None, email=current_user.email, user_id=current_user.id, detail=error, request=request)
+        
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
         return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+            'success': True,
+            'message': 'Sesión cerrada correctamente'
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error en endpoint logout: {e}")
+        return INTERNAL_ERROR.response()
 
 @auth_bp.route('/verify', methods=['GET'])
 @token_required
@@ -176,14 +172,21 @@ def verify_token(current_user):
     Headers:
         Authorization: Bearer <token>
         
+    Headers opcionales:
+        If-None-Match: ETag recibido antes (responde 304 si no cambió)
+        
     Returns:
         JSON con información del usuario
     """
-    return jsonify({
+    etag = HTTPCache.user_etag(current_user, 'verify')
+    if HTTPCache.is_fresh(request, etag):
+        return HTTPCache.not_modified(current_app.response_class, etag)
+    
+    return HTTPCache.tag(jsonify({
         'success': True,
         'message': 'Token válido',
         'user': current_user.to_dict()
-    }), 200
+    }), etag), 200
 
 @auth_bp.route('/me', methods=['GET'])
 @token_required
@@ -194,10 +197,17 @@ def get_current_user(current_user):
     Headers:
         Authorization: Bearer <token>
         
+    Headers opcionales:
+        If-None-Match: ETag recibido antes (responde 304 si no cambió)
+        
     Returns:
         JSON con información del usuario
     """
-    return jsonify({
+    etag = HTTPCache.user_etag(current_user, 'me')
+    if HTTPCache.is_fresh(request, etag):
+        return HTTPCache.not_modified(current_app.response_class, etag)
+    
+    return HTTPCache.tag(jsonify({
         'success': True,
         'user': current_user.to_dict()
-    }), 200
\ No newline at end of file
+    }), etag), 200
\ No newline at end of file
@@ -1,10 +1,18 @@
+import logging
 from flask import Blueprint, request, jsonify
+from controllers import schemas
+from services.auth_event_log import AuthEventLog
 from services.password_reset_service import PasswordResetService
+from utils.schemas import validate_body
+from utils.static_responses import INTERNAL_ERROR
+
+logger = logging.getLogger(__name__)
 
 password_reset_bp = Blueprint('password_reset', __name__, url_prefix='/auth/password')
 
 @password_reset_bp.route('/request-reset', methods=['POST'])
-def request_reset():
+@validate_body(schemas.EMAIL_ONLY)
+def request_reset(body):
     """
     Endpoint para solicitar código de recuperación de contraseña
     
@@ -15,25 +23,11 @@ def request_reset():
         JSON con el resultado de la operación
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener email
-        email = data.get('email', '').strip()
-        
-        if not email:
-            return jsonify({
-                'success': False,
-                'message': 'El email es obligatorio'
-            }), 400
+        email = body['email']
         
         # Solicitar código - NOMBRE CORRECTO DEL MÉTODO
         success, error = PasswordResetService.request_password_reset(email)
+        AuthEventLog.record('password_reset_requested', error is None, email=email, detail=error, request=request)
         
         if error:
             return jsonify({
@@ -48,17 +42,13 @@ def request_reset():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error en endpoint request_reset: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+        logger.exception(f"❌ Error en endpoint request_reset: {e}")
+        return INTERNAL_ERROR.response()
 
 
 @password_reset_bp.route('/verify-code', methods=['POST'])
-def verify_code():
+@validate_body(schemas.VERIFY_CODE)
+def verify_code(body):
     """
     Endpoint para verificar código de recuperación
     
@@ -70,26 +60,12 @@ def verify_code():
         JSON con el resultado de la verificación
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener datos
-        email = data.get('email', '').strip()
-        code = data.get('code', '').strip()
-        
-        if not email or not code:
-            return jsonify({
-                'success': False,
-                'message': 'Email y código son obligatorios'
-            }), 400
+        email = body['email']
+        code = body['code']
         
         # Verificar código
         success, error = PasswordResetService.verify_reset_code(email, code)
+        AuthEventLog.record('reset_code_failed' if error else 'reset_code_verified', error is None, email=email, detail=error, request=request)
         
         if error:
             return jsonify({
@@ -103,17 +79,13 @@ def verify_code():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error en endpoint verify_code: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+        logger.exception(f"❌ Error en endpoint verify_code: {e}")
+        return INTERNAL_ERROR.response()
 
 
 @password_reset_bp.route('/reset-password', methods=['POST'])
-def reset_password():
+@validate_body(schemas.RESET_PASSWORD)
+def reset_password(body):
     """
     Endpoint para restablecer la contraseña
     
@@ -126,27 +98,13 @@ def reset_password():
         JSON con el resultado de la operación
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener datos
-        email = data.get('email', '').strip()
-        code = data.get('code', '').strip()
-        new_password = data.get('new_password', '')
-        
-        if not email or not code or not new_password:
-            return jsonify({
-                'success': False,
-                'message': 'Todos los campos son obligatorios'
-            }), 400
+        email = body['email']
+        code = body['code']
+        new_password = body['new_password']
         
         # Restablecer contraseña
         success, error = PasswordResetService.reset_password(email, code, new_password)
+        AuthEventLog.record('password_reset_failed' if error else 'password_reset_completed', error is None, email=email, detail=error, request=request)
         
         if error:
             return jsonify({
@@ -160,17 +118,13 @@ def reset_password():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error en endpoint reset_password: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
+        logger.exception(f"❌ Error en endpoint reset_password: {e}")
+        return INTERNAL_ERROR.response()
 
 
 @password_reset_bp.route('/resend-code', methods=['POST'])
-def resend_code():
+@validate_body(schemas.EMAIL_ONLY)
+def resend_code(body):
     """
     Endpoint para reenviar código de recuperación
     
@@ -181,25 +135,11 @@ def resend_code():
         JSON con el resultado de la operación
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'No se recibieron datos'
-            }), 400
-        
-        # Obtener email
-        email = data.get('email', '').strip()
-        
-        if not email:
-            return jsonify({
-                'success': False,
-                'message': 'El email es obligatorio'
-            }), 400
+        email = body['email']
         
         # Reenviar código
         success, error = PasswordResetService.resend_code(email)
+        AuthEventLog.record('password_reset_requested', error is None, email=email, detail=error or 'resend', request=request)
         
         if error:
             return jsonify({
@@ -213,10 +153,5 @@ def resend_code():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error en endpoint resend_code: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            'success': False,
-            'message': 'Error interno del servidor'
-        }), 500
\ No newline at end of file
+        logger.exception(f"❌ Error en endpoint resend_code: {e}")
+        return INTERNAL_ERROR.response()
\ No newline at end of file
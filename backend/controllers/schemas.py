@@ -0,0 +1,38 @@
+"""
+Esquemas del cuerpo de las peticiones (compartidos por los controladores WSGI y ASGI)
+"""
+from utils.schemas import Field, Schema
+
+# bcrypt solo usa los primeros 72 bytes; el límite evita hashear cuerpos enormes
+PASSWORD_MAX_LENGTH = 128
+
+REGISTER = Schema(
+    Field('name'),
+    Field('email'),
+    Field('password', strip=False, max_length=PASSWORD_MAX_LENGTH),
+    required_message='Nombre, email y contraseña son obligatorios'
+)
+
+LOGIN = Schema(
+    Field('email'),
+    Field('password', strip=False, max_length=PASSWORD_MAX_LENGTH),
+    required_message='Email y contraseña son obligatorios'
+)
+
+EMAIL_ONLY = Schema(
+    Field('email'),
+    required_message='El email es obligatorio'
+)
+
+VERIFY_CODE = Schema(
+    Field('email'),
+    Field('code', max_length=16),
+    required_message='Email y código son obligatorios'
+)
+
+RESET_PASSWORD = Schema(
+    Field('email'),
+    Field('code', max_length=16),
+    Field('new_password', strip=False, max_length=PASSWORD_MAX_LENGTH),
+    required_message='Todos los campos son obligatorios'
+)
@@ -0,0 +1,92 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+from psycopg.rows import dict_row
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase:
+    """Pool de conexiones asíncrono para la variante ASGI de la aplicación
+
+    Cada proceso (worker de uvicorn) abre su propio pool al arrancar el
+    servidor; las corrutinas esperan la conexión en lugar de bloquear un hilo.
+    """
+
+    _pool = None
+
+    @classmethod
+    async def init_pool(cls, min_size: int = None, max_size: int = None):
+        """
+        Crea y abre el pool asíncrono del proceso actual
+
+        Args:
+            min_size (int): Conexiones abiertas de forma permanente
+            max_size (int): Máximo de conexiones simultáneas
+        """
+        from psycopg_pool import AsyncConnectionPool
+
+        if cls._pool is not None:
+            return cls._pool
+
+        cls._pool = AsyncConnectionPool(
+            Config.get_db_url(),
+            min_size=min_size or Config.DB_POOL_MIN_SIZE,
+            max_size=max_size or Config.ASYNC_DB_POOL_MAX_SIZE,
+            timeout=Config.DB_POOL_TIMEOUT,
+            kwargs={'row_factory': dict_row},
+            name=f"anima-async-{os.getpid()}",
+            open=False
+        )
+        await cls._pool.open()
+        logger.info(f"✅ Pool asíncrono listo (pid {os.getpid()}, máx {cls._pool.max_size})")
+        return cls._pool
+
+    @classmethod
+    @asynccontextmanager
+    async def get_cursor(cls, commit=False, row_factory=None):
+        """
+        Context manager asíncrono para obtener un cursor
+
+        Al salir del bloque se hace commit (o rollback si hubo un error),
+        igual que con el pool síncrono.
+
+        Args:
+            commit (bool): Se acepta por compatibilidad con Database.get_cursor
+            row_factory: Row factory del cursor (por defecto dict_row)
+
+        Yields:
+            AsyncCursor: Cursor de PostgreSQL
+        """
+        if cls._pool is None:
+            await cls.init_pool()
+
+        async with cls._pool.connection() as conn:
+            async with conn.cursor(row_factory=row_factory) as cursor:
+                yield cursor
+
+    @classmethod
+    def pool_stats(cls):
+        """Estadísticas del pool asíncrono (None si no está abierto)"""
+        return cls._pool.get_stats() if cls._pool is not None else None
+
+    @classmethod
+    async def close_pool(cls):
+        """Cierra el pool asíncrono"""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+            logger.info(f"🔒 Pool asíncrono cerrado (pid {os.getpid()})")
+
+    @classmethod
+    async def test_connection(cls):
+        """Prueba la conexión a la base de datos"""
+        try:
+            async with cls.get_cursor() as cursor:
+                await cursor.execute("SELECT 1")
+                result = await cursor.fetchone()
+                return result is not None
+        except Exception as e:
+            logger.error(f"❌ Error en test de conexión: {e}")
+            return False
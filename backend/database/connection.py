@@ -1,8 +1,12 @@
+import logging
+import os
 from psycopg import connect
 from psycopg.rows import dict_row
 from contextlib import contextmanager
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 
 class Database:
     """Clase para manejar la conexión a PostgreSQL usando psycopg (v3)
@@ -13,6 +17,51 @@ class Database:
     """
 
     _connection = None
+    _pool = None
+
+    @classmethod
+    def init_pool(cls, min_size: int = None, max_size: int = None):
+        """
+        Crea el pool de conexiones del proceso actual
+
+        En modo producción cada worker llama a este método después del fork,
+        de modo que ningún socket se comparte entre procesos.
+
+        Args:
+            min_size (int): Conexiones abiertas de forma permanente
+            max_size (int): Máximo de conexiones simultáneas
+        """
+        from psycopg_pool import ConnectionPool
+
+        if cls._pool is not None:
+            return cls._pool
+
+        cls._pool = ConnectionPool(
+            Config.get_db_url(),
+            min_size=min_size or Config.DB_POOL_MIN_SIZE,
+            max_size=max_size or Config.DB_POOL_MAX_SIZE,
+            timeout=Config.DB_POOL_TIMEOUT,
+            kwargs={'row_factory': dict_row},
+            name=f"anima-{os.getpid()}",
+            open=True
+        )
+        logger.info(f"✅ Pool de conexiones listo (pid {os.getpid()}, máx {cls._pool.max_size})")
+        return cls._pool
+
+    @classmethod
+    def reset_after_fork(cls):
+        """
+        Olvida las conexiones heredadas del proceso padre sin cerrarlas
+
+        Cerrarlas desde el hijo terminaría la sesión que el padre sigue usando.
+        """
+        cls._connection = None
+        cls._pool = None
+
+    @classmethod
+    def pool_stats(cls):
+        """Estadísticas del pool (None si se usa conexión única)"""
+        return cls._pool.get_stats() if cls._pool is not None else None
 
     @classmethod
     def get_connection(cls):
@@ -23,26 +72,34 @@ class Database:
                     Config.get_db_url(),
                     row_factory=dict_row
                 )
-                print("✅ Conexión exitosa a PostgreSQL")
+                logger.info("✅ Conexión exitosa a PostgreSQL")
             except Exception as e:
-                print(f"❌ Error al conectar a PostgreSQL: {e}")
+                logger.error(f"❌ Error al conectar a PostgreSQL: {e}")
                 raise
         return cls._connection
 
     @classmethod
     @contextmanager
-    def get_cursor(cls, commit=False):
+    def get_cursor(cls, commit=False, row_factory=None):
         """
         Context manager para obtener un cursor de base de datos
 
         Args:
             commit (bool): Si True, hace commit automático al finalizar
+            row_factory: Row factory del cursor (por defecto dict_row)
 
         Yields:
             cursor: Cursor de PostgreSQL
         """
+        if cls._pool is not None:
+            # El bloque del pool hace commit al salir (o rollback si hay error)
+            with cls._pool.connection() as conn:
+                with conn.cursor(row_factory=row_factory) as cursor:
+                    yield cursor
+            return
+
         conn = cls.get_connection()
-        with conn.cursor() as cursor:
+        with conn.cursor(row_factory=row_factory) as cursor:
             try:
                 yield cursor
                 if commit:
@@ -53,10 +110,14 @@ class Database:
 
     @classmethod
     def close_connection(cls):
-        """Cierra la conexión a la base de datos"""
+        """Cierra la conexión (y el pool) de la base de datos"""
+        if cls._pool is not None:
+            cls._pool.close()
+            cls._pool = None
+            logger.info(f"🔒 Pool de conexiones cerrado (pid {os.getpid()})")
         if cls._connection and not cls._connection.closed:
             cls._connection.close()
-            print("🔒 Conexión cerrada")
+            logger.info("🔒 Conexión cerrada")
 
     @classmethod
     def test_connection(cls):
@@ -67,5 +128,5 @@ class Database:
                 result = cursor.fetchone()
                 return result is not None
         except Exception as e:
-            print(f"❌ Error en test de conexión: {e}")
+            logger.error(f"❌ Error en test de conexión: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,190 @@
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+from config import Config
+from database.notify_listener import NotifyListener
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Canal de LISTEN/NOTIFY con las claves a invalidar ('<espacio>:<id>')
+INVALIDATION_CHANNEL = 'cache_invalidation'
+
+# Espacio de claves de los usuarios ('user:<id>'); se pueden agregar otros
+USERS = 'user'
+
+# Payload que pide vaciar todas las cachés de todos los workers
+_FLUSH_ALL = '*'
+
+
+class InvalidationBus:
+    """Invalidación entre workers de las cachés en memoria de cada proceso
+
+    Los repositorios publican '<espacio>:<id>' con pg_notify dentro de la
+    transacción que modifica la fila, así que el aviso solo se entrega si hay
+    commit. El NotifyListener del proceso recibe los avisos (también los
+    propios) y expulsa la clave de la caché registrada para ese espacio.
+
+    Las cachés solo se usan mientras el listener está conectado y ya se
+    vaciaron tras esa conexión: si se cae, se pudieron perder avisos, por lo que
+    las lecturas van a la base de datos hasta reconectar y vaciar todo.
+    """
+
+    _caches: Dict[str, TTLCache] = {}
+    _lock = threading.Lock()
+    _synced_session: Optional[int] = None
+    _sequence = 0
+
+    _counters = {
+        'published_total': 0,
+        'received_total': 0,
+        'full_flushes_total': 0,
+    }
+
+    @classmethod
+    def register(cls, namespace: str, max_size: int, ttl_seconds: float) -> TTLCache:
+        """
+        Crea (una sola vez) la caché local de un espacio de claves
+
+        Args:
+            namespace (str): Espacio de claves (p. ej. USERS)
+            max_size (int): Entradas máximas
+            ttl_seconds (float): Vencimiento de cada entrada (cota de desfase)
+
+        Returns:
+            TTLCache: Caché del espacio
+        """
+        with cls._lock:
+            cache = cls._caches.get(namespace)
+            if cache is None:
+                cache = TTLCache(max_size, ttl_seconds)
+                cls._caches[namespace] = cache
+            return cache
+
+    @classmethod
+    def is_live(cls) -> bool:
+        """Indica si las cachés reflejan todos los avisos (listener conectado y resincronizado)"""
+        session = NotifyListener.session()
+        return session is not None and session == cls._synced_session
+
+    @classmethod
+    def get(cls, namespace: str, key: Hashable) -> Any:
+        """
+        Lee de la caché del espacio (None si no hay entrada o no es confiable)
+
+        Args:
+            namespace (str): Espacio de claves
+            key: Identificador
+
+        Returns:
+            Any: Valor cacheado o None
+        """
+        cache = cls._caches.get(namespace)
+        if cache is None or not cls.is_live():
+            return None
+        return cache.get(str(key))
+
+    @classmethod
+    def stamp(cls) -> int:
+        """Marca a tomar antes de leer de la BD un valor que se va a cachear"""
+        return cls._sequence
+
+    @classmethod
+    def put(cls, namespace: str, key: Hashable, value: Any, stamp: int) -> None:
+        """
+        Cachea un valor leído de la BD si nada se invalidó desde stamp()
+
+        Si llegó una invalidación mientras se leía, el valor leído pudo ser
+        anterior al cambio: no se cachea (la próxima lectura irá a la BD).
+
+        Args:
+            namespace (str): Espacio de claves
+            key: Identificador
+            value: Valor leído
+            stamp (int): Resultado de stamp() antes de la lectura
+        """
+        cache = cls._caches.get(namespace)
+        if cache is None or not cls.is_live():
+            return
+        with cls._lock:
+            if cls._sequence == stamp:
+                cache.set(str(key), value)
+
+    @classmethod
+    def _evict(cls, namespace: str, key: str) -> None:
+        with cls._lock:
+            cls._sequence += 1
+            cache = cls._caches.get(namespace)
+            if cache is not None:
+                cache.delete(key)
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Vacía todas las cachés locales"""
+        with cls._lock:
+            cls._sequence += 1
+            for cache in cls._caches.values():
+                cache.clear()
+            cls._counters['full_flushes_total'] += 1
+
+    @staticmethod
+    def _query(namespace: str, key: Hashable):
+        return "SELECT pg_notify(%s, %s)", (INVALIDATION_CHANNEL, f"{namespace}:{key}")
+
+    @classmethod
+    def publish(cls, cursor, namespace: str, key: Hashable) -> None:
+        """
+        Anuncia una invalidación dentro de la transacción del cursor
+
+        Args:
+            cursor: Cursor de la transacción que modifica la fila
+            namespace (str): Espacio de claves
+            key: Identificador modificado
+        """
+        cursor.execute(*cls._query(namespace, key))
+        cls._counters['published_total'] += 1
+        cls._evict(namespace, str(key))
+
+    @classmethod
+    async def publish_async(cls, cursor, namespace: str, key: Hashable) -> None:
+        """Igual que publish, dentro de la transacción de un cursor asíncrono"""
+        await cursor.execute(*cls._query(namespace, key))
+        cls._counters['published_total'] += 1
+        cls._evict(namespace, str(key))
+
+    @classmethod
+    def _on_notify(cls, payload: str) -> None:
+        cls._counters['received_total'] += 1
+        if payload == _FLUSH_ALL:
+            cls.flush_all()
+            return
+        namespace, sep, key = payload.partition(':')
+        if not sep:
+            logger.warning(f"⚠️ Invalidación con formato desconocido: {payload!r}")
+            return
+        cls._evict(namespace, key)
+
+    @classmethod
+    def _on_reconnect(cls) -> None:
+        """Tras (re)conectar se pudieron perder avisos: vaciar todo"""
+        session = NotifyListener.session()
+        cls.flush_all()
+        cls._synced_session = session
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """Contadores del bus y entradas por caché"""
+        snapshot = dict(cls._counters)
+        snapshot['live'] = int(cls.is_live())
+        for namespace, cache in cls._caches.items():
+            snapshot[f'{namespace}_entries'] = len(cache)
+        return snapshot
+
+    @classmethod
+    def start(cls) -> None:
+        """Se suscribe a las invalidaciones con el listener del proceso"""
+        if not Config.CACHE_INVALIDATION_ENABLED:
+            return
+        NotifyListener.subscribe(INVALIDATION_CHANNEL, cls._on_notify, on_reconnect=cls._on_reconnect)
+        NotifyListener.start()
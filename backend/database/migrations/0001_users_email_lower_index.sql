@@ -0,0 +1,23 @@
+-- Búsquedas de usuarios por email sin distinguir mayúsculas
+--
+-- Las consultas comparan lower(email) = lower(%s) y el registro usa
+-- ON CONFLICT (lower(email)): ambos necesitan el índice único sobre lower(email).
+--
+-- Se aplica con python migrate.py. CREATE/DROP INDEX CONCURRENTLY no pueden
+-- ir dentro de una transacción: con psql, usar -f sin --single-transaction.
+--
+-- Antes de aplicarla, comprobar que no haya emails que solo difieran en
+-- mayúsculas (el UPDATE o el índice único fallarían):
+--   SELECT lower(btrim(email)), count(*) FROM users GROUP BY 1 HAVING count(*) > 1;
+--
+-- Si la creación del índice se interrumpe queda INVALID; migrate.py lo borra
+-- antes de reintentar.
+
+-- Emails guardados antes de normalizarlos en la aplicación
+UPDATE users SET email = lower(btrim(email)) WHERE email <> lower(btrim(email));
+
+-- Sin bloquear escrituras mientras se construye
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower ON users (lower(email));
+
+-- Ya no lo usa ninguna consulta (la restricción UNIQUE sobre email tiene su propio índice)
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
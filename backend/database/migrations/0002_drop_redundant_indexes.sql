@@ -0,0 +1,14 @@
+-- Índices y restricciones que no aportan
+--
+-- idx_users_active: un btree sobre un booleano casi siempre true no filtra
+-- nada y se mantiene en cada escritura. Las búsquedas activas ya entran por
+-- idx_users_email_lower o por la clave primaria.
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_active;
+
+-- fk_user repetía la FK de password_reset_tokens.user_id sin ON DELETE CASCADE:
+-- duplicaba la verificación en cada INSERT e impedía borrar usuarios con tokens.
+-- Requiere un lock breve sobre ambas tablas (acotado por lock_timeout).
+ALTER TABLE password_reset_tokens DROP CONSTRAINT IF EXISTS fk_user;
+
+-- Refresco incremental del filtro de emails (UserRepository.emails_created_since)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created ON users (created_at);
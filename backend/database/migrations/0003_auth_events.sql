@@ -0,0 +1,39 @@
+-- Registro de eventos de autenticación (solo se agregan filas)
+--
+-- AuthEventLog acumula los eventos en memoria y los escribe por lotes con COPY.
+-- La tabla se particiona por mes: consultar un rango de fechas solo lee sus
+-- particiones y la retención se hace con DROP TABLE de la partición vencida,
+-- sin DELETE ni VACUUM. Las particiones del mes en curso y el siguiente las
+-- crea AuthEventLog al arrancar; la partición por defecto evita perder filas
+-- si por algún motivo todavía no existe la del mes.
+CREATE TABLE IF NOT EXISTS auth_events (
+    occurred_at TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(40) NOT NULL,
+    success BOOLEAN NOT NULL,
+    user_id UUID,
+    email VARCHAR(255),
+    ip INET,
+    user_agent VARCHAR(255),
+    detail VARCHAR(255)
+) PARTITION BY RANGE (occurred_at);
+
+CREATE TABLE IF NOT EXISTS auth_events_default PARTITION OF auth_events DEFAULT;
+
+-- BRIN: las filas llegan en orden de tiempo, el índice ocupa unas pocas páginas
+-- y casi no encarece el COPY
+CREATE INDEX IF NOT EXISTS idx_auth_events_occurred ON auth_events USING brin (occurred_at);
+CREATE INDEX IF NOT EXISTS idx_auth_events_user ON auth_events (user_id, occurred_at) WHERE user_id IS NOT NULL;
+
+-- Solo inserciones: UPDATE y DELETE fallan (la retención borra particiones enteras)
+CREATE OR REPLACE FUNCTION auth_events_append_only()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'auth_events solo admite inserciones';
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS auth_events_no_changes ON auth_events;
+CREATE TRIGGER auth_events_no_changes
+    BEFORE UPDATE OR DELETE ON auth_events
+    FOR EACH ROW
+    EXECUTE FUNCTION auth_events_append_only();
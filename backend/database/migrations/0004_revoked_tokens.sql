@@ -0,0 +1,14 @@
+-- Tokens JWT revocados antes de vencer (POST /auth/logout)
+--
+-- Cada worker mantiene la lista en memoria (services/token_revocation.py) y se
+-- entera de las altas por NOTIFY token_revoked; la tabla solo se lee al
+-- arrancar o al reconectar. Las filas se borran cuando el token habría
+-- vencido, así que la tabla nunca crece más que los tokens vigentes revocados.
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    revoked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens (expires_at);
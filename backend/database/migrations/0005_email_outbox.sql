@@ -0,0 +1,23 @@
+-- Bandeja de salida transaccional de emails (services/email_dispatcher.py)
+--
+-- Hasta ahora solo existía en init.sql: una base creada antes de la bandeja
+-- y actualizada con migrate.py no la tenía. La tabla es nueva, así que los
+-- índices se crean sin CONCURRENTLY dentro de la misma transacción.
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    template VARCHAR(64) NOT NULL,
+    to_email VARCHAR(255) NOT NULL,
+    context JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP,
+    locked_by VARCHAR(128),
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+-- Reclamo de lotes (EmailOutboxRepository.claim_batch)
+CREATE INDEX IF NOT EXISTS idx_email_outbox_pending ON email_outbox(id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_email_outbox_sending ON email_outbox(locked_at) WHERE status = 'sending';
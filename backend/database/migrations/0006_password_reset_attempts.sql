@@ -0,0 +1,8 @@
+-- Contadores de intentos fallidos de códigos de recuperación
+-- (services/reset_attempt_tracker.py). Hasta ahora solo existía en init.sql.
+CREATE TABLE IF NOT EXISTS password_reset_attempts (
+    email VARCHAR(255) PRIMARY KEY,
+    failed_attempts INTEGER NOT NULL DEFAULT 0,
+    locked BOOLEAN NOT NULL DEFAULT false,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,12 @@
+-- Vencimiento y retención de la bandeja de salida de emails
+--
+-- expires_at: el email con el código de recuperación deja de enviarse cuando
+-- el código vence (los reintentos con backoff llegan a una hora). Columna
+-- nula sin valor por defecto: solo cambia el catálogo, sin reescribir la tabla.
+--
+-- idx_email_outbox_done: purga periódica de las filas resueltas
+-- (EmailOutboxRepository.purge). CONCURRENTLY para no bloquear los encolados.
+ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_email_outbox_done
+    ON email_outbox (created_at) WHERE status IN ('sent', 'failed', 'expired');
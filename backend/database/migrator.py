@@ -0,0 +1,376 @@
+"""
+Migraciones de esquema versionadas
+
+Cada archivo database/migrations/NNNN_descripcion.sql se aplica una sola vez y
+queda registrado en schema_migrations (con su checksum y duración). Pensado
+para cambiar el esquema con la aplicación en marcha:
+
+- Un archivo con CREATE/DROP INDEX CONCURRENTLY se ejecuta sentencia por
+  sentencia en autocommit (CONCURRENTLY no admite transacciones), así que
+  sus sentencias deben poder repetirse (IF [NOT] EXISTS) por si se corta a
+  la mitad; el resto va en una sola transacción.
+- Cada sesión usa lock_timeout: si una sentencia no consigue su lock a tiempo
+  se reintenta con espera, en lugar de quedar en cola bloqueando a todas las
+  consultas que llegan detrás.
+- Un índice CONCURRENTLY interrumpido queda INVALID: se borra antes de cada
+  intento y, si tras crearse sigue INVALID, la migración falla.
+- Un advisory lock impide que dos ejecuciones corran a la vez.
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+# Clave del advisory lock de las migraciones (arbitraria, fija)
+_ADVISORY_LOCK_KEY = 47112025
+
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.sql$')
+_CONCURRENTLY = re.compile(r'\bCONCURRENTLY\b', re.IGNORECASE)
+_CREATE_INDEX_CONCURRENTLY = re.compile(
+    r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?("?[\w.]+"?)',
+    re.IGNORECASE
+)
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(4) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum VARCHAR(64) NOT NULL,
+        duration_ms INTEGER NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+def plan_checks() -> List[Tuple[str, str, tuple, str]]:
+    """
+    Consultas críticas de los repositorios y el índice que deben usar
+
+    Se toman las constantes que ejecutan los repositorios, así que un cambio
+    en la consulta real (p. ej. quitar el lower() de find_by_email) aparece en
+    la verificación. Se ejecutan con enable_seqscan desactivado: en una tabla
+    pequeña el planner prefiere el recorrido secuencial, y lo que interesa
+    comprobar es que la forma de la consulta coincide con el índice.
+
+    Returns:
+        List[Tuple[str, str, tuple, str]]: (consulta, SQL, parámetros, índice esperado)
+    """
+    from repositories.email_outbox_repository import CLAIM_BATCH_QUERY
+    from repositories.password_reset_repository import ACTIVE_TOKEN_QUERY
+    from repositories.user_repository import EMAILS_CREATED_SINCE_QUERY, FIND_BY_EMAIL_QUERY, FIND_BY_ID_QUERY
+
+    return [
+        ('UserRepository.find_by_email', FIND_BY_EMAIL_QUERY, ('usuario@example.com',), 'idx_users_email_lower'),
+        ('UserRepository.find_by_id', FIND_BY_ID_QUERY, (UUID(int=0),), 'users_pkey'),
+        ('UserRepository.emails_created_since', EMAILS_CREATED_SINCE_QUERY, (datetime(2000, 1, 1),), 'idx_users_created'),
+        ('PasswordResetRepository.get_active_token', ACTIVE_TOKEN_QUERY, (UUID(int=0),), 'idx_password_tokens_user'),
+        ('EmailOutboxRepository.claim_batch', CLAIM_BATCH_QUERY, ('plan-check', 300, 50), 'idx_email_outbox_pending'),
+    ]
+
+
+class Migration:
+    """Archivo de migración"""
+
+    __slots__ = ('version', 'name', 'path', 'sql', 'checksum')
+
+    def __init__(self, version: str, name: str, path: str):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    @property
+    def concurrent(self) -> bool:
+        """True si debe ejecutarse fuera de una transacción"""
+        return any(_CONCURRENTLY.search(_strip_comments(statement)) for statement in self.statements())
+
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Separa un script SQL en sentencias
+
+    Respeta comillas simples y dobles, bloques $tag$ ... $tag$ (cuerpos de
+    funciones) y comentarios -- y /* */.
+
+    Args:
+        sql (str): Script completo
+
+    Returns:
+        List[str]: Sentencias sin el ';' final (se omiten las vacías)
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+    while i < length:
+        char = sql[i]
+        if char == '-' and sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = length if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+        elif char == '/' and sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if sql[end] == char:
+                    # Comilla duplicada = comilla escapada
+                    if end + 1 < length and sql[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif char == '$':
+            match = re.match(r'\$(\w*)\$', sql[i:])
+            if match:
+                tag = match.group(0)
+                end = sql.find(tag, i + len(tag))
+                end = length if end == -1 else end + len(tag)
+                current.append(sql[i:end])
+                i = end
+            else:
+                current.append(char)
+                i += 1
+        elif char == ';':
+            statements.append(''.join(current))
+            current = []
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+    statements.append(''.join(current))
+    return [s.strip() for s in statements if _strip_comments(s).strip()]
+
+
+def _strip_comments(sql: str) -> str:
+    return re.sub(r'--[^\n]*|/\*.*?\*/', '', sql, flags=re.DOTALL)
+
+
+class MigrationRunner:
+    """Aplica las migraciones pendientes y verifica los planes de las consultas críticas"""
+
+    @staticmethod
+    def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+        """
+        Migraciones disponibles, en orden de versión
+
+        Raises:
+            ValueError: Si hay versiones repetidas
+        """
+        migrations = []
+        seen = set()
+        for filename in sorted(os.listdir(directory)):
+            match = _FILENAME.match(filename)
+            if not match:
+                continue
+            version, name = match.groups()
+            if version in seen:
+                raise ValueError(f"Versión de migración repetida: {version}")
+            seen.add(version)
+            migrations.append(Migration(version, name, os.path.join(directory, filename)))
+        return migrations
+
+    @staticmethod
+    def _connect():
+        from psycopg import connect
+        from psycopg.rows import dict_row
+
+        conn = connect(Config.get_db_url(), autocommit=True, row_factory=dict_row)
+        # Las construcciones de índices pueden tardar: sin límite por sentencia,
+        # pero sin esperar indefinidamente un lock
+        conn.execute(f"SET lock_timeout = {int(Config.MIGRATION_LOCK_TIMEOUT_MS)}")
+        conn.execute("SET statement_timeout = 0")
+        return conn
+
+    @classmethod
+    def applied(cls, conn) -> Dict[str, dict]:
+        """Migraciones registradas en schema_migrations, por versión"""
+        conn.execute(_CREATE_TABLE)
+        rows = conn.execute("SELECT version, name, checksum, duration_ms, applied_at FROM schema_migrations").fetchall()
+        return {row['version']: row for row in rows}
+
+    @classmethod
+    def status(cls) -> List[Tuple[Migration, Optional[dict]]]:
+        """
+        Estado de cada migración
+
+        Returns:
+            List[Tuple[Migration, Optional[dict]]]: (migración, fila registrada o None)
+        """
+        with cls._connect() as conn:
+            applied = cls.applied(conn)
+        return [(migration, applied.get(migration.version)) for migration in cls.discover()]
+
+    @classmethod
+    def migrate(cls, dry_run: bool = False) -> List[Tuple[str, float]]:
+        """
+        Aplica las migraciones pendientes en orden
+
+        Args:
+            dry_run (bool): Solo listar lo que se aplicaría
+
+        Returns:
+            List[Tuple[str, float]]: (migración, duración en ms) de las aplicadas
+
+        Raises:
+            Exception: La migración que falla detiene el proceso (las anteriores quedan aplicadas)
+        """
+        done = []
+        with cls._connect() as conn:
+            conn.execute("SELECT pg_advisory_lock(%s)", (_ADVISORY_LOCK_KEY,))
+            try:
+                applied = cls.applied(conn)
+                for migration in cls.discover():
+                    label = f"{migration.version}_{migration.name}"
+                    registered = applied.get(migration.version)
+                    if registered is not None:
+                        if registered['checksum'] != migration.checksum:
+                            logger.warning(f"⚠️ {label} cambió después de aplicarse (checksum distinto)")
+                        continue
+                    if dry_run:
+                        mode = 'sentencia por sentencia' if migration.concurrent else 'en una transacción'
+                        logger.info(f"📝 Pendiente: {label} ({len(migration.statements())} sentencias, {mode})")
+                        continue
+
+                    logger.info(f"🚚 Aplicando {label}...")
+                    started = time.perf_counter()
+                    cls._apply(conn, migration)
+                    duration_ms = (time.perf_counter() - started) * 1000
+                    conn.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum, duration_ms) VALUES (%s, %s, %s, %s)",
+                        (migration.version, migration.name, migration.checksum, round(duration_ms))
+                    )
+                    logger.info(f"✅ {label} aplicada en {duration_ms:.0f} ms")
+                    done.append((label, duration_ms))
+            finally:
+                conn.execute("SELECT pg_advisory_unlock(%s)", (_ADVISORY_LOCK_KEY,))
+        return done
+
+    @classmethod
+    def _apply(cls, conn, migration: Migration) -> None:
+        if not migration.concurrent:
+            def run_all():
+                with conn.transaction():
+                    for statement in migration.statements():
+                        conn.execute(statement)
+            cls._with_lock_retries(run_all, migration.name)
+            return
+
+        for statement in migration.statements():
+            index = _CREATE_INDEX_CONCURRENTLY.search(_strip_comments(statement))
+            index_name = index.group(1).strip('"') if index else None
+
+            def run_statement(statement=statement, index_name=index_name):
+                # Antes de cada intento: un lock_timeout a mitad de la construcción
+                # deja el índice INVALID y IF NOT EXISTS lo daría por creado
+                if index_name:
+                    cls._drop_if_invalid(conn, index_name)
+                conn.execute(statement)
+
+            started = time.perf_counter()
+            try:
+                cls._with_lock_retries(run_statement, _summary(statement))
+                if index_name and cls._is_invalid(conn, index_name):
+                    raise RuntimeError(f"El índice {index_name} quedó inválido tras crearse")
+            except Exception:
+                if index_name:
+                    # No dejar un índice INVALID que se mantiene en cada escritura sin usarse
+                    cls._drop_if_invalid(conn, index_name)
+                raise
+            logger.info(f"   {(time.perf_counter() - started) * 1000:8.0f} ms  {_summary(statement)}")
+
+    @staticmethod
+    def _with_lock_retries(fn, label: str):
+        from psycopg import errors as pg_errors
+
+        attempts = max(1, Config.MIGRATION_LOCK_RETRIES)
+        for attempt in range(1, attempts + 1):
+            try:
+                return fn()
+            except pg_errors.LockNotAvailable:
+                if attempt == attempts:
+                    raise
+                wait = Config.MIGRATION_RETRY_BACKOFF_SECONDS * attempt
+                logger.warning(f"⏳ lock_timeout en '{label}' (intento {attempt}/{attempts}), reintento en {wait:.0f} s")
+                time.sleep(wait)
+
+    @staticmethod
+    def _is_invalid(conn, index_name: str) -> bool:
+        """True si el índice existe y está marcado INVALID (indisvalid = false)"""
+        row = conn.execute(
+            """
+            SELECT NOT i.indisvalid AS invalid
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+            """,
+            (index_name,)
+        ).fetchone()
+        return bool(row and row['invalid'])
+
+    @classmethod
+    def _drop_if_invalid(cls, conn, index_name: str) -> None:
+        if cls._is_invalid(conn, index_name):
+            logger.warning(f"🧹 Borrando índice inválido {index_name} (construcción interrumpida)")
+            conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+    @staticmethod
+    def check_plans() -> List[Tuple[str, str, bool, List[str]]]:
+        """
+        Verifica con EXPLAIN que las consultas críticas usan su índice
+
+        Returns:
+            List[Tuple[str, str, bool, List[str]]]:
+                (consulta, índice esperado, ok, índices usados por el plan)
+        """
+        results = []
+        with MigrationRunner._connect() as conn:
+            for label, query, params, expected in plan_checks():
+                try:
+                    with conn.transaction():
+                        conn.execute("SET LOCAL enable_seqscan = off")
+                        row = conn.execute(f"EXPLAIN (FORMAT JSON) {query}", params).fetchone()
+                except Exception as e:
+                    # Tabla o índice inexistente: la verificación falla, no el comando
+                    results.append((label, expected, False, [f"error: {e}".splitlines()[0]]))
+                    continue
+                used = sorted(_plan_indexes(row['QUERY PLAN'][0]['Plan']))
+                results.append((label, expected, expected in used, used))
+        return results
+
+
+def _plan_indexes(node: dict) -> set:
+    """Índices que aparecen en un nodo del plan y sus hijos"""
+    found = set()
+    if 'Index Name' in node:
+        found.add(node['Index Name'])
+    for child in node.get('Plans', []):
+        found |= _plan_indexes(child)
+    return found
+
+
+def _summary(statement: str) -> str:
+    """Primera línea útil de una sentencia (para los logs)"""
+    for line in _strip_comments(statement).splitlines():
+        if line.strip():
+            return line.strip()[:100]
+    return statement[:100]
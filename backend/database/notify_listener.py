@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from psycopg import connect, sql
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class NotifyListener:
+    """Conexión dedicada a LISTEN compartida por los suscriptores del proceso
+
+    Un solo hilo por worker escucha todos los canales suscritos y entrega cada
+    payload al manejador del canal. Si la conexión se cae, se reconecta con
+    espera creciente y, tras volver a escuchar, llama a on_reconnect de cada
+    canal: las notificaciones enviadas mientras no se escuchaba se pierden, así
+    que el suscriptor debe recargar su estado completo.
+
+    También ejecuta tareas periódicas ligeras (every) en el mismo hilo, de modo
+    que los suscriptores no necesitan un hilo propio para podar su estado.
+    """
+
+    _handlers: Dict[str, Tuple[Callable[[str], None], Optional[Callable[[], None]]]] = {}
+    _periodic: List[list] = []
+    _pending: List[str] = []
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    _conn = None
+    _session = 0
+
+    _counters = {
+        'notifications_total': 0,
+        'reconnects_total': 0,
+        'handler_errors_total': 0,
+    }
+
+    @classmethod
+    def subscribe(cls, channel: str, on_message: Callable[[str], None],
+                  on_reconnect: Optional[Callable[[], None]] = None) -> None:
+        """
+        Suscribe un manejador a un canal (se puede llamar con el hilo en marcha)
+
+        on_reconnect también se llama después del primer LISTEN, para que el
+        suscriptor cargue su estado sin perder notificaciones intermedias.
+
+        Args:
+            channel (str): Canal de NOTIFY
+            on_message: Recibe el payload de cada notificación
+            on_reconnect: Recarga el estado completo tras (re)conectar
+        """
+        with cls._lock:
+            cls._handlers[channel] = (on_message, on_reconnect)
+            cls._pending.append(channel)
+
+    @classmethod
+    def every(cls, seconds: float, fn: Callable[[], None]) -> None:
+        """
+        Ejecuta fn cada `seconds` segundos desde el hilo del listener
+
+        Args:
+            seconds (float): Intervalo aproximado (resolución de 1 s)
+            fn: Tarea breve sin E/S bloqueante prolongada
+        """
+        with cls._lock:
+            cls._periodic.append([seconds, fn, 0.0])
+
+    @classmethod
+    def _connect(cls):
+        """Abre la conexión de escucha (autocommit) y escucha todos los canales"""
+        conn = connect(Config.get_db_url(), autocommit=True)
+        with cls._lock:
+            channels = list(cls._handlers)
+            cls._pending.clear()
+        for channel in channels:
+            conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+        cls._session += 1
+        cls._conn = conn
+        return channels
+
+    @classmethod
+    def _listen_pending(cls) -> List[str]:
+        """Escucha los canales suscritos después de conectar"""
+        with cls._lock:
+            channels = list(cls._pending)
+            cls._pending.clear()
+        for channel in channels:
+            cls._conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+        return channels
+
+    @classmethod
+    def _resync(cls, channels: List[str]) -> None:
+        for channel in channels:
+            on_reconnect = cls._handlers[channel][1]
+            if on_reconnect is None:
+                continue
+            try:
+                on_reconnect()
+            except Exception as e:
+                cls._counters['handler_errors_total'] += 1
+                logger.error(f"❌ Error al resincronizar el canal {channel}: {e}")
+
+    @classmethod
+    def _dispatch(cls, channel: str, payload: str) -> None:
+        cls._counters['notifications_total'] += 1
+        handler = cls._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            handler[0](payload)
+        except Exception as e:
+            cls._counters['handler_errors_total'] += 1
+            logger.error(f"❌ Error al procesar notificación de {channel}: {e}")
+
+    @classmethod
+    def _run_periodic(cls) -> None:
+        now = time.monotonic()
+        with cls._lock:
+            due = [task for task in cls._periodic if now >= task[2]]
+            for task in due:
+                task[2] = now + task[0]
+        for _seconds, fn, _next in due:
+            try:
+                fn()
+            except Exception as e:
+                cls._counters['handler_errors_total'] += 1
+                logger.error(f"❌ Error en tarea periódica del listener: {e}")
+
+    @classmethod
+    def _close(cls) -> None:
+        conn, cls._conn = cls._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    @classmethod
+    def _run(cls) -> None:
+        failures = 0
+        while not cls._stop.is_set():
+            try:
+                cls._resync(cls._connect())
+                if failures:
+                    cls._counters['reconnects_total'] += 1
+                    logger.info("🔌 Listener de notificaciones reconectado")
+                failures = 0
+                while not cls._stop.is_set():
+                    for notify in cls._conn.notifies(timeout=1):
+                        cls._dispatch(notify.channel, notify.payload)
+                    cls._resync(cls._listen_pending())
+                    cls._run_periodic()
+            except Exception as e:
+                failures += 1
+                logger.warning(f"⚠️ Listener de notificaciones desconectado: {e}")
+            finally:
+                cls._close()
+            # Espera creciente entre reconexiones (tope configurable)
+            cls._stop.wait(min(2 ** failures, Config.NOTIFY_RECONNECT_MAX_SECONDS))
+
+    @classmethod
+    def session(cls) -> Optional[int]:
+        """
+        Número de la conexión de escucha actual
+
+        Cambia en cada reconexión: quien guarda estado derivado de las
+        notificaciones puede saber si lo resincronizó con esta conexión.
+
+        Returns:
+            int: Número de conexión o None si no se está escuchando
+        """
+        return cls._session if cls._conn is not None else None
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """Contadores del listener y canales escuchados"""
+        snapshot = dict(cls._counters)
+        snapshot['channels'] = len(cls._handlers)
+        snapshot['connected'] = int(cls._conn is not None)
+        return snapshot
+
+    @classmethod
+    def start(cls) -> None:
+        """Arranca el hilo de escucha (idempotente)"""
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=cls._run, name='notify-listener', daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Detiene el hilo y cierra la conexión de escucha"""
+        cls._stop.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
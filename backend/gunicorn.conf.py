@@ -0,0 +1,72 @@
+"""
+Configuración de gunicorn para producción
+
+Uso:
+    gunicorn -c gunicorn.conf.py wsgi:app
+    python serve.py
+
+Cada worker es un proceso independiente (prefork) con sus propios hilos y su
+propio pool de conexiones, creado después del fork. Los workers se reciclan
+tras GUNICORN_MAX_REQUESTS peticiones y, con SIGTERM, dejan de aceptar
+conexiones y terminan las peticiones en curso antes de salir.
+"""
+import os
+import shutil
+
+from config import Config
+
+# Métricas agregadas entre workers: debe definirse antes de que se importe
+# prometheus_client en los workers
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', Config.METRICS_MULTIPROC_DIR)
+
+bind = f"{Config.HOST}:{Config.PORT}"
+workers = Config.WEB_CONCURRENCY
+worker_class = 'gthread'
+threads = Config.GUNICORN_THREADS
+
+# Reciclado de workers (el jitter evita que todos se reinicien a la vez)
+max_requests = Config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = Config.GUNICORN_MAX_REQUESTS_JITTER
+
+# Tiempo máximo por petición y tiempo de drenado al recibir SIGTERM
+timeout = Config.GUNICORN_TIMEOUT
+graceful_timeout = Config.GUNICORN_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# La app se crea en cada worker: los hilos de fondo no sobreviven a un fork
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Descartar valores de una ejecución anterior
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+    server.log.info(f"🚀 Gunicorn en http://{bind} con {workers} workers x {threads} hilos")
+
+
+def post_fork(server, worker):
+    """Pool de conexiones propio de cada worker"""
+    from database.connection import Database
+
+    Database.reset_after_fork()
+    Database.init_pool()
+
+
+def worker_exit(server, worker):
+    """Persistir estado en memoria y cerrar el pool al salir el worker"""
+    from utils.lifecycle import Lifecycle
+
+    # gunicorn ya dejó de aceptar conexiones y esperó las peticiones en curso
+    # (graceful_timeout); aquí solo quedan los hooks de apagado
+    Lifecycle.shutdown()
+
+
+def child_exit(server, worker):
+    """Quitar de /metrics los gauges del worker que terminó"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,9 +1,107 @@
-from services.user_service import UserService
-from services.auth_service import AuthService
-from services.password_reset_service import PasswordResetService
-from services.email_service import EmailService
+#!/usr/bin/env python3
+"""
+Verificación de imports y perfil de arranque
 
-from repositories import UserRepository, PasswordResetRepository
+Uso:
+    python import_check.py
+    python import_check.py --profile [--top N] [--budget-ms MS] [--module MOD]
 
+Sin opciones comprueba que los módulos principales se importan. Con --profile
+importa MOD (por defecto 'app', lo que hace cada worker nuevo) en un proceso
+limpio con -X importtime, resume el tiempo por módulo y por paquete, y termina
+con código 1 si el import supera el presupuesto (STARTUP_IMPORT_BUDGET_MS).
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
 
-print('imports OK')
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def check_imports() -> None:
+    from services.user_service import UserService
+    from services.auth_service import AuthService
+    from services.password_reset_service import PasswordResetService
+    from services.email_service import EmailService
+
+    from repositories import UserRepository, PasswordResetRepository
+
+    print('imports OK')
+
+
+def run_importtime(module: str):
+    """
+    Importa el módulo en un intérprete nuevo con -X importtime
+
+    Returns:
+        List[Tuple[str, int, int, int]]: (módulo, self µs, acumulado µs, nivel)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise SystemExit(f"❌ No se pudo importar {module}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return rows
+
+
+def profile(module: str, top: int, budget_ms: float) -> int:
+    rows = run_importtime(module)
+    root = next((r for r in reversed(rows) if r[0] == module), None)
+    total_ms = (root[2] if root else sum(r[1] for r in rows)) / 1000
+
+    by_package = defaultdict(int)
+    for name, self_us, _cumulative, _level in rows:
+        by_package[name.split('.')[0]] += self_us
+
+    print(f"\n⏱️  import {module}: {total_ms:.1f} ms ({len(rows)} módulos)\n")
+
+    print(f"📦 Paquetes con más tiempo propio (top {top}):")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"   {self_us / 1000:8.1f} ms  {package}")
+
+    print(f"\n📄 Módulos con más tiempo acumulado (top {top}):")
+    for name, _self_us, cumulative_us, _level in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if total_ms > budget_ms:
+        print(f"\n❌ El arranque supera el presupuesto: {total_ms:.1f} ms > {budget_ms:.0f} ms")
+        return 1
+
+    print(f"\n✅ Dentro del presupuesto: {total_ms:.1f} ms <= {budget_ms:.0f} ms")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificación de imports y perfil de arranque')
+    parser.add_argument('--profile', action='store_true', help='Perfil de tiempos de import')
+    parser.add_argument('--module', default='app', help='Módulo a perfilar (por defecto app)')
+    parser.add_argument('--top', type=int, default=15, help='Filas a mostrar')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Presupuesto de arranque en ms')
+    args = parser.parse_args()
+
+    if not args.profile:
+        check_imports()
+        return
+
+    budget_ms = args.budget_ms
+    if budget_ms is None:
+        from config import Config
+        budget_ms = Config.STARTUP_IMPORT_BUDGET_MS
+
+    sys.exit(profile(args.module, args.top, budget_ms))
+
+
+if __name__ == '__main__':
+    main()
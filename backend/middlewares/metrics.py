@@ -0,0 +1,202 @@
+"""
+Métricas Prometheus por endpoint
+
+Con varios procesos (gunicorn, uvicorn --workers) cada worker escribe sus
+valores en PROMETHEUS_MULTIPROC_DIR y /metrics agrega los de todos los
+procesos. gunicorn.conf.py prepara el directorio y marca los workers que
+terminan; sin la variable se usa el registro en memoria del proceso.
+
+Los componentes en memoria (registro de eventos, filtro de emails, listener,
+cachés...) exponen sus contadores con metrics(); ComponentCollector los
+convierte en métricas al servir /metrics. Son valores del proceso que
+responde: en modo multiproceso llevan la etiqueta pid.
+"""
+import importlib
+import logging
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Latencias esperables: desde respuestas cacheadas hasta bcrypt + SMTP
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Duración de las peticiones HTTP por endpoint',
+    ['endpoint', 'method'],
+    buckets=LATENCY_BUCKETS
+)
+
+REQUESTS_TOTAL = Counter(
+    'http_requests_total',
+    'Peticiones HTTP por endpoint y código de estado',
+    ['endpoint', 'method', 'status']
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'Peticiones HTTP en curso por endpoint',
+    ['endpoint'],
+    multiprocess_mode='livesum'
+)
+
+# Peticiones sin ruta (404) comparten una sola serie
+_UNMATCHED = 'unmatched'
+
+# Prefijo de las métricas -> (módulo, clase con metrics())
+COMPONENTS = {
+    'auth_events': ('services.auth_event_log', 'AuthEventLog'),
+    'email_filter': ('services.email_filter', 'EmailFilter'),
+    'reset_attempts': ('services.reset_attempt_tracker', 'ResetAttemptTracker'),
+    'notify_listener': ('database.notify_listener', 'NotifyListener'),
+    'cache_invalidation': ('database.invalidation_bus', 'InvalidationBus'),
+    'token_revocation': ('services.token_revocation', 'TokenRevocation'),
+}
+
+
+class ComponentCollector:
+    """Exporta los snapshots metrics() de los componentes en memoria
+
+    Las claves terminadas en _total son contadores; el resto, gauges. Los
+    módulos se importan al recolectar para no cargar servicios al importar
+    este middleware. Un componente que falla no impide exportar los demás.
+    """
+
+    def __init__(self, labels: dict = None):
+        self.labels = labels or {}
+
+    def describe(self):
+        # Sin descripción previa: el registro no llama a collect() al registrar
+        return []
+
+    def _metric(self, name: str, value, documentation: str):
+        names, values = list(self.labels), list(self.labels.values())
+        if name.endswith('_total'):
+            family = CounterMetricFamily(name, documentation, labels=names)
+        else:
+            family = GaugeMetricFamily(name, documentation, labels=names)
+        family.add_metric(values, value)
+        return family
+
+    def collect(self):
+        for prefix, (module, attr) in COMPONENTS.items():
+            try:
+                snapshot = getattr(importlib.import_module(module), attr).metrics()
+            except Exception as e:
+                logger.error(f"❌ Error al leer las métricas de {attr}: {e}")
+                continue
+            for key, value in snapshot.items():
+                yield self._metric(f'{prefix}_{key}', value, f'{attr}.metrics()[{key!r}]')
+
+        from utils.log import dropped_records
+        yield self._metric('log_records_dropped_total', dropped_records(), 'Registros de log descartados por cola llena')
+
+
+REGISTRY.register(ComponentCollector())
+
+
+def _registry():
+    """Registro a exportar: el agregado multiproceso o el del proceso"""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(ComponentCollector({'pid': str(os.getpid())}))
+    return registry
+
+
+def render_metrics():
+    """
+    Serializa las métricas en formato de texto de Prometheus
+
+    Returns:
+        Tuple[bytes, str]: (cuerpo, content-type)
+    """
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def _start(endpoint: str) -> float:
+    REQUESTS_IN_FLIGHT.labels(endpoint).inc()
+    return time.perf_counter()
+
+
+def _finish(endpoint: str, method: str, status: int, started: float) -> None:
+    REQUEST_LATENCY.labels(endpoint, method).observe(time.perf_counter() - started)
+    REQUESTS_TOTAL.labels(endpoint, method, str(status)).inc()
+
+
+def init_metrics(app) -> None:
+    """
+    Registra las métricas por endpoint en una aplicación Flask y expone /metrics
+
+    Args:
+        app (Flask): Aplicación
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_endpoint = request.endpoint or _UNMATCHED
+        g._metrics_started = _start(g._metrics_endpoint)
+
+    @app.after_request
+    def _metrics_finish(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            _finish(g._metrics_endpoint, request.method, response.status_code, started)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(_error=None):
+        # Siempre se ejecuta, también si la respuesta falló
+        endpoint = g.pop('_metrics_endpoint', None)
+        if endpoint is not None:
+            REQUESTS_IN_FLIGHT.labels(endpoint).dec()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Métricas en formato Prometheus"""
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
+
+
+def init_metrics_async(app) -> None:
+    """
+    Igual que init_metrics para la variante ASGI (Quart)
+
+    Args:
+        app (Quart): Aplicación
+    """
+    from quart import Response, g, request
+
+    @app.before_request
+    async def _metrics_start():
+        g._metrics_endpoint = request.endpoint or _UNMATCHED
+        g._metrics_started = _start(g._metrics_endpoint)
+
+    @app.after_request
+    async def _metrics_finish(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            _finish(g._metrics_endpoint, request.method, response.status_code, started)
+        return response
+
+    @app.teardown_request
+    async def _metrics_teardown(_error=None):
+        endpoint = g.pop('_metrics_endpoint', None)
+        if endpoint is not None:
+            REQUESTS_IN_FLIGHT.labels(endpoint).dec()
+
+    @app.route('/metrics', methods=['GET'])
+    async def metrics():
+        """Métricas en formato Prometheus"""
+        body, content_type = render_metrics()
+        return Response(body, content_type=content_type)
@@ -0,0 +1,195 @@
+"""
+Perfilado bajo demanda de peticiones individuales
+
+Se activa con PROFILING_ENABLED=True. Entonces se perfila una petición si trae
+la cabecera X-Profile con el valor de PROFILING_TOKEN o, al azar, con
+probabilidad PROFILING_SAMPLE_RATE. El resultado se guarda en PROFILING_DIR
+con el id de la petición (X-Request-ID o uno generado), que se devuelve en la
+cabecera X-Profile-Id:
+
+    <id>.txt     funciones con más tiempo acumulado (modo 'cprofile')
+    <id>.prof    volcado de pstats, para snakeviz o python -m pstats
+    <id>.folded  pilas colapsadas para flamegraph.pl / speedscope (modo 'sample')
+
+Con PROFILING_ENABLED=False el middleware no se instala y no cuesta nada.
+"""
+import hmac
+import io
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_SAFE_ID = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def _consume(app_iter) -> list:
+    """Genera el cuerpo completo (dentro del perfil) y cierra el iterable"""
+    try:
+        return list(app_iter)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+
+
+class _StackSampler:
+    """Muestrea la pila de un hilo a intervalos fijos (pilas colapsadas)"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilerMiddleware:
+    """Middleware WSGI que perfila las peticiones seleccionadas"""
+
+    def __init__(self, wsgi_app, output_dir: str = None, mode: str = None,
+                 sample_rate: float = None, token: str = None):
+        self.wsgi_app = wsgi_app
+        self.output_dir = output_dir or Config.PROFILING_DIR
+        self.mode = mode or Config.PROFILING_MODE
+        self.sample_rate = Config.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.token = Config.PROFILING_TOKEN if token is None else token
+        # cProfile no admite dos perfiles activos a la vez (sys.monitoring)
+        self._cprofile_lock = threading.Lock()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _requested(self, environ) -> bool:
+        header = environ.get('HTTP_X_PROFILE')
+        if header is not None and self.token:
+            return hmac.compare_digest(header, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        if not self._requested(environ):
+            return self.wsgi_app(environ, start_response)
+
+        request_id = _SAFE_ID.sub('', environ.get('HTTP_X_REQUEST_ID', ''))[:64] or uuid.uuid4().hex
+
+        def start_with_id(status, headers, exc_info=None):
+            headers.append(('X-Profile-Id', request_id))
+            return start_response(status, headers, exc_info)
+
+        if self.mode == 'sample':
+            return self._run_sampled(environ, start_with_id, request_id)
+        return self._run_cprofile(environ, start_with_id, request_id)
+
+    def _run_cprofile(self, environ, start_response, request_id: str):
+        import cProfile
+
+        if not self._cprofile_lock.acquire(blocking=False):
+            # Ya hay una petición perfilándose: atender esta sin perfil
+            return self.wsgi_app(environ, start_response)
+
+        try:
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            body = profile.runcall(lambda: _consume(self.wsgi_app(environ, start_response)))
+            elapsed = time.perf_counter() - started
+        finally:
+            self._cprofile_lock.release()
+
+        self._write_cprofile(profile, environ, request_id, elapsed)
+        return body
+
+    def _run_sampled(self, environ, start_response, request_id: str):
+        sampler = _StackSampler(threading.get_ident(), Config.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            body = _consume(self.wsgi_app(environ, start_response))
+        finally:
+            sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        path = os.path.join(self.output_dir, f"{request_id}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(sampler.collapsed())
+        self._log(environ, request_id, elapsed, path)
+        self._prune()
+        return body
+
+    def _write_cprofile(self, profile, environ, request_id: str, elapsed: float) -> None:
+        import pstats
+
+        base = os.path.join(self.output_dir, request_id)
+        profile.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"{environ.get('REQUEST_METHOD')} {environ.get('PATH_INFO')} "
+                     f"{elapsed * 1000:.1f} ms\n\n")
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats('cumulative').print_stats(Config.PROFILING_TOP_N)
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+
+        self._log(environ, request_id, elapsed, f"{base}.txt")
+        self._prune()
+
+    def _log(self, environ, request_id: str, elapsed: float, path: str) -> None:
+        logger.info("🔬 Petición perfilada", extra={
+            'request_id': request_id,
+            'method': environ.get('REQUEST_METHOD'),
+            'path': environ.get('PATH_INFO'),
+            'duration_ms': round(elapsed * 1000, 2),
+            'profile': path,
+        })
+
+    def _prune(self) -> None:
+        """Conserva solo los PROFILING_MAX_FILES archivos más recientes"""
+        try:
+            entries = sorted(
+                (entry for entry in os.scandir(self.output_dir) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in entries[:-Config.PROFILING_MAX_FILES]:
+                os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudieron limpiar perfiles antiguos: {e}")
+
+
+def init_profiler(app) -> None:
+    """
+    Instala el perfilado bajo demanda si está habilitado
+
+    Args:
+        app (Flask): Aplicación
+    """
+    if not Config.PROFILING_ENABLED:
+        return
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app)
+    logger.info(f"🔬 Perfilado bajo demanda activo ({Config.PROFILING_MODE}, muestreo {Config.PROFILING_SAMPLE_RATE})")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Migraciones de esquema
+
+Uso:
+    python migrate.py               # aplica las pendientes y verifica los planes
+    python migrate.py status        # aplicadas y pendientes
+    python migrate.py up --dry-run  # lista lo que se aplicaría
+    python migrate.py check-plans   # solo EXPLAIN de las consultas críticas
+
+Ver database/migrator.py. Sale con código 1 si una migración falla o si alguna
+consulta crítica no usa el índice esperado.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database.migrator import MigrationRunner
+from utils.log import setup_logging, shutdown_logging
+
+
+def show_status() -> int:
+    print("\n📋 Migraciones")
+    for migration, applied in MigrationRunner.status():
+        label = f"{migration.version}_{migration.name}"
+        if applied is None:
+            print(f"   ⏳ {label:<45} pendiente")
+            continue
+        changed = '  ⚠️ checksum distinto' if applied['checksum'] != migration.checksum else ''
+        print(f"   ✅ {label:<45} {applied['applied_at']:%Y-%m-%d %H:%M}  {applied['duration_ms']:>7} ms{changed}")
+    return 0
+
+
+def run_migrations(dry_run: bool) -> int:
+    try:
+        done = MigrationRunner.migrate(dry_run=dry_run)
+    except Exception as e:
+        print(f"\n❌ Migración fallida: {e}")
+        return 1
+    if not dry_run:
+        total_ms = sum(duration for _label, duration in done)
+        print(f"\n✅ {len(done)} migraciones aplicadas en {total_ms:.0f} ms")
+    return 0
+
+
+def check_plans() -> int:
+    print("\n🔎 Planes de las consultas críticas")
+    failures = 0
+    for label, expected, ok, used in MigrationRunner.check_plans():
+        if ok:
+            print(f"   ✅ {label:<50} {expected}")
+        else:
+            failures += 1
+            print(f"   ❌ {label:<50} esperaba {expected}, usa {', '.join(used) or 'recorrido secuencial'}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migraciones de esquema')
+    parser.add_argument('command', nargs='?', default='up', choices=['up', 'status', 'check-plans'])
+    parser.add_argument('--dry-run', action='store_true', help='Solo listar las migraciones pendientes')
+    parser.add_argument('--skip-plans', action='store_true', help='No verificar los planes tras migrar')
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        if args.command == 'status':
+            code = show_status()
+        elif args.command == 'check-plans':
+            code = check_plans()
+        else:
+            code = run_migrations(args.dry_run)
+            if code == 0 and not args.dry_run and not args.skip_plans:
+                code = check_plans()
+    finally:
+        shutdown_logging()
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
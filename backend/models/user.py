@@ -1,21 +1,31 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
+from uuid import UUID
 
+from psycopg.rows import args_row
+
+# Columnas en el orden de los campos de User (para user_row)
+USER_COLUMNS = "id, name, email, password_hash, created_at, updated_at, is_active, last_login"
+
+@dataclass(slots=True, eq=False)
 class User:
-    """Modelo de Usuario"""
+    """Modelo de Usuario
+
+    Con slots y sin __dict__: cada login y cada petición autenticada crea uno.
+    Las instancias se tratan como instantáneas de la fila (no se modifican),
+    por eso su forma serializada se cachea.
+    """
     
-    def __init__(self, id: str = None, name: str = None, email: str = None, 
-                 password_hash: str = None, created_at: datetime = None, 
-                 updated_at: datetime = None, is_active: bool = True, 
-                 last_login: datetime = None):
-        self.id = id
-        self.name = name
-        self.email = email
-        self.password_hash = password_hash
-        self.created_at = created_at
-        self.updated_at = updated_at
-        self.is_active = is_active
-        self.last_login = last_login
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    password_hash: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_active: bool = True
+    last_login: Optional[datetime] = None
+    _public: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
     
     def to_dict(self, include_password: bool = False) -> Dict[str, Any]:
         """
@@ -27,25 +37,28 @@ class User:
         Returns:
             Dict: Representación del usuario
         """
-        user_dict = {
-            'id': str(self.id) if self.id else None,
-            'name': self.name,
-            'email': self.email,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'is_active': self.is_active,
-            'last_login': self.last_login.isoformat() if self.last_login else None
-        }
-        
         if include_password:
-            user_dict['password_hash'] = self.password_hash
-            
-        return user_dict
+            return {**self.to_dict(), 'password_hash': self.password_hash}
+        
+        if self._public is None:
+            # UUID y datetime se dejan tal cual: el proveedor JSON (orjson) los
+            # serializa de forma nativa, con el mismo formato que str()/isoformat()
+            self._public = {
+                'id': self.id,
+                'name': self.name,
+                'email': self.email,
+                'created_at': self.created_at,
+                'updated_at': self.updated_at,
+                'is_active': self.is_active,
+                'last_login': self.last_login
+            }
+        # Copia: el usuario puede estar compartido (caché de UserRepository)
+        return dict(self._public)
     
     @staticmethod
     def from_db_row(row: Dict[str, Any]) -> 'User':
         """
-        Crea una instancia de User desde una fila de base de datos
+        Crea una instancia de User desde una fila de base de datos (dict_row)
         
         Args:
             row (Dict): Fila de la base de datos
@@ -68,4 +81,8 @@ class User:
         )
     
     def __repr__(self):
-        return f"<User {self.email}>"
\ No newline at end of file
+        return f"<User {self.email}>"
+
+# Row factory de psycopg: construye User directamente con los valores de la
+# fila, sin dict intermedio. La consulta debe seleccionar USER_COLUMNS.
+user_row = args_row(User)
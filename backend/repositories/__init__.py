@@ -4,5 +4,7 @@ Repositorios de acceso a datos
 """
 from .user_repository import UserRepository
 from .password_reset_repository import PasswordResetRepository
+from .email_outbox_repository import EmailOutboxRepository
+from .reset_attempt_repository import ResetAttemptRepository
 
-__all__ = ['UserRepository', 'PasswordResetRepository']
\ No newline at end of file
+__all__ = ['UserRepository', 'PasswordResetRepository', 'EmailOutboxRepository', 'ResetAttemptRepository']
\ No newline at end of file
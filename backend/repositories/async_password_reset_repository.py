@@ -0,0 +1,133 @@
+import logging
+from typing import Optional
+from database.async_connection import AsyncDatabase
+from repositories.password_reset_repository import (
+    ACTIVE_TOKEN_QUERY,
+    ISSUE_LOCK_QUERY,
+    RECENT_TOKEN_QUERY,
+    PasswordResetRepository,
+)
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPasswordResetRepository:
+    """Versión asíncrona de PasswordResetRepository (variante ASGI)"""
+
+    @staticmethod
+    async def create_reset_token(user_id: str, cursor, expiration_minutes: int = 15) -> Optional[str]:
+        """Crea un token de recuperación dentro de la transacción del cursor"""
+        token = PasswordResetRepository.generate_token()
+        expires_at = datetime.now() + timedelta(minutes=expiration_minutes)
+
+        await cursor.execute(
+            """
+            INSERT INTO password_reset_tokens (user_id, token, expires_at)
+            VALUES (%s, %s, %s)
+            RETURNING token
+            """,
+            (user_id, token, expires_at)
+        )
+        result = await cursor.fetchone()
+        return result['token'] if result else None
+
+    @staticmethod
+    async def invalidate_old_tokens(user_id: str, cursor) -> bool:
+        """Invalida los tokens pendientes del usuario dentro de la transacción del cursor"""
+        await cursor.execute(
+            """
+            UPDATE password_reset_tokens
+            SET used = true
+            WHERE user_id = %s AND used = false
+            """,
+            (user_id,)
+        )
+        return True
+
+    @staticmethod
+    async def issued_recently(user_id: str, min_interval_seconds: float, cursor) -> bool:
+        """Toma el lock de emisión del usuario y comprueba si ya hay un código reciente"""
+        await cursor.execute(ISSUE_LOCK_QUERY, (f"password_reset:{user_id}",))
+        await cursor.execute(RECENT_TOKEN_QUERY, (user_id, min_interval_seconds))
+        result = await cursor.fetchone()
+        return bool(result and result['recent'])
+
+    @staticmethod
+    async def verify_token(email: str, token: str) -> Optional[str]:
+        """
+        Verifica un token de recuperación
+
+        Returns:
+            str: user_id si el token es válido, None si no lo es
+        """
+        query = """
+            SELECT prt.user_id, prt.expires_at, prt.used
+            FROM password_reset_tokens prt
+            JOIN users u ON u.id = prt.user_id
+            WHERE lower(u.email) = lower(%s) AND prt.token = %s
+            ORDER BY prt.created_at DESC
+            LIMIT 1
+        """
+
+        try:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute(query, (email, token))
+                result = await cursor.fetchone()
+
+                if not result or result['used']:
+                    return None
+
+                if datetime.now() > result['expires_at']:
+                    return None
+
+                return result['user_id']
+        except Exception as e:
+            logger.error(f"❌ Error al verificar token: {e}")
+            return None
+
+    @staticmethod
+    async def mark_token_as_used(user_id: str, token: str) -> bool:
+        """Marca un token como usado"""
+        query = """
+            UPDATE password_reset_tokens
+            SET used = true
+            WHERE user_id = %s AND token = %s
+        """
+
+        try:
+            async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                await cursor.execute(query, (user_id, token))
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"❌ Error al marcar token como usado: {e}")
+            return False
+
+    @staticmethod
+    async def invalidate_tokens_by_email(email: str) -> bool:
+        """Invalida los tokens pendientes del usuario con ese email"""
+        query = """
+            UPDATE password_reset_tokens prt
+            SET used = true
+            FROM users u
+            WHERE u.id = prt.user_id AND lower(u.email) = lower(%s) AND prt.used = false
+        """
+
+        try:
+            async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                await cursor.execute(query, (email,))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al invalidar tokens por email: {e}")
+            return False
+
+    @staticmethod
+    async def get_active_token(user_id: str) -> Optional[dict]:
+        """Obtiene el token activo más reciente de un usuario"""
+        try:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute(ACTIVE_TOKEN_QUERY, (user_id,))
+                return await cursor.fetchone()
+        except Exception as e:
+            logger.error(f"❌ Error al obtener token activo: {e}")
+            return None
@@ -0,0 +1,124 @@
+import logging
+from typing import Optional
+from database.async_connection import AsyncDatabase
+from database.invalidation_bus import USERS, InvalidationBus
+from models.user import USER_COLUMNS, User, user_row
+from repositories.user_repository import (
+    EMAIL_REGISTERED_CHANNEL,
+    EMAIL_REGISTERED_QUERY,
+    FIND_BY_EMAIL_QUERY,
+    FIND_BY_ID_QUERY,
+)
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserRepository:
+    """Versión asíncrona de UserRepository (variante ASGI)"""
+
+    @staticmethod
+    async def create(name: str, email: str, password_hash: str) -> Optional[User]:
+        """
+        Crea un nuevo usuario
+
+        Returns:
+            User: Usuario creado o None si el email ya estaba registrado
+        """
+        query = f"""
+            INSERT INTO users (name, email, password_hash)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (lower(email)) DO NOTHING
+            RETURNING {USER_COLUMNS}
+        """
+
+        try:
+            async with AsyncDatabase.get_cursor(commit=True, row_factory=user_row) as cursor:
+                await cursor.execute(query, (name, email, password_hash))
+                user = await cursor.fetchone()
+                if user:
+                    await cursor.execute(EMAIL_REGISTERED_QUERY, (EMAIL_REGISTERED_CHANNEL, user.email))
+                return user
+        except Exception as e:
+            logger.error(f"❌ Error al crear usuario: {e}")
+            raise
+
+    @staticmethod
+    async def find_by_email(email: str) -> Optional[User]:
+        """Busca un usuario activo por email"""
+        try:
+            async with AsyncDatabase.get_cursor(row_factory=user_row) as cursor:
+                await cursor.execute(FIND_BY_EMAIL_QUERY, (email,))
+                return await cursor.fetchone()
+        except Exception as e:
+            logger.error(f"❌ Error al buscar usuario por email: {e}")
+            return None
+
+    @staticmethod
+    async def find_by_id(user_id: str) -> Optional[User]:
+        """Busca un usuario activo por ID (caché local invalidada por NOTIFY)"""
+        user = InvalidationBus.get(USERS, user_id)
+        if user is not None:
+            return user
+
+        try:
+            stamp = InvalidationBus.stamp()
+            async with AsyncDatabase.get_cursor(row_factory=user_row) as cursor:
+                await cursor.execute(FIND_BY_ID_QUERY, (user_id,))
+                user = await cursor.fetchone()
+            if user is not None:
+                InvalidationBus.put(USERS, user_id, user, stamp)
+            return user
+        except Exception as e:
+            logger.error(f"❌ Error al buscar usuario por ID: {e}")
+            return None
+
+    @staticmethod
+    async def update_last_login(user_id: str) -> bool:
+        """Actualiza la fecha del último login"""
+        query = """
+            UPDATE users
+            SET last_login = %s
+            WHERE id = %s
+        """
+
+        try:
+            async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                await cursor.execute(query, (datetime.now(), user_id))
+                if cursor.rowcount == 0:
+                    return False
+                await InvalidationBus.publish_async(cursor, USERS, user_id)
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al actualizar last_login: {e}")
+            return False
+
+    @staticmethod
+    async def email_exists(email: str) -> bool:
+        """Verifica si un email ya existe"""
+        query = "SELECT EXISTS(SELECT 1 FROM users WHERE lower(email) = lower(%s))"
+
+        try:
+            async with AsyncDatabase.get_cursor() as cursor:
+                await cursor.execute(query, (email,))
+                result = await cursor.fetchone()
+                return result['exists'] if result else False
+        except Exception as e:
+            logger.error(f"❌ Error al verificar email: {e}")
+            return False
+
+    @staticmethod
+    async def update_password(user_id: str, password_hash: str, cursor) -> bool:
+        """Actualiza la contraseña dentro de la transacción del cursor"""
+        await cursor.execute(
+            """
+            UPDATE users
+            SET password_hash = %s, updated_at = NOW()
+            WHERE id = %s
+            """,
+            (password_hash, user_id)
+        )
+        if cursor.rowcount == 0:
+            return False
+        await InvalidationBus.publish_async(cursor, USERS, user_id)
+        return True
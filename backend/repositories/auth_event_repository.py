@@ -0,0 +1,155 @@
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Sequence
+from psycopg import sql
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+AUTH_EVENT_COLUMNS = ('occurred_at', 'event_type', 'success', 'user_id', 'email', 'ip', 'user_agent', 'detail')
+
+_COPY_QUERY = f"COPY auth_events ({', '.join(AUTH_EVENT_COLUMNS)}) FROM STDIN"
+
+# auth_events_AAAA_MM (la partición por defecto no entra en la retención)
+_PARTITION_NAME = re.compile(r'^auth_events_(\d{4})_(\d{2})$')
+
+_DEFAULT_PARTITION = 'auth_events_default'
+
+
+def _month_start(year: int, month: int) -> datetime:
+    """Inicio del mes en UTC, normalizando meses fuera de 1..12"""
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+class AuthEventRepository:
+    """Escritura por lotes y particiones de la tabla auth_events"""
+
+    @staticmethod
+    def copy_events(rows: Sequence[tuple]) -> int:
+        """
+        Escribe un lote de eventos con COPY (una sola transacción)
+
+        COPY envía todas las filas en un único flujo: no hay un viaje de ida y
+        vuelta ni un plan de INSERT por evento. Los errores se propagan para que
+        el llamador decida si reintenta el lote.
+
+        Args:
+            rows (Sequence[tuple]): Filas en el orden de AUTH_EVENT_COLUMNS
+
+        Returns:
+            int: Filas escritas
+        """
+        if not rows:
+            return 0
+
+        with Database.get_cursor(commit=True) as cursor:
+            with cursor.copy(_COPY_QUERY) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        return len(rows)
+
+    @staticmethod
+    def ensure_partitions(months_ahead: int, today: date = None) -> List[str]:
+        """
+        Crea (si faltan) las particiones del mes en curso y los siguientes
+
+        Args:
+            months_ahead (int): Meses posteriores al actual a preparar
+            today (date): Fecha de referencia (por defecto, hoy en UTC)
+
+        Returns:
+            List[str]: Nombres de las particiones preparadas
+        """
+        today = today or datetime.now(timezone.utc).date()
+        names = []
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                for offset in range(months_ahead + 1):
+                    start = _month_start(today.year, today.month + offset)
+                    end = _month_start(start.year, start.month + 1)
+                    name = f"auth_events_{start.year:04d}_{start.month:02d}"
+                    cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (name,))
+                    if not cursor.fetchone()['present']:
+                        AuthEventRepository._create_partition(cursor, name, start, end)
+                    names.append(name)
+            return names
+        except Exception as e:
+            logger.error(f"❌ Error al crear particiones de auth_events: {e}")
+            return []
+
+    @staticmethod
+    def _create_partition(cursor, name: str, start: datetime, end: datetime) -> None:
+        """
+        Crea la partición de un mes, sacando antes de la partición por defecto
+        las filas de ese rango (dentro de la transacción del cursor)
+
+        Con filas del mes en auth_events_default, PostgreSQL rechaza crear la
+        partición. Como la tabla no admite DELETE, la partición por defecto se
+        desconecta y se reemplaza por una vacía, y sus filas se vuelven a
+        insertar en auth_events para que cada una caiga en su partición.
+        """
+        create = sql.SQL(
+            "CREATE TABLE {} PARTITION OF auth_events FOR VALUES FROM ({}) TO ({})"
+        ).format(sql.Identifier(name), sql.Literal(start), sql.Literal(end))
+
+        cursor.execute(
+            sql.SQL("SELECT EXISTS (SELECT 1 FROM {} WHERE occurred_at >= %s AND occurred_at < %s) AS pending")
+            .format(sql.Identifier(_DEFAULT_PARTITION)),
+            (start, end)
+        )
+        if not cursor.fetchone()['pending']:
+            cursor.execute(create)
+            return
+
+        previous = sql.Identifier(f"{_DEFAULT_PARTITION}_moving")
+        default = sql.Identifier(_DEFAULT_PARTITION)
+        columns = sql.SQL(', ').join(map(sql.Identifier, AUTH_EVENT_COLUMNS))
+        cursor.execute(sql.SQL("ALTER TABLE auth_events DETACH PARTITION {}").format(default))
+        cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(default, previous))
+        cursor.execute(sql.SQL("CREATE TABLE {} PARTITION OF auth_events DEFAULT").format(default))
+        cursor.execute(create)
+        cursor.execute(sql.SQL("INSERT INTO auth_events ({}) SELECT {} FROM {}").format(columns, columns, previous))
+        moved = cursor.rowcount
+        cursor.execute(sql.SQL("DROP TABLE {}").format(previous))
+        logger.info(f"📦 {moved} eventos de auth_events_default repartidos al crear {name}")
+
+    @staticmethod
+    def drop_partitions_before(retention_months: int, today: date = None) -> List[str]:
+        """
+        Borra las particiones mensuales más antiguas que la retención
+
+        Args:
+            retention_months (int): Meses completos a conservar además del actual
+            today (date): Fecha de referencia (por defecto, hoy en UTC)
+
+        Returns:
+            List[str]: Nombres de las particiones borradas
+        """
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = _month_start(today.year, today.month - retention_months)
+
+        query = """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'auth_events'::regclass
+        """
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query)
+                expired = []
+                for row in cursor.fetchall():
+                    match = _PARTITION_NAME.match(row['relname'])
+                    if match and _month_start(int(match.group(1)), int(match.group(2))) < cutoff:
+                        expired.append(row['relname'])
+                for name in expired:
+                    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(name)))
+                return expired
+        except Exception as e:
+            logger.error(f"❌ Error al borrar particiones vencidas de auth_events: {e}")
+            return []
@@ -0,0 +1,230 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from psycopg.types.json import Jsonb
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+# Canal de LISTEN/NOTIFY que despierta a los dispatchers
+OUTBOX_CHANNEL = 'email_outbox'
+
+_ENQUEUE_QUERY = """
+    INSERT INTO email_outbox (template, to_email, context, expires_at)
+    VALUES (%s, %s, %s, %s)
+    RETURNING id
+"""
+
+# Reclamo de un lote (idx_email_outbox_pending / idx_email_outbox_sending;
+# ver MigrationRunner.check_plans)
+CLAIM_BATCH_QUERY = """
+    UPDATE email_outbox o
+    SET status = 'sending', locked_at = NOW(), locked_by = %s, attempts = o.attempts + 1
+    WHERE o.id IN (
+        SELECT id
+        FROM email_outbox
+        WHERE ((status = 'pending' AND available_at <= NOW())
+               OR (status = 'sending' AND locked_at < NOW() - make_interval(secs => %s)))
+          AND (expires_at IS NULL OR expires_at > NOW())
+        ORDER BY id
+        FOR UPDATE SKIP LOCKED
+        LIMIT %s
+    )
+    RETURNING o.id, o.template, o.to_email, o.context, o.attempts
+"""
+
+
+class EmailOutboxRepository:
+    """Repositorio de la bandeja de salida transaccional de emails"""
+
+    @staticmethod
+    def enqueue(cursor, template: str, to_email: str, context: dict,
+                expires_at: Optional[datetime] = None) -> int:
+        """
+        Agrega un email a la bandeja de salida dentro de la transacción del cursor
+
+        El NOTIFY solo se entrega cuando la transacción hace commit, así que los
+        dispatchers nunca ven un email cuyo token todavía no existe.
+
+        Args:
+            cursor: Cursor de la transacción en curso
+            template (str): Nombre de la plantilla
+            to_email (str): Destinatario
+            context (dict): Variables de la plantilla
+            expires_at (datetime): Momento a partir del cual ya no se envía
+                (p. ej. el vencimiento del código de recuperación)
+
+        Returns:
+            int: ID del email encolado
+        """
+        cursor.execute(_ENQUEUE_QUERY, (template, to_email, Jsonb(context), expires_at))
+        row = cursor.fetchone()
+        cursor.execute(f"NOTIFY {OUTBOX_CHANNEL}")
+        return row['id']
+
+    @staticmethod
+    async def enqueue_async(cursor, template: str, to_email: str, context: dict,
+                            expires_at: Optional[datetime] = None) -> int:
+        """Igual que enqueue, dentro de la transacción de un cursor asíncrono"""
+        await cursor.execute(_ENQUEUE_QUERY, (template, to_email, Jsonb(context), expires_at))
+        row = await cursor.fetchone()
+        await cursor.execute(f"NOTIFY {OUTBOX_CHANNEL}")
+        return row['id']
+
+    @staticmethod
+    def claim_batch(worker_id: str, batch_size: int, stale_after_seconds: int) -> List[dict]:
+        """
+        Reclama un lote de emails pendientes para un dispatcher
+
+        Usa FOR UPDATE SKIP LOCKED para que varios dispatchers trabajen en
+        paralelo sin bloquearse ni reclamar la misma fila. Las filas que quedaron
+        en 'sending' por un dispatcher caído se vuelven a reclamar pasado el plazo.
+
+        Args:
+            worker_id (str): Identificador del dispatcher
+            batch_size (int): Máximo de filas a reclamar
+            stale_after_seconds (int): Segundos tras los que un envío se considera abandonado
+
+        Returns:
+            List[dict]: Filas reclamadas
+        """
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(CLAIM_BATCH_QUERY, (worker_id, stale_after_seconds, batch_size))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error al reclamar emails pendientes: {e}")
+            return []
+
+    @staticmethod
+    def mark_sent(outbox_ids: List[int]) -> bool:
+        """
+        Marca emails como enviados y borra su contexto
+
+        El contexto puede llevar el código de recuperación en texto plano: una
+        vez enviado no hace falta conservarlo.
+
+        Args:
+            outbox_ids (List[int]): IDs enviados
+
+        Returns:
+            bool: True si se actualizaron correctamente
+        """
+        if not outbox_ids:
+            return True
+
+        query = """
+            UPDATE email_outbox
+            SET status = 'sent', sent_at = NOW(), locked_at = NULL, last_error = NULL,
+                context = '{}'::jsonb
+            WHERE id = ANY(%s)
+        """
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query, (outbox_ids,))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al marcar emails como enviados: {e}")
+            return False
+
+    @staticmethod
+    def mark_failed(outbox_id: int, error: str, retry_in_seconds: int, max_attempts: int) -> bool:
+        """
+        Registra un envío fallido y lo reprograma (o lo da por perdido)
+
+        Si el reintento caería después de expires_at el email queda 'expired':
+        reintentar un código vencido solo entregaría un código inservible.
+
+        Args:
+            outbox_id (int): ID del email
+            error (str): Descripción del error
+            retry_in_seconds (int): Espera antes del siguiente intento
+            max_attempts (int): Intentos tras los que se marca como 'failed'
+
+        Returns:
+            bool: True si se actualizó correctamente
+        """
+        query = """
+            UPDATE email_outbox o
+            SET status = r.status,
+                available_at = r.available_at,
+                locked_at = NULL,
+                last_error = %s,
+                context = CASE WHEN r.status = 'pending' THEN o.context ELSE '{}'::jsonb END
+            FROM (
+                SELECT id,
+                       NOW() + make_interval(secs => %s) AS available_at,
+                       CASE
+                           WHEN attempts >= %s THEN 'failed'
+                           WHEN expires_at <= NOW() + make_interval(secs => %s) THEN 'expired'
+                           ELSE 'pending'
+                       END AS status
+                FROM email_outbox
+                WHERE id = %s
+            ) r
+            WHERE o.id = r.id
+        """
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query, (error[:1000], retry_in_seconds, max_attempts, retry_in_seconds, outbox_id))
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"❌ Error al reprogramar email fallido: {e}")
+            return False
+
+    @staticmethod
+    def purge(retention_days: int) -> dict:
+        """
+        Da por vencidos los emails que ya no sirve enviar y borra los resueltos
+
+        Los pendientes con expires_at vencido pasan a 'expired' (sin contexto);
+        las filas 'sent', 'failed' y 'expired' más antiguas que la retención se
+        borran (idx_email_outbox_done).
+
+        Args:
+            retention_days (int): Días que se conservan las filas resueltas
+
+        Returns:
+            dict: Filas vencidas y borradas
+        """
+        expire_query = """
+            UPDATE email_outbox
+            SET status = 'expired', locked_at = NULL, context = '{}'::jsonb
+            WHERE status IN ('pending', 'sending') AND expires_at <= NOW()
+        """
+        delete_query = """
+            DELETE FROM email_outbox
+            WHERE status IN ('sent', 'failed', 'expired')
+              AND created_at < NOW() - make_interval(days => %s)
+        """
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(expire_query)
+                expired = cursor.rowcount
+                cursor.execute(delete_query, (retention_days,))
+                return {'expired': expired, 'deleted': cursor.rowcount}
+        except Exception as e:
+            logger.error(f"❌ Error al purgar la bandeja de emails: {e}")
+            return {'expired': 0, 'deleted': 0}
+
+    @staticmethod
+    def pending_count() -> Optional[int]:
+        """
+        Cuenta los emails pendientes de envío
+
+        Returns:
+            int: Cantidad de emails pendientes o None si falla
+        """
+        query = "SELECT COUNT(*) AS pending FROM email_outbox WHERE status IN ('pending', 'sending')"
+
+        try:
+            with Database.get_cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchone()
+                return result['pending'] if result else 0
+        except Exception as e:
+            logger.error(f"❌ Error al contar emails pendientes: {e}")
+            return None
@@ -1,8 +1,34 @@
+import logging
 from typing import Optional
 from database.connection import Database
 from datetime import datetime, timedelta
 import secrets
 
+logger = logging.getLogger(__name__)
+
+# Token vigente más reciente (idx_password_tokens_user; ver MigrationRunner.check_plans)
+ACTIVE_TOKEN_QUERY = """
+    SELECT token, expires_at, created_at
+    FROM password_reset_tokens
+    WHERE user_id = %s AND used = false AND expires_at > NOW()
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+# Lock por usuario hasta el fin de la transacción: las solicitudes simultáneas
+# (aunque lleguen a workers distintos) emiten el código de a una
+ISSUE_LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))"
+
+# ¿Hay un código vigente emitido hace menos de N segundos?
+RECENT_TOKEN_QUERY = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM password_reset_tokens
+        WHERE user_id = %s AND used = false AND expires_at > NOW()
+          AND created_at > NOW() - make_interval(secs => %s)
+    ) AS recent
+"""
+
 
 class PasswordResetRepository:
     """Repositorio para operaciones de recuperación de contraseña"""
@@ -29,7 +55,7 @@ class PasswordResetRepository:
                 result = cursor.fetchone()
                 return result['token'] if result else None
         except Exception as e:
-            print(f"❌ Error al crear token de recuperación: {e}")
+            logger.error(f"❌ Error al crear token de recuperación: {e}")
             return None
 
     @staticmethod
@@ -38,7 +64,7 @@ class PasswordResetRepository:
             SELECT prt.user_id, prt.expires_at, prt.used
             FROM password_reset_tokens prt
             JOIN users u ON u.id = prt.user_id
-            WHERE u.email = %s AND prt.token = %s
+            WHERE lower(u.email) = lower(%s) AND prt.token = %s
             ORDER BY prt.created_at DESC
             LIMIT 1
         """
@@ -59,7 +85,7 @@ class PasswordResetRepository:
 
                 return result['user_id']
         except Exception as e:
-            print(f"❌ Error al verificar token: {e}")
+            logger.error(f"❌ Error al verificar token: {e}")
             return None
 
     @staticmethod
@@ -75,7 +101,7 @@ class PasswordResetRepository:
                 cursor.execute(query, (user_id, token))
                 return cursor.rowcount > 0
         except Exception as e:
-            print(f"❌ Error al marcar token como usado: {e}")
+            logger.error(f"❌ Error al marcar token como usado: {e}")
             return False
 
     @staticmethod
@@ -91,7 +117,7 @@ class PasswordResetRepository:
                 cursor.execute(query, (user_id,))
                 return True
         except Exception as e:
-            print(f"❌ Error al invalidar tokens antiguos: {e}")
+            logger.error(f"❌ Error al invalidar tokens antiguos: {e}")
             return False
 
     @staticmethod
@@ -108,7 +134,7 @@ class PasswordResetRepository:
             with Database.get_cursor() as cursor:
                 return cursor.fetchone()
         except Exception as e:
-            print(f"❌ Error al obtener token activo: {e}")
+            logger.error(f"❌ Error al obtener token activo: {e}")
             return None
 from typing import Optional
 from database.connection import Database
@@ -155,7 +181,7 @@ class PasswordResetRepository:
                 result = cursor.fetchone()
                 return result['token'] if result else None
         except Exception as e:
-            print(f"❌ Error al crear token de recuperación: {e}")
+            logger.error(f"❌ Error al crear token de recuperación: {e}")
             return None
     
     @staticmethod
@@ -174,7 +200,7 @@ class PasswordResetRepository:
             SELECT prt.user_id, prt.expires_at, prt.used
             FROM password_reset_tokens prt
             JOIN users u ON u.id = prt.user_id
-            WHERE u.email = %s AND prt.token = %s
+            WHERE lower(u.email) = lower(%s) AND prt.token = %s
             ORDER BY prt.created_at DESC
             LIMIT 1
         """
@@ -197,7 +223,7 @@ class PasswordResetRepository:
                 
                 return result['user_id']
         except Exception as e:
-            print(f"❌ Error al verificar token: {e}")
+            logger.error(f"❌ Error al verificar token: {e}")
             return None
     
     @staticmethod
@@ -223,7 +249,7 @@ class PasswordResetRepository:
                 cursor.execute(query, (user_id, token))
                 return cursor.rowcount > 0
         except Exception as e:
-            print(f"❌ Error al marcar token como usado: {e}")
+            logger.error(f"❌ Error al marcar token como usado: {e}")
             return False
     
     @staticmethod
@@ -248,7 +274,7 @@ class PasswordResetRepository:
                 cursor.execute(query, (user_id,))
                 return True
         except Exception as e:
-            print(f"❌ Error al invalidar tokens antiguos: {e}")
+            logger.error(f"❌ Error al invalidar tokens antiguos: {e}")
             return False
     
     @staticmethod
@@ -262,20 +288,12 @@ class PasswordResetRepository:
         Returns:
             dict: Información del token o None
         """
-        query = """
-            SELECT token, expires_at, created_at
-            FROM password_reset_tokens
-            WHERE user_id = %s AND used = false AND expires_at > NOW()
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        
         try:
             with Database.get_cursor() as cursor:
-                cursor.execute(query, (user_id,))
+                cursor.execute(ACTIVE_TOKEN_QUERY, (user_id,))
                 return cursor.fetchone()
         except Exception as e:
-            print(f"❌ Error al obtener token activo: {e}")
+            logger.error(f"❌ Error al obtener token activo: {e}")
             return None
 from typing import Optional
 from database.connection import Database
@@ -296,13 +314,14 @@ class PasswordResetRepository:
         return ''.join([str(secrets.randbelow(10)) for _ in range(6)])
     
     @staticmethod
-    def create_reset_token(user_id: str, expiration_minutes: int = 15) -> Optional[str]:
+    def create_reset_token(user_id: str, expiration_minutes: int = 15, cursor=None) -> Optional[str]:
         """
         Crea un nuevo token de recuperación de contraseña
         
         Args:
             user_id (str): ID del usuario
             expiration_minutes (int): Minutos hasta que expire el token
+            cursor: Cursor de una transacción en curso (los errores se propagan)
             
         Returns:
             str: Token generado o None si falla
@@ -316,13 +335,18 @@ class PasswordResetRepository:
             RETURNING token
         """
         
+        if cursor is not None:
+            cursor.execute(query, (user_id, token, expires_at))
+            result = cursor.fetchone()
+            return result['token'] if result else None
+        
         try:
             with Database.get_cursor(commit=True) as cursor:
                 cursor.execute(query, (user_id, token, expires_at))
                 result = cursor.fetchone()
                 return result['token'] if result else None
         except Exception as e:
-            print(f"❌ Error al crear token de recuperación: {e}")
+            logger.error(f"❌ Error al crear token de recuperación: {e}")
             return None
     
     @staticmethod
@@ -341,7 +365,7 @@ class PasswordResetRepository:
             SELECT prt.user_id, prt.expires_at, prt.used
             FROM password_reset_tokens prt
             JOIN users u ON u.id = prt.user_id
-            WHERE u.email = %s AND prt.token = %s
+            WHERE lower(u.email) = lower(%s) AND prt.token = %s
             ORDER BY prt.created_at DESC
             LIMIT 1
         """
@@ -364,7 +388,7 @@ class PasswordResetRepository:
                 
                 return result['user_id']
         except Exception as e:
-            print(f"❌ Error al verificar token: {e}")
+            logger.error(f"❌ Error al verificar token: {e}")
             return None
     
     @staticmethod
@@ -390,16 +414,17 @@ class PasswordResetRepository:
                 cursor.execute(query, (user_id, token))
                 return cursor.rowcount > 0
         except Exception as e:
-            print(f"❌ Error al marcar token como usado: {e}")
+            logger.error(f"❌ Error al marcar token como usado: {e}")
             return False
     
     @staticmethod
-    def invalidate_old_tokens(user_id: str) -> bool:
+    def invalidate_old_tokens(user_id: str, cursor=None) -> bool:
         """
         Invalida todos los tokens antiguos de un usuario
         
         Args:
             user_id (str): ID del usuario
+            cursor: Cursor de una transacción en curso (los errores se propagan)
             
         Returns:
             bool: True si se invalidaron correctamente
@@ -410,37 +435,81 @@ class PasswordResetRepository:
             WHERE user_id = %s AND used = false
         """
         
+        if cursor is not None:
+            cursor.execute(query, (user_id,))
+            return True
+        
         try:
             with Database.get_cursor(commit=True) as cursor:
                 cursor.execute(query, (user_id,))
                 return True
         except Exception as e:
-            print(f"❌ Error al invalidar tokens antiguos: {e}")
+            logger.error(f"❌ Error al invalidar tokens antiguos: {e}")
             return False
     
     @staticmethod
-    def get_active_token(user_id: str) -> Optional[dict]:
+    def issued_recently(user_id: str, min_interval_seconds: float, cursor) -> bool:
         """
-        Obtiene el token activo más reciente de un usuario
+        Serializa la emisión de códigos del usuario y comprueba si ya hay uno reciente
+        
+        Debe llamarse al inicio de la transacción que crea el token: el lock se
+        mantiene hasta el commit, así que una segunda solicitud concurrente espera
+        y ve el token que creó la primera.
         
         Args:
             user_id (str): ID del usuario
+            min_interval_seconds (float): Antigüedad mínima para emitir otro código
+            cursor: Cursor de una transacción en curso (los errores se propagan)
             
         Returns:
-            dict: Información del token o None
+            bool: True si ya se emitió un código vigente dentro del intervalo
+        """
+        cursor.execute(ISSUE_LOCK_QUERY, (f"password_reset:{user_id}",))
+        cursor.execute(RECENT_TOKEN_QUERY, (user_id, min_interval_seconds))
+        result = cursor.fetchone()
+        return bool(result and result['recent'])
+    
+    @staticmethod
+    def invalidate_tokens_by_email(email: str) -> bool:
+        """
+        Invalida los tokens pendientes del usuario con ese email
+        
+        Args:
+            email (str): Email normalizado del usuario
+            
+        Returns:
+            bool: True si se invalidaron correctamente
         """
         query = """
-            SELECT token, expires_at, created_at
-            FROM password_reset_tokens
-            WHERE user_id = %s AND used = false AND expires_at > NOW()
-            ORDER BY created_at DESC
-            LIMIT 1
+            UPDATE password_reset_tokens prt
+            SET used = true
+            FROM users u
+            WHERE u.id = prt.user_id AND lower(u.email) = lower(%s) AND prt.used = false
         """
         
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query, (email,))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al invalidar tokens por email: {e}")
+            return False
+    
+    @staticmethod
+    def get_active_token(user_id: str) -> Optional[dict]:
+        """
+        Obtiene el token activo más reciente de un usuario
+        
+        Args:
+            user_id (str): ID del usuario
+            
+        Returns:
+            dict: Información del token o None
+        """
         try:
             with Database.get_cursor() as cursor:
-                cursor.execute(query, (user_id,))
+                cursor.execute(ACTIVE_TOKEN_QUERY, (user_id,))
                 return cursor.fetchone()
         except Exception as e:
-            print(f"❌ Error al obtener token activo: {e}")
+            logger.error(f"❌ Error al obtener token activo: {e}")
             return None
@@ -0,0 +1,123 @@
+import logging
+from typing import Dict, List, Tuple
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+
+class ResetAttemptRepository:
+    """Persistencia de los contadores de intentos de códigos de recuperación"""
+
+    @staticmethod
+    def load_active(ttl_minutes: int) -> List[dict]:
+        """
+        Carga los contadores vigentes y elimina los vencidos
+
+        Args:
+            ttl_minutes (int): Minutos tras los que un contador deja de importar
+
+        Returns:
+            List[dict]: Filas con email, failed_attempts y locked
+        """
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(
+                    "DELETE FROM password_reset_attempts WHERE updated_at < NOW() - make_interval(mins => %s)",
+                    (ttl_minutes,)
+                )
+                cursor.execute("SELECT email, failed_attempts, locked FROM password_reset_attempts")
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error al cargar intentos de recuperación: {e}")
+            return []
+
+    @staticmethod
+    def add_failures(deltas: Dict[str, Tuple[int, bool]]) -> List[dict]:
+        """
+        Suma fallos locales a los contadores persistidos (un solo INSERT)
+
+        Args:
+            deltas (Dict): email -> (fallos nuevos, bloqueado localmente)
+
+        Returns:
+            List[dict]: Totales resultantes por email
+        """
+        if not deltas:
+            return []
+
+        emails = list(deltas)
+        failures = [deltas[email][0] for email in emails]
+        locked = [deltas[email][1] for email in emails]
+
+        query = """
+            INSERT INTO password_reset_attempts (email, failed_attempts, locked, updated_at)
+            SELECT email, failed_attempts, locked, NOW()
+            FROM unnest(%s::varchar[], %s::int[], %s::bool[]) AS d(email, failed_attempts, locked)
+            ON CONFLICT (email) DO UPDATE
+            SET failed_attempts = password_reset_attempts.failed_attempts + EXCLUDED.failed_attempts,
+                locked = password_reset_attempts.locked OR EXCLUDED.locked,
+                updated_at = NOW()
+            RETURNING email, failed_attempts, locked
+        """
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query, (emails, failures, locked))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error al guardar intentos de recuperación: {e}")
+            return []
+
+    @staticmethod
+    def existing(emails: List[str]) -> List[str]:
+        """
+        Devuelve cuáles de los emails siguen teniendo contador persistido
+
+        Args:
+            emails (List[str]): Emails a consultar
+
+        Returns:
+            List[str]: Emails con fila en la tabla
+        """
+        if not emails:
+            return []
+
+        try:
+            with Database.get_cursor() as cursor:
+                cursor.execute("SELECT email FROM password_reset_attempts WHERE email = ANY(%s)", (emails,))
+                return [row['email'] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"❌ Error al consultar intentos de recuperación: {e}")
+            return list(emails)
+
+    @staticmethod
+    def clear(email: str, cursor=None) -> bool:
+        """
+        Borra el contador de un email (se emitió un código nuevo)
+
+        Args:
+            email (str): Email normalizado
+            cursor: Cursor de una transacción en curso (los errores se propagan)
+
+        Returns:
+            bool: True si se borró correctamente
+        """
+        query = "DELETE FROM password_reset_attempts WHERE email = %s"
+
+        if cursor is not None:
+            cursor.execute(query, (email,))
+            return True
+
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(query, (email,))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al borrar intentos de recuperación: {e}")
+            return False
+
+    @staticmethod
+    async def clear_async(email: str, cursor) -> bool:
+        """Igual que clear, dentro de la transacción de un cursor asíncrono"""
+        await cursor.execute("DELETE FROM password_reset_attempts WHERE email = %s", (email,))
+        return True
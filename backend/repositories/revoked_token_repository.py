@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime
+from typing import List
+from database.async_connection import AsyncDatabase
+from database.connection import Database
+
+logger = logging.getLogger(__name__)
+
+# Canal de LISTEN/NOTIFY por el que los workers se enteran de cada revocación
+REVOCATION_CHANNEL = 'token_revoked'
+
+# Alta + aviso en la misma transacción: el NOTIFY solo se entrega con el commit
+_REVOKE_QUERY = """
+    WITH inserted AS (
+        INSERT INTO revoked_tokens (jti, user_id, expires_at)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (jti) DO NOTHING
+        RETURNING jti, expires_at
+    )
+    SELECT pg_notify(%s, jti::text || ' ' || floor(extract(epoch FROM expires_at))::bigint)
+    FROM inserted
+"""
+
+
+class RevokedTokenRepository:
+    """Persistencia de los tokens revocados antes de su vencimiento"""
+
+    @staticmethod
+    def revoke(jti: str, user_id: str, expires_at: datetime) -> bool:
+        """
+        Guarda una revocación y avisa a los demás workers
+
+        Args:
+            jti (str): Identificador del token
+            user_id (str): Dueño del token
+            expires_at (datetime): Vencimiento del token (después ya no importa)
+
+        Returns:
+            bool: True si se guardó correctamente (o ya estaba revocado)
+        """
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute(_REVOKE_QUERY, (jti, user_id, expires_at, REVOCATION_CHANNEL))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al revocar token: {e}")
+            return False
+
+    @staticmethod
+    async def revoke_async(jti: str, user_id: str, expires_at: datetime) -> bool:
+        """Igual que revoke, con el pool asíncrono"""
+        try:
+            async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                await cursor.execute(_REVOKE_QUERY, (jti, user_id, expires_at, REVOCATION_CHANNEL))
+                return True
+        except Exception as e:
+            logger.error(f"❌ Error al revocar token: {e}")
+            return False
+
+    @staticmethod
+    def active() -> List[dict]:
+        """
+        Revocaciones de tokens que todavía no vencieron
+
+        Returns:
+            List[dict]: Filas con jti y expires_at
+        """
+        try:
+            with Database.get_cursor() as cursor:
+                cursor.execute("SELECT jti, expires_at FROM revoked_tokens WHERE expires_at > NOW()")
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error al cargar tokens revocados: {e}")
+            raise
+
+    @staticmethod
+    def delete_expired() -> int:
+        """
+        Borra las revocaciones de tokens ya vencidos
+
+        Returns:
+            int: Filas borradas
+        """
+        try:
+            with Database.get_cursor(commit=True) as cursor:
+                cursor.execute("DELETE FROM revoked_tokens WHERE expires_at <= NOW()")
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"❌ Error al borrar tokens revocados vencidos: {e}")
+            return 0
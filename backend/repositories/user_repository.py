@@ -1,7 +1,36 @@
-from typing import Optional
-from database.connection import Database
-from models.user import User
+import logging
 from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from psycopg.rows import tuple_row
+from config import Config
+from database.connection import Database
+from database.invalidation_bus import USERS, InvalidationBus
+from models.user import USER_COLUMNS, User, user_row
+
+logger = logging.getLogger(__name__)
+
+# Usuarios activos por ID (token_required), invalidados entre workers con NOTIFY
+InvalidationBus.register(USERS, Config.USER_CACHE_SIZE, Config.USER_CACHE_TTL_SECONDS)
+
+# Consultas compartidas con AsyncUserRepository y verificadas por
+# MigrationRunner.check_plans (database/migrator.py)
+FIND_BY_EMAIL_QUERY = f"""
+    SELECT {USER_COLUMNS}
+    FROM users
+    WHERE lower(email) = lower(%s) AND is_active = true
+"""
+
+FIND_BY_ID_QUERY = f"""
+    SELECT {USER_COLUMNS}
+    FROM users
+    WHERE id = %s AND is_active = true
+"""
+
+EMAILS_CREATED_SINCE_QUERY = "SELECT email, created_at FROM users WHERE created_at > %s"
+
+# Canal de LISTEN/NOTIFY con cada email registrado (EmailFilter de los demás workers)
+EMAIL_REGISTERED_CHANNEL = 'email_registered'
+EMAIL_REGISTERED_QUERY = "SELECT pg_notify(%s, %s)"
 
 class UserRepository:
     """Repositorio para operaciones de usuario en la base de datos"""
@@ -17,27 +46,29 @@ class UserRepository:
             password_hash (str): Hash de la contraseña
             
         Returns:
-            User: Usuario creado o None si falla
+            User: Usuario creado o None si el email ya estaba registrado
             
         Raises:
-            psycopg.errors.UniqueViolation: Si el email ya existe
             psycopg.errors.IntegrityError: Si hay otro error de integridad
             Exception: Para otros errores
         """
-        query = """
+        query = f"""
             INSERT INTO users (name, email, password_hash)
             VALUES (%s, %s, %s)
-            RETURNING id, name, email, password_hash, created_at, 
-                      updated_at, is_active, last_login
+            ON CONFLICT (lower(email)) DO NOTHING
+            RETURNING {USER_COLUMNS}
         """
         
         try:
-            with Database.get_cursor(commit=True) as cursor:
+            with Database.get_cursor(commit=True, row_factory=user_row) as cursor:
                 cursor.execute(query, (name, email, password_hash))
-                row = cursor.fetchone()
-                return User.from_db_row(row)
+                user = cursor.fetchone()
+                # Aviso en la misma transacción: solo se entrega con el commit
+                if user:
+                    cursor.execute(EMAIL_REGISTERED_QUERY, (EMAIL_REGISTERED_CHANNEL, user.email))
+                return user
         except Exception as e:
-            print(f"❌ Error al crear usuario: {e}")
+            logger.error(f"❌ Error al crear usuario: {e}")
             # Re-lanzar la excepción para que sea manejada por el servicio
             raise
     
@@ -52,20 +83,12 @@ class UserRepository:
         Returns:
             User: Usuario encontrado o None
         """
-        query = """
-            SELECT id, name, email, password_hash, created_at, 
-                   updated_at, is_active, last_login
-            FROM users
-            WHERE email = %s AND is_active = true
-        """
-        
         try:
-            with Database.get_cursor() as cursor:
-                cursor.execute(query, (email,))
-                row = cursor.fetchone()
-                return User.from_db_row(row)
+            with Database.get_cursor(row_factory=user_row) as cursor:
+                cursor.execute(FIND_BY_EMAIL_QUERY, (email,))
+                return cursor.fetchone()
         except Exception as e:
-            print(f"❌ Error al buscar usuario por email: {e}")
+            logger.error(f"❌ Error al buscar usuario por email: {e}")
             return None
     
     @staticmethod
@@ -79,20 +102,20 @@ class UserRepository:
         Returns:
             User: Usuario encontrado o None
         """
-        query = """
-            SELECT id, name, email, password_hash, created_at, 
-                   updated_at, is_active, last_login
-            FROM users
-            WHERE id = %s AND is_active = true
-        """
+        user = InvalidationBus.get(USERS, user_id)
+        if user is not None:
+            return user
         
         try:
-            with Database.get_cursor() as cursor:
-                cursor.execute(query, (user_id,))
-                row = cursor.fetchone()
-                return User.from_db_row(row)
+            stamp = InvalidationBus.stamp()
+            with Database.get_cursor(row_factory=user_row) as cursor:
+                cursor.execute(FIND_BY_ID_QUERY, (user_id,))
+                user = cursor.fetchone()
+            if user is not None:
+                InvalidationBus.put(USERS, user_id, user, stamp)
+            return user
         except Exception as e:
-            print(f"❌ Error al buscar usuario por ID: {e}")
+            logger.error(f"❌ Error al buscar usuario por ID: {e}")
             return None
     
     @staticmethod
@@ -115,10 +138,38 @@ class UserRepository:
         try:
             with Database.get_cursor(commit=True) as cursor:
                 cursor.execute(query, (datetime.now(), user_id))
-                return cursor.rowcount > 0
+                if cursor.rowcount == 0:
+                    return False
+                InvalidationBus.publish(cursor, USERS, user_id)
+                return True
         except Exception as e:
-            print(f"❌ Error al actualizar last_login: {e}")
+            logger.error(f"❌ Error al actualizar last_login: {e}")
+            return False
+    
+    @staticmethod
+    def update_password(user_id: str, password_hash: str, cursor) -> bool:
+        """
+        Actualiza la contraseña dentro de la transacción del cursor
+        
+        Args:
+            user_id (str): ID del usuario
+            password_hash (str): Hash nuevo
+            cursor: Cursor de la transacción en curso (los errores se propagan)
+            
+        Returns:
+            bool: True si se actualizó la fila
+        """
+        query = """
+            UPDATE users
+            SET password_hash = %s, updated_at = NOW()
+            WHERE id = %s
+        """
+        
+        cursor.execute(query, (password_hash, user_id))
+        if cursor.rowcount == 0:
             return False
+        InvalidationBus.publish(cursor, USERS, user_id)
+        return True
     
     @staticmethod
     def email_exists(email: str) -> bool:
@@ -131,7 +182,7 @@ class UserRepository:
         Returns:
             bool: True si existe
         """
-        query = "SELECT EXISTS(SELECT 1 FROM users WHERE email = %s)"
+        query = "SELECT EXISTS(SELECT 1 FROM users WHERE lower(email) = lower(%s))"
         
         try:
             with Database.get_cursor() as cursor:
@@ -139,7 +190,67 @@ class UserRepository:
                 result = cursor.fetchone()
                 return result['exists'] if result else False
         except Exception as e:
-            print(f"❌ Error al verificar email: {e}")
+            logger.error(f"❌ Error al verificar email: {e}")
             # En caso de error, retornar False para no bloquear el registro
             # La verificación real se hará en el INSERT con el constraint
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def stream_emails(batch_size: int) -> Iterator[Tuple[str, datetime]]:
+        """
+        Recorre todos los emails con un cursor del lado del servidor
+        
+        Usa una conexión propia (no ocupa una del pool durante el recorrido) y
+        trae las filas en lotes de batch_size, sin cargar la tabla en memoria.
+        
+        Args:
+            batch_size (int): Filas por ida y vuelta
+            
+        Yields:
+            Tuple[str, datetime]: (email, created_at)
+        """
+        from psycopg import connect
+        
+        with connect(Config.get_db_url()) as conn:
+            with conn.cursor(name='users_email_scan') as cursor:
+                cursor.itersize = batch_size
+                cursor.execute("SELECT email, created_at FROM users")
+                yield from cursor
+    
+    @staticmethod
+    def emails_created_since(since: datetime) -> List[Tuple[str, datetime]]:
+        """
+        Emails de usuarios creados después de una fecha
+        
+        Args:
+            since (datetime): Fecha de corte (exclusiva)
+            
+        Returns:
+            List[Tuple[str, datetime]]: (email, created_at); lista vacía si falla
+        """
+        try:
+            with Database.get_cursor(row_factory=tuple_row) as cursor:
+                cursor.execute(EMAILS_CREATED_SINCE_QUERY, (since,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error al leer usuarios nuevos: {e}")
+            return []
+    
+    @staticmethod
+    def estimated_count() -> int:
+        """
+        Cantidad aproximada de usuarios según las estadísticas de PostgreSQL
+        
+        Returns:
+            int: Estimación (0 si la tabla no tiene estadísticas o si falla)
+        """
+        query = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'users'::regclass"
+        
+        try:
+            with Database.get_cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchone()
+                return max(0, result['estimate']) if result else 0
+        except Exception as e:
+            logger.error(f"❌ Error al estimar la cantidad de usuarios: {e}")
+            return 0
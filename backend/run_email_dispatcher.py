@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Dispatcher de la bandeja de salida de emails
+
+Uso:
+    python run_email_dispatcher.py
+
+Se pueden lanzar varias instancias en paralelo (incluso en otras máquinas):
+cada email pendiente lo reclama un solo dispatcher.
+"""
+from database.connection import Database
+from services.email_dispatcher import EmailDispatcher
+from utils.log import setup_logging, shutdown_logging
+
+if __name__ == '__main__':
+    setup_logging()
+    dispatcher = EmailDispatcher()
+    try:
+        dispatcher.run_forever()
+    finally:
+        Database.close_connection()
+        shutdown_logging()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Servidor de producción (gunicorn, varios workers)
+
+Uso:
+    python serve.py [opciones de gunicorn]
+
+Usa gunicorn.conf.py; cualquier opción extra (por ejemplo --workers 2)
+tiene prioridad sobre la configuración. Para desarrollo usa python app.py.
+"""
+import os
+import sys
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+
+
+def main():
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        print("❌ gunicorn no está instalado (pip install -r requirements.txt)")
+        print("📝 gunicorn no funciona en Windows; usa python app.py para desarrollo")
+        sys.exit(1)
+
+    sys.argv = [sys.argv[0], '--config', CONFIG_PATH, *sys.argv[1:], 'wsgi:app']
+    run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import logging
+import asyncio
+from typing import Dict, Optional, Tuple
+from psycopg import errors as pg_errors
+
+from models.user import User
+from repositories.async_user_repository import AsyncUserRepository
+from services.auth_service import AuthService
+from services.email_filter import EmailFilter
+from services.email_validation import EmailValidation
+from services.hashing import PasswordHasher
+from services.token_revocation import TokenRevocation
+from services.user_service import UserService
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuthService:
+    """Versión asíncrona de AuthService (variante ASGI)
+
+    Mismas validaciones y mensajes que AuthService; las consultas se esperan
+    sobre el pool asíncrono y bcrypt se ejecuta en el pool de hashing.
+    """
+
+    @staticmethod
+    async def register(name: str, email: str, password: str) -> Tuple[Optional[User], Optional[str], Optional[str]]:
+        """
+        Registra un nuevo usuario
+
+        Returns:
+            Tuple[Optional[User], Optional[str], Optional[str]]:
+                (usuario, token, mensaje_error)
+        """
+        # Misma pasada única de validación que UserService.create_user
+        domain, error_msg = UserService.prevalidate(name, email, password)
+        if error_msg:
+            return None, None, error_msg
+
+        try:
+            if domain is None:
+                password_hash = await PasswordHasher.hash_password_async(password)
+            else:
+                # bcrypt avanza en el pool de hashing mientras se resuelve el dominio
+                hash_task = asyncio.ensure_future(PasswordHasher.hash_password_async(password))
+                is_valid, error_msg = await EmailValidation.deliverability_async(domain)
+                if not is_valid:
+                    hash_task.cancel()
+                    return None, None, error_msg
+                password_hash = await hash_task
+
+            user = await AsyncUserRepository.create(name.strip(), Validators.normalize_email(email), password_hash)
+            if not user:
+                logger.warning(f"⚠️ Intento de registro con email duplicado: {email}")
+                return None, None, "Este correo electrónico ya está registrado"
+            EmailFilter.add(user.email)
+        except pg_errors.IntegrityError as e:
+            logger.error(f"❌ Error de integridad en AsyncAuthService.register: {e}")
+            return None, None, "Error de validación de datos"
+        except Exception as e:
+            logger.error(f"❌ Error inesperado en AsyncAuthService.register: {e}")
+            return None, None, "Error interno del servidor"
+
+        token = AuthService.generate_token(user)
+        return user, token, None
+
+    @staticmethod
+    async def login(email: str, password: str) -> Tuple[Optional[User], Optional[str], Optional[str]]:
+        """
+        Autentica un usuario
+
+        Returns:
+            Tuple[Optional[User], Optional[str], Optional[str]]:
+                (usuario, token, mensaje_error)
+        """
+        if not email or not password:
+            return None, None, "Email y contraseña son obligatorios"
+
+        try:
+            user = await AsyncUserRepository.find_by_email(Validators.normalize_email(email))
+
+            if not user:
+                return None, None, "Correo o contraseña incorrectos"
+
+            if not await PasswordHasher.verify_password_async(password, user.password_hash):
+                return None, None, "Correo o contraseña incorrectos"
+
+            await AsyncUserRepository.update_last_login(user.id)
+
+            token = AuthService.generate_token(user)
+
+            return user, token, None
+
+        except Exception as e:
+            logger.error(f"❌ Error en login: {e}")
+            return None, None, "Error interno del servidor"
+
+    @staticmethod
+    async def logout(payload: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Cierra la sesión revocando el token hasta su vencimiento
+
+        Returns:
+            Tuple[bool, Optional[str]]: (éxito, mensaje_error)
+        """
+        if not payload.get('jti'):
+            return False, "Este token no se puede revocar"
+
+        if not await TokenRevocation.revoke_async(payload):
+            return False, "Error al cerrar sesión"
+
+        return True, None
@@ -0,0 +1,234 @@
+import logging
+import asyncio
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+
+from config import Config
+from database.async_connection import AsyncDatabase
+from repositories.async_password_reset_repository import AsyncPasswordResetRepository
+from repositories.async_user_repository import AsyncUserRepository
+from repositories.reset_attempt_repository import ResetAttemptRepository
+from services.email_filter import EmailFilter
+from services.email_service import EmailService
+from services.hashing import PasswordHasher
+from services.reset_attempt_tracker import ResetAttemptTracker
+from utils.single_flight import AsyncSingleFlight, MinIntervalGate
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPasswordResetService:
+    """Versión asíncrona de PasswordResetService (variante ASGI)
+
+    Mismos flujos, mensajes y límites que el servicio síncrono. El envío directo
+    por SMTP (EMAIL_DELIVERY distinto de 'outbox') se ejecuta en un hilo para no
+    bloquear el event loop.
+    """
+
+    # Por proceso, como en PasswordResetService (entre workers decide la BD)
+    _flight = AsyncSingleFlight()
+    _send_gate = MinIntervalGate(Config.PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS)
+
+    @staticmethod
+    async def request_password_reset(email: str) -> Tuple[bool, Optional[str]]:
+        """Solicita un código de recuperación y lo envía por email (si aplica)."""
+        try:
+            if not email or not email.strip():
+                return False, "El email es obligatorio"
+
+            email_key = Validators.normalize_email(email)
+            result, _shared = await AsyncPasswordResetService._flight.do(
+                email_key, AsyncPasswordResetService._request_password_reset, email_key
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error en request_password_reset: {e}")
+            return False, "Error interno del servidor"
+
+    @staticmethod
+    async def _request_password_reset(email_key: str) -> Tuple[bool, Optional[str]]:
+        """Genera y envía un código nuevo (se ejecuta una vez por grupo de peticiones)"""
+        if not AsyncPasswordResetService._send_gate.allow(email_key):
+            return True, None
+
+        # Email seguro inexistente: se responde sin consultar la base de datos
+        if not EmailFilter.might_exist(email_key):
+            return True, None
+
+        user = await AsyncUserRepository.find_by_email(email_key)
+
+        # Por seguridad, no revelar si el email existe; devolver éxito simulando envío
+        if not user:
+            return True, None
+
+        async with AsyncDatabase.get_cursor(commit=True) as cursor:
+            # Doble clic que llegó a otro worker: el primero ya emitió el código
+            if await AsyncPasswordResetRepository.issued_recently(
+                user.id, Config.PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS, cursor
+            ):
+                return True, None
+            await AsyncPasswordResetRepository.invalidate_old_tokens(user.id, cursor)
+            token = await AsyncPasswordResetRepository.create_reset_token(user.id, cursor)
+            if not token:
+                raise RuntimeError("No se generó el código de recuperación")
+            await ResetAttemptRepository.clear_async(user.email, cursor)
+            if EmailService.uses_outbox():
+                await EmailService.queue_password_reset_code_async(
+                    cursor,
+                    email=user.email,
+                    code=token,
+                    user_name=user.name or user.email,
+                )
+
+        # Código nuevo: los intentos del anterior ya no cuentan
+        ResetAttemptTracker.reset(user.email)
+
+        if not EmailService.uses_outbox():
+            sent = await asyncio.to_thread(
+                EmailService.send_password_reset_code,
+                email=user.email,
+                code=token,
+                user_name=user.name or user.email,
+            )
+            if not sent:
+                # Sin email no hay código reciente: un reintento inmediato debe poder emitir otro
+                await AsyncPasswordResetRepository.invalidate_tokens_by_email(user.email)
+                return False, "Error al enviar el email"
+
+        AsyncPasswordResetService._send_gate.mark(email_key)
+        return True, None
+
+    @staticmethod
+    async def _check_code(email: str, code: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Verifica un código aplicando el límite de intentos
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (user_id, mensaje_error)
+        """
+        if ResetAttemptTracker.is_locked(email):
+            return None, "Demasiados intentos fallidos. Solicita un nuevo código"
+
+        user_id = await AsyncPasswordResetRepository.verify_token(email, code)
+        if user_id:
+            return user_id, None
+
+        if ResetAttemptTracker.record_failure(email):
+            await AsyncPasswordResetRepository.invalidate_tokens_by_email(email)
+            return None, "Demasiados intentos fallidos. Solicita un nuevo código"
+
+        return None, "Código inválido o expirado"
+
+    @staticmethod
+    async def verify_reset_code(email: str, code: str) -> Tuple[bool, Optional[str]]:
+        try:
+            if not email or not code:
+                return False, "Email y código son obligatorios"
+
+            if len(code.strip()) != 6:
+                return False, "El código debe tener 6 dígitos"
+
+            user_id, error = await AsyncPasswordResetService._check_code(Validators.normalize_email(email), code.strip())
+            if error:
+                return False, error
+
+            return True, None
+
+        except Exception as e:
+            logger.error(f"❌ Error en verify_reset_code: {e}")
+            return False, "Error interno del servidor"
+
+    @staticmethod
+    async def reset_password(email: str, code: str, new_password: str) -> Tuple[bool, Optional[str]]:
+        try:
+            if not email or not code or not new_password:
+                return False, "Todos los campos son obligatorios"
+
+            if len(new_password) < 6:
+                return False, "La contraseña debe tener al menos 6 caracteres"
+
+            user_id, error = await AsyncPasswordResetService._check_code(Validators.normalize_email(email), code.strip())
+            if error:
+                return False, error
+
+            user = await AsyncUserRepository.find_by_id(user_id)
+            if not user:
+                return False, "Usuario no encontrado"
+
+            password_hash = await PasswordHasher.hash_password_async(new_password)
+
+            async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                if not await AsyncUserRepository.update_password(user_id, password_hash, cursor):
+                    return False, "Error al actualizar la contraseña"
+
+                if EmailService.uses_outbox():
+                    await EmailService.queue_password_changed_notification_async(
+                        cursor, email=user.email, user_name=user.name or user.email
+                    )
+
+            await AsyncPasswordResetRepository.mark_token_as_used(user_id, code.strip())
+            ResetAttemptTracker.reset(Validators.normalize_email(email))
+
+            if not EmailService.uses_outbox():
+                await asyncio.to_thread(
+                    EmailService.send_password_changed_notification,
+                    email=user.email, user_name=user.name or user.email
+                )
+
+            return True, None
+
+        except Exception as e:
+            logger.error(f"❌ Error en reset_password: {e}")
+            return False, "Error interno del servidor"
+
+    @staticmethod
+    async def resend_code(email: str) -> Tuple[bool, Optional[str]]:
+        try:
+            if not email or not email.strip():
+                return False, "El email es obligatorio"
+
+            email_key = Validators.normalize_email(email)
+            result, _shared = await AsyncPasswordResetService._flight.do(
+                email_key, AsyncPasswordResetService._resend_code, email_key
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error en resend_code: {e}")
+            return False, "Error interno del servidor"
+
+    @staticmethod
+    async def _resend_code(email_key: str) -> Tuple[bool, Optional[str]]:
+        """Reenvía el código activo o genera uno nuevo"""
+        if not AsyncPasswordResetService._send_gate.allow(email_key):
+            return True, None
+
+        # Email seguro inexistente: se responde sin consultar la base de datos
+        if not EmailFilter.might_exist(email_key):
+            return True, None
+
+        user = await AsyncUserRepository.find_by_email(email_key)
+        if not user:
+            return True, None
+
+        active = await AsyncPasswordResetRepository.get_active_token(user.id)
+        if active:
+            created_at = active.get('created_at')
+            if created_at and (datetime.now() - created_at) < timedelta(minutes=2):
+                if EmailService.uses_outbox():
+                    async with AsyncDatabase.get_cursor(commit=True) as cursor:
+                        await EmailService.queue_password_reset_code_async(
+                            cursor, email=user.email, code=active['token'], user_name=user.name or user.email,
+                            expires_at=active['expires_at']
+                        )
+                else:
+                    await asyncio.to_thread(
+                        EmailService.send_password_reset_code,
+                        email=user.email, code=active['token'], user_name=user.name or user.email
+                    )
+                AsyncPasswordResetService._send_gate.mark(email_key)
+                return True, None
+
+        return await AsyncPasswordResetService._request_password_reset(email_key)
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import Config
+from repositories.auth_event_repository import AuthEventRepository
+
+logger = logging.getLogger(__name__)
+
+# Prioridades: al llenarse el buffer se descartan primero los eventos de baja
+HIGH = 'high'
+LOW = 'low'
+
+EVENT_PRIORITIES = {
+    'login_succeeded': LOW,
+    'login_failed': HIGH,
+    'logout': LOW,
+    'register_succeeded': HIGH,
+    'register_failed': LOW,
+    'password_reset_requested': LOW,
+    'reset_code_verified': LOW,
+    'reset_code_failed': HIGH,
+    'password_reset_completed': HIGH,
+    'password_reset_failed': HIGH,
+}
+
+# Segundos entre revisiones de particiones (crear las próximas, borrar las vencidas)
+_MAINTENANCE_SECONDS = 3600
+
+# Longitud de las columnas VARCHAR(255) de auth_events
+_MAX_TEXT = 255
+
+
+def _clip(value: Optional[str]) -> Optional[str]:
+    return value[:_MAX_TEXT] if value else None
+
+
+class AuthEventLog:
+    """Registro de eventos de autenticación en memoria con escritura por lotes
+
+    record() solo arma una tupla y la agrega al buffer: la petición no espera a
+    la base de datos. Un hilo en segundo plano vacía el buffer cada
+    AUTH_EVENTS_FLUSH_SECONDS (o antes, al juntarse AUTH_EVENTS_BATCH_SIZE
+    eventos) con un COPY por lote en la tabla particionada auth_events.
+
+    El buffer está acotado a AUTH_EVENTS_BUFFER_SIZE eventos. Si se llena (la
+    base de datos no responde o no da abasto), los eventos de prioridad baja
+    nuevos se descartan y los de prioridad alta desplazan al más antiguo de
+    prioridad baja; los descartes se cuentan en metrics().
+    """
+
+    _high: deque = deque()
+    _low: deque = deque()
+    _lock = threading.Lock()
+    _wake = threading.Event()
+    _stop = threading.Event()
+    _flush_thread: Optional[threading.Thread] = None
+    _next_maintenance = 0.0
+
+    _counters = {
+        'recorded_total': 0,
+        'flushed_total': 0,
+        'dropped_low_total': 0,
+        'dropped_high_total': 0,
+        'batches_total': 0,
+        'flush_failures_total': 0,
+    }
+
+    @classmethod
+    def record(cls, event_type: str, success: bool, email: Optional[str] = None,
+               user_id=None, detail: Optional[str] = None, request=None) -> None:
+        """
+        Agrega un evento al buffer (sin E/S)
+
+        Args:
+            event_type (str): Tipo de evento (clave de EVENT_PRIORITIES)
+            success (bool): Resultado de la operación
+            email (str): Email involucrado
+            user_id: ID del usuario, si se conoce
+            detail (str): Motivo del fallo u otra información breve
+            request: Petición Flask o Quart de la que tomar IP y User-Agent
+        """
+        if not Config.AUTH_EVENTS_ENABLED:
+            return
+
+        ip = user_agent = None
+        if request is not None:
+            ip = request.remote_addr
+            user_agent = _clip(request.headers.get('User-Agent'))
+
+        row = (
+            datetime.now(timezone.utc), event_type, success,
+            user_id, _clip(email), ip, user_agent, _clip(detail),
+        )
+        high = EVENT_PRIORITIES.get(event_type, LOW) == HIGH
+
+        with cls._lock:
+            cls._counters['recorded_total'] += 1
+            if len(cls._high) + len(cls._low) >= Config.AUTH_EVENTS_BUFFER_SIZE:
+                if not high:
+                    cls._counters['dropped_low_total'] += 1
+                    return
+                if not cls._low:
+                    cls._counters['dropped_high_total'] += 1
+                    return
+                cls._low.popleft()
+                cls._counters['dropped_low_total'] += 1
+            (cls._high if high else cls._low).append(row)
+            pending = len(cls._high) + len(cls._low)
+
+        if pending >= Config.AUTH_EVENTS_BATCH_SIZE:
+            cls._wake.set()
+
+    @classmethod
+    def _take_batch(cls) -> List[tuple]:
+        """Saca hasta AUTH_EVENTS_BATCH_SIZE eventos (primero los de prioridad alta)"""
+        batch = []
+        with cls._lock:
+            for queue in (cls._high, cls._low):
+                while queue and len(batch) < Config.AUTH_EVENTS_BATCH_SIZE:
+                    batch.append(queue.popleft())
+        return batch
+
+    @classmethod
+    def _requeue(cls, batch: List[tuple]) -> None:
+        """Devuelve al buffer un lote que no se pudo escribir, respetando el límite"""
+        with cls._lock:
+            room = Config.AUTH_EVENTS_BUFFER_SIZE - len(cls._high) - len(cls._low)
+            high = [row for row in batch if EVENT_PRIORITIES.get(row[1], LOW) == HIGH]
+            low = [row for row in batch if EVENT_PRIORITIES.get(row[1], LOW) != HIGH]
+            for queue, rows, dropped in ((cls._high, high, 'dropped_high_total'),
+                                         (cls._low, low, 'dropped_low_total')):
+                kept = rows[:max(room, 0)]
+                room -= len(kept)
+                cls._counters[dropped] += len(rows) - len(kept)
+                # Al frente: son más antiguos que lo que llegó mientras tanto
+                queue.extendleft(reversed(kept))
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Escribe el buffer en lotes hasta vaciarlo o hasta el primer error
+
+        Returns:
+            int: Eventos escritos
+        """
+        written = 0
+        while True:
+            batch = cls._take_batch()
+            if not batch:
+                break
+            try:
+                AuthEventRepository.copy_events(batch)
+            except Exception as e:
+                logger.error(f"❌ Error al escribir eventos de autenticación: {e}",
+                             extra={'batch_size': len(batch)})
+                cls._requeue(batch)
+                with cls._lock:
+                    cls._counters['flush_failures_total'] += 1
+                break
+            written += len(batch)
+            with cls._lock:
+                cls._counters['flushed_total'] += len(batch)
+                cls._counters['batches_total'] += 1
+        return written
+
+    @classmethod
+    def maintain_partitions(cls) -> None:
+        """Prepara las particiones de los próximos meses y borra las vencidas"""
+        # Se programa antes: si falla, se reintenta en el próximo ciclo de mantenimiento
+        cls._next_maintenance = time.monotonic() + _MAINTENANCE_SECONDS
+        AuthEventRepository.ensure_partitions(Config.AUTH_EVENTS_PARTITION_MONTHS_AHEAD)
+        if Config.AUTH_EVENTS_RETENTION_MONTHS > 0:
+            dropped = AuthEventRepository.drop_partitions_before(Config.AUTH_EVENTS_RETENTION_MONTHS)
+            if dropped:
+                logger.info("🗑️ Particiones de auth_events vencidas borradas", extra={'partitions': dropped})
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """
+        Contadores del registro de eventos
+
+        Returns:
+            Dict: Contadores acumulados y eventos en el buffer
+        """
+        with cls._lock:
+            snapshot = dict(cls._counters)
+            snapshot['buffered'] = len(cls._high) + len(cls._low)
+        return snapshot
+
+    @classmethod
+    def _run(cls) -> None:
+        while not cls._stop.is_set():
+            cls._wake.wait(Config.AUTH_EVENTS_FLUSH_SECONDS)
+            cls._wake.clear()
+            # El mantenimiento tiene su propio try: si falla, el buffer se escribe igual
+            if time.monotonic() >= cls._next_maintenance:
+                try:
+                    cls.maintain_partitions()
+                except Exception as e:
+                    logger.error(f"❌ Error en el mantenimiento de particiones de auth_events: {e}")
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"❌ Error en el registro de eventos de autenticación: {e}")
+
+    @classmethod
+    def start(cls) -> None:
+        """Prepara las particiones y arranca la escritura periódica"""
+        if not Config.AUTH_EVENTS_ENABLED:
+            return
+        if cls._flush_thread is not None and cls._flush_thread.is_alive():
+            return
+        cls._stop.clear()
+        cls._next_maintenance = 0.0
+        cls._flush_thread = threading.Thread(target=cls._run, name='auth-events-flush', daemon=True)
+        cls._flush_thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Detiene la escritura periódica y escribe lo pendiente"""
+        cls._stop.set()
+        cls._wake.set()
+        if cls._flush_thread is not None:
+            cls._flush_thread.join(timeout=5)
+            cls._flush_thread = None
+        if Config.AUTH_EVENTS_ENABLED:
+            cls.flush()
@@ -1,45 +1,22 @@
-import bcrypt
-import jwt
+import logging
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
-from email_validator import validate_email, EmailNotValidError
 
 from config import Config
 from models.user import User
 from repositories.user_repository import UserRepository
+from services.email_validation import EmailValidation
+from services.hashing import PasswordHasher
+from services.token_revocation import TokenRevocation
 from services.user_service import UserService
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
 
 class AuthService:
     """Servicio de autenticación"""
     
-    @staticmethod
-    def hash_password(password: str) -> str:
-        """
-        Hashea una contraseña usando bcrypt
-        
-        Args:
-            password (str): Contraseña en texto plano
-            
-        Returns:
-            str: Hash de la contraseña
-        """
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-    
-    @staticmethod
-    def verify_password(password: str, password_hash: str) -> bool:
-        """
-        Verifica una contraseña contra su hash
-        
-        Args:
-            password (str): Contraseña en texto plano
-            password_hash (str): Hash almacenado
-            
-        Returns:
-            bool: True si coinciden
-        """
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-    
     @staticmethod
     def generate_token(user: User) -> str:
         """
@@ -51,11 +28,13 @@ class AuthService:
         Returns:
             str: JWT token
         """
+        import jwt
         payload = {
             'user_id': str(user.id),
             'email': user.email,
             'exp': datetime.utcnow() + Config.JWT_ACCESS_TOKEN_EXPIRES,
-            'iat': datetime.utcnow()
+            'iat': datetime.utcnow(),
+            'jti': str(uuid.uuid4())  # Identificador para poder revocarlo
         }
         
         return jwt.encode(
@@ -75,18 +54,23 @@ class AuthService:
         Returns:
             Dict: Payload del token o None si es inválido
         """
+        import jwt
         try:
             payload = jwt.decode(
                 token,
                 Config.JWT_SECRET_KEY,
                 algorithms=[Config.JWT_ALGORITHM]
             )
+            # Lista de revocados en memoria (sin consulta por petición)
+            if TokenRevocation.is_revoked(payload.get('jti')):
+                logger.warning("⚠️ Token revocado")
+                return None
             return payload
         except jwt.ExpiredSignatureError:
-            print("⚠️ Token expirado")
+            logger.warning("⚠️ Token expirado")
             return None
         except jwt.InvalidTokenError:
-            print("⚠️ Token inválido")
+            logger.warning("⚠️ Token inválido")
             return None
     
     @staticmethod
@@ -100,11 +84,7 @@ class AuthService:
         Returns:
             Tuple[bool, Optional[str]]: (es_válido, mensaje_error)
         """
-        try:
-            validate_email(email)
-            return True, None
-        except EmailNotValidError as e:
-            return False, str(e)
+        return EmailValidation.validate(email)
     
     @staticmethod
     def register(name: str, email: str, password: str) -> Tuple[Optional[User], Optional[str], Optional[str]]:
@@ -120,20 +100,7 @@ class AuthService:
             Tuple[Optional[User], Optional[str], Optional[str]]: 
                 (usuario, token, mensaje_error)
         """
-        # Validar nombre
-        if not name or len(name.strip()) < 2:
-            return None, None, "El nombre debe tener al menos 2 caracteres"
-        
-        # Validar email
-        is_valid, error_msg = AuthService.validate_email_format(email)
-        if not is_valid:
-            return None, None, "El formato del email no es válido"
-        
-        # Validar contraseña
-        if not password or len(password) < 6:
-            return None, None, "La contraseña debe tener al menos 6 caracteres"
-        
-        # Delegar creación a UserService (que maneja errores de duplicado)
+        # Validación y creación en una sola pasada (UserService)
         user, err = UserService.create_user(name, email, password)
         if err:
             return None, None, err
@@ -161,13 +128,13 @@ class AuthService:
         
         try:
             # Buscar usuario
-            user = UserRepository.find_by_email(email.lower().strip())
+            user = UserRepository.find_by_email(Validators.normalize_email(email))
             
             if not user:
                 return None, None, "Correo o contraseña incorrectos"
             
             # Verificar contraseña
-            if not AuthService.verify_password(password, user.password_hash):
+            if not PasswordHasher.verify_password(password, user.password_hash):
                 return None, None, "Correo o contraseña incorrectos"
             
             # Actualizar último login
@@ -179,5 +146,25 @@ class AuthService:
             return user, token, None
             
         except Exception as e:
-            print(f"❌ Error en login: {e}")
-            return None, None, "Error interno del servidor"
\ No newline at end of file
+            logger.error(f"❌ Error en login: {e}")
+            return None, None, "Error interno del servidor"
+    
+    @staticmethod
+    def logout(payload: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Cierra la sesión revocando el token hasta su vencimiento
+        
+        Args:
+            payload (Dict): Payload verificado del token
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (éxito, mensaje_error)
+        """
+        # Tokens emitidos antes de existir la revocación: vencen solos
+        if not payload.get('jti'):
+            return False, "Este token no se puede revocar"
+        
+        if not TokenRevocation.revoke(payload):
+            return False, "Error al cerrar sesión"
+        
+        return True, None
\ No newline at end of file
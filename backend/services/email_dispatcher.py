@@ -0,0 +1,140 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Optional
+
+from psycopg import connect
+
+from config import Config
+from repositories.email_outbox_repository import EmailOutboxRepository, OUTBOX_CHANNEL
+from services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDispatcher:
+    """Proceso que envía los emails de la bandeja de salida
+
+    Espera notificaciones con LISTEN y, al despertar, reclama lotes con
+    FOR UPDATE SKIP LOCKED hasta vaciar la cola. Se pueden ejecutar tantos
+    dispatchers como se quiera: cada fila la reclama uno solo.
+
+    Cada EMAIL_OUTBOX_PURGE_SECONDS se purga la bandeja: los emails vencidos
+    (códigos que ya no sirven) pasan a 'expired' y las filas resueltas se
+    borran tras EMAIL_OUTBOX_RETENTION_DAYS.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, batch_size: int = None,
+                 poll_seconds: float = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size or Config.EMAIL_DISPATCHER_BATCH_SIZE
+        self.poll_seconds = poll_seconds or Config.EMAIL_DISPATCHER_POLL_SECONDS
+        self._stop = threading.Event()
+        self._listen_conn = None
+        self._next_purge = 0.0
+
+    def stop(self, *_args) -> None:
+        """Pide al dispatcher que termine tras el lote actual"""
+        logger.info(f"⏹️  Deteniendo dispatcher {self.worker_id}...")
+        self._stop.set()
+
+    def _listen(self) -> None:
+        """Abre la conexión dedicada a LISTEN (autocommit)"""
+        self._listen_conn = connect(Config.get_db_url(), autocommit=True)
+        self._listen_conn.execute(f"LISTEN {OUTBOX_CHANNEL}")
+
+    def _retry_delay(self, attempts: int) -> int:
+        """Backoff exponencial con tope de una hora"""
+        return min(Config.EMAIL_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), 3600)
+
+    def dispatch_batch(self) -> int:
+        """
+        Reclama y envía un lote de emails
+
+        Returns:
+            int: Cantidad de emails procesados
+        """
+        rows = EmailOutboxRepository.claim_batch(self.worker_id, self.batch_size, Config.EMAIL_STALE_SECONDS)
+        sent_ids = []
+
+        for row in rows:
+            try:
+                ok = EmailService.send_template(row['template'], row['to_email'], row['context'])
+                error = None if ok else "El transporte rechazó el envío"
+            except Exception as e:
+                ok, error = False, str(e)
+
+            if ok:
+                sent_ids.append(row['id'])
+            else:
+                EmailOutboxRepository.mark_failed(
+                    row['id'], error, self._retry_delay(row['attempts']), Config.EMAIL_MAX_ATTEMPTS
+                )
+
+        EmailOutboxRepository.mark_sent(sent_ids)
+        return len(rows)
+
+    def purge(self) -> None:
+        """Vence y borra filas de la bandeja si ya toca (no detiene el envío si falla)"""
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + Config.EMAIL_OUTBOX_PURGE_SECONDS
+        result = EmailOutboxRepository.purge(Config.EMAIL_OUTBOX_RETENTION_DAYS)
+        if result['expired'] or result['deleted']:
+            logger.info(f"🧹 Bandeja de emails: {result['expired']} vencidos, {result['deleted']} borrados")
+
+    def drain(self) -> int:
+        """
+        Envía lotes hasta que no queden emails disponibles
+
+        Returns:
+            int: Total de emails procesados
+        """
+        total = 0
+        while not self._stop.is_set():
+            processed = self.dispatch_batch()
+            total += processed
+            if processed < self.batch_size:
+                break
+        return total
+
+    def _wait_for_notification(self) -> None:
+        """Espera un NOTIFY; el timeout cubre los reintentos programados"""
+        deadline = time.monotonic() + self.poll_seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            # Esperas cortas para reaccionar rápido a SIGTERM
+            if any(True for _ in self._listen_conn.notifies(timeout=1, stop_after=1)):
+                return
+
+    def run_forever(self) -> None:
+        """Bucle principal: vaciar la cola y esperar notificaciones"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        logger.info(f"📮 Dispatcher de emails {self.worker_id} escuchando '{OUTBOX_CHANNEL}'")
+
+        while not self._stop.is_set():
+            try:
+                if self._listen_conn is None or self._listen_conn.closed:
+                    self._listen()
+
+                processed = self.drain()
+                if processed:
+                    logger.info(f"📤 {processed} emails procesados")
+
+                self.purge()
+
+                self._wait_for_notification()
+            except Exception as e:
+                logger.error(f"❌ Error en dispatcher de emails: {e}")
+                if self._listen_conn is not None:
+                    self._listen_conn.close()
+                self._listen_conn = None
+                self._stop.wait(5)
+
+        if self._listen_conn is not None:
+            self._listen_conn.close()
+        logger.info(f"🔒 Dispatcher {self.worker_id} detenido")
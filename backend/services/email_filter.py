@@ -0,0 +1,232 @@
+"""
+Filtro de Bloom de emails registrados
+
+Las solicitudes de recuperación para emails que no existen (el tráfico típico
+de los bots de enumeración) se resuelven en memoria: si el filtro dice que el
+email seguro no está registrado, no se consulta la base de datos.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from config import Config
+from database.notify_listener import NotifyListener
+from repositories.user_repository import EMAIL_REGISTERED_CHANNEL, UserRepository
+from utils.bloom import BloomFilter
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
+
+
+class EmailFilter:
+    """Filtro de emails registrados, por proceso
+
+    Se construye en segundo plano con un recorrido por lotes de la tabla users;
+    mientras no está listo, todas las consultas pasan a la base de datos. Los
+    registros de este proceso se agregan al instante y los de otros workers
+    llegan por NOTIFY (EMAIL_REGISTERED_CHANNEL, enviado con el commit del
+    alta). Si el listener no está conectado o aún no se resincronizó tras
+    conectar, se pudieron perder avisos: los descartes pasan a la base de datos
+    hasta que un refresco por created_at (marca de agua con un margen para
+    transacciones que hicieron commit tarde) los recupere. El refresco también
+    corre periódicamente. Cada cierto tiempo, o si se supera la capacidad, se
+    reconstruye sin bloquear: el filtro nuevo reemplaza al anterior cuando está
+    completo.
+    """
+
+    _filter: Optional[BloomFilter] = None
+    _building: Optional[BloomFilter] = None
+    _watermark: Optional[datetime] = None
+    _built_at: Optional[float] = None
+    _listening_session: Optional[int] = None
+    _synced_session: Optional[int] = None
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+
+    _counters = {
+        'checks_total': 0,
+        'definite_misses_total': 0,
+        'unsynced_misses_total': 0,
+        'rebuilds_total': 0,
+    }
+
+    @classmethod
+    def might_exist(cls, email: str) -> bool:
+        """
+        Indica si el email puede estar registrado
+
+        Args:
+            email (str): Email a consultar
+
+        Returns:
+            bool: False si seguro no existe; True si existe o no se sabe
+        """
+        bloom = cls._filter
+        if bloom is None:
+            return True
+        cls._counters['checks_total'] += 1
+        if bloom.might_contain(Validators.normalize_email(email)):
+            return True
+        # Sin listener resincronizado pudo perderse el alta de otro worker
+        if not cls.is_live():
+            cls._counters['unsynced_misses_total'] += 1
+            return True
+        cls._counters['definite_misses_total'] += 1
+        return False
+
+    @classmethod
+    def is_live(cls) -> bool:
+        """Indica si el filtro recibe todas las altas (listener conectado y resincronizado)"""
+        session = NotifyListener.session()
+        return session is not None and session == cls._synced_session
+
+    @classmethod
+    def add(cls, email: str) -> None:
+        """Agrega un email recién registrado (también al filtro en construcción)"""
+        key = Validators.normalize_email(email)
+        with cls._lock:
+            targets = [bloom for bloom in (cls._filter, cls._building) if bloom is not None]
+        for bloom in targets:
+            bloom.add(key)
+
+    @classmethod
+    def rebuild(cls) -> bool:
+        """
+        Construye un filtro nuevo con toda la tabla y reemplaza al actual
+
+        Returns:
+            bool: True si se completó
+        """
+        started = time.perf_counter()
+        current = cls._filter
+        expected = max(current.count if current is not None else 0, UserRepository.estimated_count())
+        # Margen para crecer; si aun así se llena, _needs_rebuild lo redimensiona
+        bloom = BloomFilter(
+            max(Config.EMAIL_FILTER_MIN_CAPACITY, expected * 2),
+            Config.EMAIL_FILTER_FP_RATE
+        )
+        with cls._lock:
+            cls._building = bloom
+
+        watermark = None
+        completed = False
+        try:
+            for email, created_at in UserRepository.stream_emails(Config.EMAIL_FILTER_SCAN_BATCH):
+                bloom.add(Validators.normalize_email(email))
+                if created_at is not None and (watermark is None or created_at > watermark):
+                    watermark = created_at
+                if cls._stop.is_set():
+                    return False
+            completed = True
+        except Exception as e:
+            logger.error(f"❌ Error al construir el filtro de emails: {e}")
+            return False
+        finally:
+            with cls._lock:
+                cls._building = None
+                # En el mismo lock que add(): ningún registro queda fuera del filtro nuevo
+                if completed:
+                    cls._filter = bloom
+                    cls._watermark = watermark
+                    cls._built_at = time.monotonic()
+
+        cls._counters['rebuilds_total'] += 1
+        # Lo que hicieron commit otros workers mientras se recorría la tabla
+        cls.refresh()
+
+        logger.info(f"🌸 Filtro de emails listo: {bloom.count} emails, "
+                    f"{bloom.memory_bytes() // 1024} KiB, {(time.perf_counter() - started) * 1000:.0f} ms")
+        return True
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Agrega los usuarios creados desde la marca de agua (registros de otros workers)"""
+        bloom = cls._filter
+        if bloom is None:
+            return
+        # Si ya se escuchaba el canal al empezar, lo anterior llega con esta lectura
+        # y lo posterior por NOTIFY: el filtro queda completo para esta conexión
+        session = NotifyListener.session()
+        if cls._watermark is None:
+            since = datetime.min
+        else:
+            since = cls._watermark - timedelta(seconds=Config.EMAIL_FILTER_WATERMARK_OVERLAP_SECONDS)
+
+        watermark = cls._watermark
+        for email, created_at in UserRepository.emails_created_since(since):
+            bloom.add(Validators.normalize_email(email))
+            if created_at is not None and (watermark is None or created_at > watermark):
+                watermark = created_at
+        cls._watermark = watermark
+        if session is not None and session == cls._listening_session:
+            cls._synced_session = session
+
+    @classmethod
+    def _on_notify(cls, payload: str) -> None:
+        cls.add(payload)
+
+    @classmethod
+    def _on_reconnect(cls) -> None:
+        """Tras escuchar el canal (o reconectar) se pudieron perder avisos: recuperarlos"""
+        cls._listening_session = NotifyListener.session()
+        cls.refresh()
+
+    @classmethod
+    def _needs_rebuild(cls) -> bool:
+        bloom = cls._filter
+        if bloom is None:
+            return True
+        if bloom.count > bloom.capacity:
+            return True
+        return time.monotonic() - cls._built_at > Config.EMAIL_FILTER_REBUILD_SECONDS
+
+    @classmethod
+    def _run(cls) -> None:
+        while not cls._stop.is_set():
+            try:
+                if cls._needs_rebuild():
+                    cls.rebuild()
+                else:
+                    cls.refresh()
+            except Exception as e:
+                logger.error(f"❌ Error al actualizar el filtro de emails: {e}")
+            cls._stop.wait(Config.EMAIL_FILTER_REFRESH_SECONDS)
+
+    @classmethod
+    def start(cls) -> None:
+        """Construye el filtro y lo mantiene al día en segundo plano"""
+        if not Config.EMAIL_FILTER_ENABLED:
+            return
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        cls._stop.clear()
+        NotifyListener.subscribe(EMAIL_REGISTERED_CHANNEL, cls._on_notify, on_reconnect=cls._on_reconnect)
+        NotifyListener.start()
+        cls._thread = threading.Thread(target=cls._run, name='email-filter', daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Detiene el mantenimiento del filtro"""
+        cls._stop.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """
+        Contadores del filtro
+
+        Returns:
+            Dict: Consultas, descartes sin BD, reconstrucciones y tamaño
+        """
+        bloom = cls._filter
+        snapshot = dict(cls._counters)
+        snapshot['live'] = int(cls.is_live())
+        snapshot['emails'] = bloom.count if bloom is not None else 0
+        snapshot['memory_bytes'] = bloom.memory_bytes() if bloom is not None else 0
+        return snapshot
@@ -1,8 +1,19 @@
+import logging
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional
+import threading
+from datetime import datetime, timedelta
+from email.utils import formataddr
+from typing import TYPE_CHECKING, Optional
+
+from config import Config
+from services.email_templates import EmailTemplates
+from repositories.email_outbox_repository import EmailOutboxRepository
+
+if TYPE_CHECKING:
+    # smtplib, socketserver y mailbox se cargan con el primer envío
+    from services.email_transports import EmailTransport
+
+logger = logging.getLogger(__name__)
 
 class EmailService:
     """Servicio de email funcional y simplificado"""
@@ -14,206 +25,198 @@ class EmailService:
     FROM_EMAIL = os.getenv('EMAIL_FROM', GMAIL_USER)
     FROM_NAME = os.getenv('EMAIL_FROM_NAME', 'Ánima')
     
+    # Entrega: 'direct' (envío en la petición) u 'outbox' (tabla email_outbox + dispatcher, opcional)
+    DELIVERY_MODE = os.getenv('EMAIL_DELIVERY', 'direct')
+    
+    # Transporte SMTP genérico (EMAIL_METHOD=smtp)
+    SMTP_HOST = os.getenv('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', '25'))
+    SMTP_USER = os.getenv('SMTP_USER', '')
+    SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
+    SMTP_SSL = os.getenv('SMTP_SSL', 'False') == 'True'
+    SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'False') == 'True'
+    SMTP_TIMEOUT = float(os.getenv('SMTP_TIMEOUT', '10'))
+    
+    # Transporte a archivos (EMAIL_METHOD=maildir)
+    MAILDIR_PATH = os.getenv('EMAIL_MAILDIR_PATH', os.path.join('tmp', 'maildir'))
+    
+    _transport: Optional['EmailTransport'] = None
+    _transport_lock = threading.Lock()
+    _from_header_cache: Optional[str] = None
+    
+    @staticmethod
+    def get_transport() -> 'EmailTransport':
+        """Obtiene (o crea) el transporte configurado en EMAIL_METHOD"""
+        if EmailService._transport is None:
+            with EmailService._transport_lock:
+                if EmailService._transport is None:
+                    from services.email_transports import create_transport
+                    EmailService._transport = create_transport(EmailService.EMAIL_METHOD, {
+                        'GMAIL_USER': EmailService.GMAIL_USER,
+                        'GMAIL_APP_PASSWORD': EmailService.GMAIL_APP_PASSWORD,
+                        'SMTP_HOST': EmailService.SMTP_HOST,
+                        'SMTP_PORT': EmailService.SMTP_PORT,
+                        'SMTP_USER': EmailService.SMTP_USER,
+                        'SMTP_PASSWORD': EmailService.SMTP_PASSWORD,
+                        'SMTP_SSL': EmailService.SMTP_SSL,
+                        'SMTP_STARTTLS': EmailService.SMTP_STARTTLS,
+                        'SMTP_TIMEOUT': EmailService.SMTP_TIMEOUT,
+                        'EMAIL_MAILDIR_PATH': EmailService.MAILDIR_PATH,
+                    })
+                    logger.info(f"📮 Transporte de email: {EmailService._transport.name}")
+        return EmailService._transport
+    
     @staticmethod
-    def _send_via_gmail(to_email: str, subject: str, html_content: str, text_content: str) -> bool:
-        """Envía email usando Gmail SMTP"""
+    def set_transport(transport: Optional['EmailTransport']) -> None:
+        """Reemplaza el transporte activo (benchmarks y pruebas de carga)"""
+        with EmailService._transport_lock:
+            if EmailService._transport is not None and EmailService._transport is not transport:
+                EmailService._transport.close()
+            EmailService._transport = transport
+    
+    @staticmethod
+    def _sender_address() -> str:
+        """Dirección del remitente según el método configurado"""
+        if EmailService.EMAIL_METHOD == 'gmail':
+            return EmailService.GMAIL_USER
+        return EmailService.FROM_EMAIL or EmailService.SMTP_USER or 'no-reply@anima.local'
+    
+    @staticmethod
+    def _deliver(to_email: str, message: bytes) -> bool:
+        """Envía un mensaje ya construido con el transporte configurado"""
+        import smtplib
+        
         try:
             # Validar configuración
-            if not EmailService.GMAIL_USER or not EmailService.GMAIL_APP_PASSWORD:
-                print("\n❌ ERROR: GMAIL_USER y GMAIL_APP_PASSWORD no están configurados")
-                print("📝 Configura en backend/.env:")
-                print("   GMAIL_USER=tu-email@gmail.com")
-                print("   GMAIL_APP_PASSWORD=xxxx-xxxx-xxxx-xxxx")
+            if EmailService.EMAIL_METHOD == 'gmail' and (not EmailService.GMAIL_USER or not EmailService.GMAIL_APP_PASSWORD):
+                logger.error(
+                    "❌ ERROR: GMAIL_USER y GMAIL_APP_PASSWORD no están configurados\n"
+                    "📝 Configura en backend/.env:\n"
+                    "   GMAIL_USER=tu-email@gmail.com\n"
+                    "   GMAIL_APP_PASSWORD=xxxx-xxxx-xxxx-xxxx"
+                )
                 return False
             
-            # Crear mensaje
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = f"{EmailService.FROM_NAME} <{EmailService.GMAIL_USER}>"
-            message['To'] = to_email
-            
-            # Agregar contenido
-            part1 = MIMEText(text_content, 'plain', 'utf-8')
-            part2 = MIMEText(html_content, 'html', 'utf-8')
-            message.attach(part1)
-            message.attach(part2)
+            transport = EmailService.get_transport()
+            transport.deliver(EmailService._sender_address(), [to_email], message)
             
-            # Conectar y enviar
-            print(f"📧 Conectando a Gmail SMTP...")
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465, timeout=10) as server:
-                print(f"🔐 Autenticando con {EmailService.GMAIL_USER}...")
-                server.login(EmailService.GMAIL_USER, EmailService.GMAIL_APP_PASSWORD)
-                print(f"📤 Enviando email a {to_email}...")
-                server.send_message(message)
-            
-            print(f"✅ Email enviado exitosamente a {to_email}")
+            # Alto volumen: se puede muestrear con LOG_SAMPLE_RATES=services.email_service=0.1
+            logger.info("✅ Email enviado", extra={'to': to_email, 'transport': transport.name})
             return True
             
+        except ValueError as e:
+            logger.error(f"❌ {e} (métodos válidos: 'gmail', 'smtp', 'memory', 'maildir', 'local')")
+            return False
+            
         except smtplib.SMTPAuthenticationError as e:
-            print("\n❌ ERROR DE AUTENTICACIÓN")
-            print("=" * 60)
-            print("Posibles causas:")
-            print("1. App Password incorrecta (debe ser 16 caracteres sin espacios)")
-            print("2. Verificación en 2 pasos no activada")
-            print("3. Email incorrecto en GMAIL_USER")
-            print("\n🔧 Soluciones:")
-            print("1. Ve a: https://myaccount.google.com/apppasswords")
-            print("2. Genera una nueva App Password")
-            print("3. Copia exactamente los 16 caracteres (sin espacios)")
-            print("4. Actualiza GMAIL_APP_PASSWORD en backend/.env")
-            print("=" * 60)
-            print(f"\nError técnico: {e}")
+            logger.error(
+                "❌ ERROR DE AUTENTICACIÓN\n"
+                "Posibles causas:\n"
+                "1. App Password incorrecta (debe ser 16 caracteres sin espacios)\n"
+                "2. Verificación en 2 pasos no activada\n"
+                "3. Email incorrecto en GMAIL_USER\n"
+                "🔧 Soluciones:\n"
+                "1. Ve a: https://myaccount.google.com/apppasswords\n"
+                "2. Genera una nueva App Password\n"
+                "3. Copia exactamente los 16 caracteres (sin espacios)\n"
+                "4. Actualiza GMAIL_APP_PASSWORD en backend/.env\n"
+                f"Error técnico: {e}"
+            )
             return False
             
         except smtplib.SMTPException as e:
-            print(f"\n❌ ERROR SMTP: {e}")
+            logger.error(f"❌ ERROR SMTP: {e}")
             return False
             
         except Exception as e:
-            print(f"\n❌ Error inesperado: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Error inesperado: {e}")
             return False
     
     @staticmethod
     def send_password_reset_code(email: str, code: str, user_name: str) -> bool:
         """Envía un código de recuperación de contraseña"""
         
-        print(f"\n{'='*70}")
-        print(f"📧 ENVIANDO EMAIL DE RECUPERACIÓN")
-        print(f"{'='*70}")
-        print(f"Destinatario: {email}")
-        print(f"Usuario: {user_name}")
-        print(f"Código: {code}")
-        print(f"Método: {EmailService.EMAIL_METHOD}")
-        
-        subject = "Código de recuperación de contraseña - Ánima"
-        
-        # HTML simplificado pero bonito
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 20px; font-family: Arial, sans-serif; background-color: #f4f4f4;">
-    <div style="max-width: 600px; margin: 0 auto; background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%); padding: 40px; border-radius: 12px; color: white;">
-        
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="font-size: 32px; margin: 0; margin-bottom: 10px;">🎵 Ánima</h1>
-            <h2 style="font-size: 20px; font-weight: normal; margin: 0;">Recuperación de Contraseña</h2>
-        </div>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Hola <strong>{user_name}</strong>,</p>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Hemos recibido una solicitud para restablecer tu contraseña en Ánima.</p>
-        
-        <div style="background: rgba(255, 255, 255, 0.1); border: 2px solid rgba(255, 255, 255, 0.3); border-radius: 8px; padding: 20px; text-align: center; margin: 30px 0;">
-            <p style="margin: 0 0 10px 0; font-size: 14px; opacity: 0.8;">Tu código de verificación es:</p>
-            <div style="font-size: 36px; font-weight: bold; letter-spacing: 8px; color: #ffffff; font-family: 'Courier New', monospace;">{code}</div>
-        </div>
-        
-        <div style="background: rgba(83, 52, 131, 0.2); border-left: 4px solid #533483; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <strong style="font-size: 16px;">⏱️ Este código es válido por 15 minutos.</strong>
-        </div>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Si no solicitaste este cambio, puedes ignorar este mensaje de forma segura.</p>
-        
-        <div style="text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid rgba(255, 255, 255, 0.2); font-size: 14px; color: rgba(255, 255, 255, 0.7);">
-            <p style="margin: 0 0 10px 0;">Saludos,<br>El equipo de Ánima</p>
-            <p style="margin: 10px 0 0 0; font-size: 12px;">Este es un correo automático, por favor no respondas a este mensaje.</p>
-        </div>
-        
-    </div>
-</body>
-</html>
-"""
-        
-        # Texto plano (fallback)
-        text_content = f"""
-Hola {user_name},
-
-Hemos recibido una solicitud para restablecer tu contraseña en Ánima.
-
-Tu código de verificación es: {code}
-
-Este código es válido por 15 minutos.
-
-Si no solicitaste este cambio, puedes ignorar este mensaje de forma segura.
-
-Saludos,
-El equipo de Ánima
-
----
-Este es un correo automático, por favor no respondas a este mensaje.
-"""
+        logger.debug("📧 Enviando email de recuperación", extra={
+            'to': email, 'user_name': user_name, 'method': EmailService.EMAIL_METHOD
+        })
         
-        if EmailService.EMAIL_METHOD == 'gmail':
-            return EmailService._send_via_gmail(email, subject, html_content, text_content)
-        else:
-            print(f"❌ Método de email no soportado: {EmailService.EMAIL_METHOD}")
-            print("📝 Métodos válidos: 'gmail'")
-            return False
+        return EmailService.send_template('password_reset', email, {
+            'user_name': user_name,
+            'code': code
+        })
     
     @staticmethod
     def send_password_changed_notification(email: str, user_name: str) -> bool:
         """Envía notificación de contraseña cambiada"""
         
-        subject = "Tu contraseña ha sido actualizada - Ánima"
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 20px; font-family: Arial, sans-serif; background-color: #f4f4f4;">
-    <div style="max-width: 600px; margin: 0 auto; background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%); padding: 40px; border-radius: 12px; color: white;">
-        
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="font-size: 32px; margin: 0; margin-bottom: 10px;">🎵 Ánima</h1>
-            <h2 style="font-size: 20px; font-weight: normal; margin: 0;">Contraseña Actualizada</h2>
-        </div>
-        
-        <div style="text-align: center; font-size: 64px; margin: 20px 0;">✅</div>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Hola <strong>{user_name}</strong>,</p>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Tu contraseña de Ánima ha sido actualizada exitosamente.</p>
-        
-        <div style="background: rgba(255, 193, 7, 0.2); border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <strong style="font-size: 16px;">⚠️ ¿No fuiste tú?</strong><br>
-            <span style="font-size: 14px;">Si no realizaste este cambio, contacta inmediatamente a nuestro equipo de soporte.</span>
-        </div>
-        
-        <p style="font-size: 16px; line-height: 1.6;">Ahora puedes iniciar sesión con tu nueva contraseña.</p>
-        
-        <div style="text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid rgba(255, 255, 255, 0.2); font-size: 14px; color: rgba(255, 255, 255, 0.7);">
-            <p style="margin: 0;">Saludos,<br>El equipo de Ánima</p>
-        </div>
-        
-    </div>
-</body>
-</html>
-"""
-        
-        text_content = f"""
-Hola {user_name},
-
-Tu contraseña de Ánima ha sido actualizada exitosamente.
-
-⚠️ Si no realizaste este cambio, contacta inmediatamente a nuestro equipo de soporte.
-
-Ahora puedes iniciar sesión con tu nueva contraseña.
-
-Saludos,
-El equipo de Ánima
-"""
-        
-        if EmailService.EMAIL_METHOD == 'gmail':
-            return EmailService._send_via_gmail(email, subject, html_content, text_content)
-        else:
-            print(f"❌ Método no soportado: {EmailService.EMAIL_METHOD}")
-            return False
\ No newline at end of file
+        return EmailService.send_template('password_changed', email, {
+            'user_name': user_name
+        })
+    
+    @staticmethod
+    def uses_outbox() -> bool:
+        """Indica si los emails se encolan en la bandeja de salida"""
+        return EmailService.DELIVERY_MODE == 'outbox'
+    
+    @staticmethod
+    def _code_expires_at(expires_at: Optional[datetime]) -> datetime:
+        """Vencimiento del email con el código: después ya no sirve enviarlo"""
+        return expires_at or datetime.now() + timedelta(minutes=Config.RESET_CODE_EXPIRATION_MINUTES)
+    
+    @staticmethod
+    def queue_password_reset_code(cursor, email: str, code: str, user_name: str,
+                                  expires_at: Optional[datetime] = None) -> int:
+        """Encola el código de recuperación en la transacción del cursor (hasta que venza)"""
+        return EmailOutboxRepository.enqueue(cursor, 'password_reset', email, {
+            'user_name': user_name,
+            'code': code
+        }, expires_at=EmailService._code_expires_at(expires_at))
+    
+    @staticmethod
+    def queue_password_changed_notification(cursor, email: str, user_name: str) -> int:
+        """Encola la notificación de contraseña cambiada en la transacción del cursor"""
+        return EmailOutboxRepository.enqueue(cursor, 'password_changed', email, {
+            'user_name': user_name
+        })
+    
+    @staticmethod
+    async def queue_password_reset_code_async(cursor, email: str, code: str, user_name: str,
+                                              expires_at: Optional[datetime] = None) -> int:
+        """Encola el código de recuperación con un cursor asíncrono"""
+        return await EmailOutboxRepository.enqueue_async(cursor, 'password_reset', email, {
+            'user_name': user_name,
+            'code': code
+        }, expires_at=EmailService._code_expires_at(expires_at))
+    
+    @staticmethod
+    async def queue_password_changed_notification_async(cursor, email: str, user_name: str) -> int:
+        """Encola la notificación de contraseña cambiada con un cursor asíncrono"""
+        return await EmailOutboxRepository.enqueue_async(cursor, 'password_changed', email, {
+            'user_name': user_name
+        })
+    
+    @staticmethod
+    def send_template(template_name: str, email: str, context: dict) -> bool:
+        """
+        Renderiza una plantilla precompilada y la envía con el transporte configurado
+        
+        Args:
+            template_name (str): Nombre de la plantilla
+            email (str): Destinatario
+            context (dict): Variables de la plantilla
+            
+        Returns:
+            bool: True si se envió correctamente
+        """
+        template = EmailTemplates.get(template_name)
+        message = template.build_message(EmailService._from_header(), email, context)
+        return EmailService._deliver(email, message)
+    
+    @staticmethod
+    def _from_header() -> str:
+        """Cabecera From codificada (se calcula una sola vez)"""
+        if EmailService._from_header_cache is None:
+            EmailService._from_header_cache = formataddr(
+                (EmailService.FROM_NAME, EmailService._sender_address()), 'utf-8'
+            )
+        return EmailService._from_header_cache
@@ -0,0 +1,206 @@
+"""
+Plantillas de email precompiladas
+
+Las plantillas se leen de backend/templates/email y se compilan una sola vez.
+Cada plantilla guarda ya codificadas las partes estáticas del mensaje MIME
+(cabeceras, boundary y cabeceras de cada parte), de modo que en cada envío
+solo se sustituyen las variables y se codifica el cuerpo resultante.
+"""
+import base64
+import html
+import os
+import re
+import secrets
+import threading
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from typing import Dict, Optional
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'email')
+
+# Variables con la forma {{ nombre }}
+_PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Definición de las plantillas disponibles
+TEMPLATE_DEFINITIONS = {
+    'password_reset': {
+        'subject': 'Código de recuperación de contraseña - Ánima',
+        'text': 'password_reset.txt',
+        'html': 'password_reset.html',
+    },
+    'password_changed': {
+        'subject': 'Tu contraseña ha sido actualizada - Ánima',
+        'text': 'password_changed.txt',
+        'html': 'password_changed.html',
+    },
+}
+
+
+class CompiledTemplate:
+    """Plantilla de texto compilada a un format string de Python"""
+
+    __slots__ = ('name', 'fields', '_format', '_escape')
+
+    def __init__(self, name: str, source: str, escape_html: bool = False):
+        """
+        Compila el texto de la plantilla
+
+        Args:
+            name (str): Nombre de la plantilla (para mensajes de error)
+            source (str): Texto con variables {{ nombre }}
+            escape_html (bool): Si escapar los valores antes de sustituirlos
+        """
+        parts = _PLACEHOLDER.split(source)
+        literals = [part.replace('{', '{{').replace('}', '}}') for part in parts[0::2]]
+        fields = parts[1::2]
+
+        chunks = []
+        for index, literal in enumerate(literals):
+            chunks.append(literal)
+            if index < len(fields):
+                chunks.append('{' + fields[index] + '}')
+
+        self.name = name
+        self.fields = frozenset(fields)
+        self._format = ''.join(chunks)
+        self._escape = escape_html
+
+    def render(self, context: Dict[str, object]) -> str:
+        """
+        Sustituye las variables de la plantilla
+
+        Args:
+            context (Dict): Valores de las variables
+
+        Returns:
+            str: Texto renderizado
+        """
+        missing = self.fields.difference(context)
+        if missing:
+            raise KeyError(f"Faltan variables para la plantilla {self.name}: {', '.join(sorted(missing))}")
+
+        if self._escape:
+            values = {key: html.escape(str(context[key]), quote=True) for key in self.fields}
+        else:
+            values = {key: context[key] for key in self.fields}
+
+        return self._format.format_map(values)
+
+
+def _encode_body(text: str) -> bytes:
+    """Codifica un cuerpo en base64 con saltos de línea CRLF (76 columnas)"""
+    return base64.encodebytes(text.encode('utf-8')).replace(b'\n', b'\r\n')
+
+
+class EmailTemplate:
+    """Plantilla de email (texto + HTML) con su esqueleto MIME precalculado"""
+
+    def __init__(self, name: str, subject: str, text_source: str, html_source: str):
+        self.name = name
+        self.subject = subject
+        self.text = CompiledTemplate(f'{name}.txt', text_source)
+        self.html = CompiledTemplate(f'{name}.html', html_source, escape_html=True)
+
+        # Esqueleto MIME multipart/alternative: todo lo que no depende del envío
+        boundary = f'===============anima_{secrets.token_hex(12)}=='
+        encoded_subject = Header(subject, 'utf-8').encode()
+
+        self._headers = (
+            f'Subject: {encoded_subject}\r\n'
+            'MIME-Version: 1.0\r\n'
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\r\n'
+        ).encode('ascii')
+        self._text_part_head = (
+            f'\r\n--{boundary}\r\n'
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            'Content-Transfer-Encoding: base64\r\n\r\n'
+        ).encode('ascii')
+        self._html_part_head = (
+            f'--{boundary}\r\n'
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            'Content-Transfer-Encoding: base64\r\n\r\n'
+        ).encode('ascii')
+        self._closing = f'--{boundary}--\r\n'.encode('ascii')
+
+    def build_message(self, from_header: str, to_email: str, context: Dict[str, object]) -> bytes:
+        """
+        Construye el mensaje listo para enviar por SMTP
+
+        Args:
+            from_header (str): Cabecera From ya codificada
+            to_email (str): Destinatario
+            context (Dict): Variables de la plantilla
+
+        Returns:
+            bytes: Mensaje RFC 5322 completo
+        """
+        text_body = _encode_body(self.text.render(context))
+        html_body = _encode_body(self.html.render(context))
+
+        to_header = to_email if to_email.isascii() else Header(to_email, 'utf-8').encode()
+        envelope = (
+            f'From: {from_header}\r\n'
+            f'To: {to_header}\r\n'
+            f'Date: {formatdate(localtime=True)}\r\n'
+            f'Message-ID: {make_msgid(domain="anima")}\r\n'
+        ).encode('ascii')
+
+        return b''.join((
+            envelope,
+            self._headers,
+            self._text_part_head,
+            text_body,
+            self._html_part_head,
+            html_body,
+            self._closing,
+        ))
+
+
+class EmailTemplates:
+    """Registro de plantillas compiladas (se cargan una vez por proceso)"""
+
+    _templates: Dict[str, EmailTemplate] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def preload(cls) -> None:
+        """Lee y compila todas las plantillas definidas"""
+        with cls._lock:
+            if len(cls._templates) == len(TEMPLATE_DEFINITIONS):
+                return
+            for name in TEMPLATE_DEFINITIONS:
+                if name not in cls._templates:
+                    cls._templates[name] = cls._load(name)
+
+    @classmethod
+    def get(cls, name: str) -> EmailTemplate:
+        """
+        Obtiene una plantilla compilada
+
+        Args:
+            name (str): Nombre de la plantilla
+
+        Returns:
+            EmailTemplate: Plantilla compilada
+        """
+        template = cls._templates.get(name)
+        if template is None:
+            with cls._lock:
+                template = cls._templates.get(name)
+                if template is None:
+                    template = cls._load(name)
+                    cls._templates[name] = template
+        return template
+
+    @staticmethod
+    def _load(name: str) -> EmailTemplate:
+        definition: Optional[dict] = TEMPLATE_DEFINITIONS.get(name)
+        if definition is None:
+            raise KeyError(f"Plantilla de email desconocida: {name}")
+
+        with open(os.path.join(TEMPLATES_DIR, definition['text']), encoding='utf-8') as f:
+            text_source = f.read()
+        with open(os.path.join(TEMPLATES_DIR, definition['html']), encoding='utf-8') as f:
+            html_source = f.read()
+
+        return EmailTemplate(name, definition['subject'], text_source, html_source)
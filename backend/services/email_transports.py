@@ -0,0 +1,278 @@
+"""
+Transportes de email intercambiables
+
+Todos los transportes reciben el mensaje ya construido (bytes RFC 5322) y
+registran cuántos envíos hicieron y cuánto tardaron, de modo que los tiempos
+de envío son comparables entre transportes.
+"""
+import os
+import smtplib
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class EmailTransport:
+    """Interfaz base de los transportes de email"""
+
+    name = 'base'
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    def send(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        """
+        Envía un mensaje. Debe lanzar una excepción si el envío falla
+
+        Args:
+            from_addr (str): Remitente del sobre SMTP
+            to_addrs (List[str]): Destinatarios
+            message (bytes): Mensaje completo
+        """
+        raise NotImplementedError
+
+    def deliver(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        """Envía un mensaje midiendo el tiempo del envío"""
+        start = time.perf_counter()
+        try:
+            self.send(from_addr, to_addrs, message)
+        except Exception:
+            with self._stats_lock:
+                self.failed += 1
+                self.total_seconds += time.perf_counter() - start
+            raise
+        with self._stats_lock:
+            self.sent += 1
+            self.total_seconds += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Estadísticas acumuladas del transporte
+
+        Returns:
+            Dict: envíos, fallos y tiempo medio por envío (ms)
+        """
+        with self._stats_lock:
+            total = self.sent + self.failed
+            return {
+                'transport': self.name,
+                'sent': self.sent,
+                'failed': self.failed,
+                'avg_ms': (self.total_seconds / total * 1000) if total else 0.0,
+            }
+
+    def close(self) -> None:
+        """Libera los recursos del transporte"""
+
+
+class SMTPTransport(EmailTransport):
+    """Envío por SMTP a cualquier servidor (Gmail, relay propio o servidor local)"""
+
+    name = 'smtp'
+
+    def __init__(self, host: str, port: int, username: Optional[str] = None,
+                 password: Optional[str] = None, use_ssl: bool = False,
+                 starttls: bool = False, timeout: float = 10):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        with smtp_class(self.host, self.port, timeout=self.timeout) as server:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password or '')
+            server.sendmail(from_addr, to_addrs, message)
+
+
+class MemoryTransport(EmailTransport):
+    """Guarda los mensajes en memoria (pruebas y carga sin red)"""
+
+    name = 'memory'
+
+    def __init__(self, max_messages: Optional[int] = 1000):
+        super().__init__()
+        self.messages = deque(maxlen=max_messages)
+
+    def send(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        self.messages.append((from_addr, tuple(to_addrs), message))
+
+
+class MaildirTransport(EmailTransport):
+    """Escribe cada mensaje como un archivo en un directorio Maildir"""
+
+    name = 'maildir'
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        # Maildir solo crea tmp/new/cur si el directorio raíz no existe
+        for subdir in ('tmp', 'new', 'cur'):
+            os.makedirs(os.path.join(path, subdir), exist_ok=True)
+        import mailbox
+        self._maildir = mailbox.Maildir(path, create=True)
+        self._lock = threading.Lock()
+
+    def send(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        with self._lock:
+            self._maildir.add(message)
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Implementa el subconjunto de SMTP que usa smtplib para enviar"""
+
+    MAX_LINE = 1024 * 1024
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self._reply('220 anima-local-smtp listo')
+        mail_from, rcpts = None, []
+
+        while True:
+            raw = self.rfile.readline(self.MAX_LINE)
+            if not raw:
+                break
+            line = raw.decode('ascii', 'replace').strip()
+            verb = line[:4].upper()
+
+            if verb == 'EHLO':
+                self.wfile.write(b'250-anima-local-smtp\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n250 SIZE 10485760\r\n')
+            elif verb == 'HELO':
+                self._reply('250 anima-local-smtp')
+            elif verb == 'AUTH':
+                self._reply('235 Autenticado')
+            elif verb == 'MAIL':
+                mail_from, rcpts = line[10:].strip(' <>'), []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                rcpts.append(line[8:].strip(' <>'))
+                self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 Fin con <CRLF>.<CRLF>')
+                chunks = []
+                while True:
+                    data_line = self.rfile.readline(self.MAX_LINE)
+                    if not data_line or data_line == b'.\r\n':
+                        break
+                    if data_line.startswith(b'..'):
+                        data_line = data_line[1:]
+                    chunks.append(data_line)
+                self.server.store(mail_from, rcpts, b''.join(chunks))
+                mail_from, rcpts = None, []
+                self._reply('250 OK mensaje aceptado')
+            elif verb == 'RSET':
+                mail_from, rcpts = None, []
+                self._reply('250 OK')
+            elif verb == 'NOOP':
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Hasta luego')
+                break
+            else:
+                self._reply('502 Comando no implementado')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Servidor SMTP local que acepta y descarta (o guarda) los mensajes"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, keep_messages: int = 0):
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.received = 0
+        self.messages = deque(maxlen=keep_messages or None) if keep_messages else None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server_address[0], self.server_address[1]
+
+    def store(self, mail_from: str, rcpts: List[str], message: bytes) -> None:
+        with self._lock:
+            self.received += 1
+            if self.messages is not None:
+                self.messages.append((mail_from, tuple(rcpts), message))
+
+    def start(self) -> 'LocalSMTPServer':
+        """Arranca el servidor en un hilo en segundo plano"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.serve_forever, name='local-smtp', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Detiene el servidor"""
+        if self._thread is not None:
+            self.shutdown()
+            self.server_close()
+            self._thread = None
+
+
+class LocalSMTPTransport(SMTPTransport):
+    """Transporte SMTP contra un servidor local arrancado en el propio proceso"""
+
+    name = 'local'
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.server = LocalSMTPServer(host, port).start()
+        bound_host, bound_port = self.server.address
+        super().__init__(bound_host, bound_port)
+
+    def close(self) -> None:
+        self.server.stop()
+
+
+def create_transport(method: str, settings: Dict[str, object]) -> EmailTransport:
+    """
+    Crea el transporte correspondiente al método configurado
+
+    Args:
+        method (str): 'gmail', 'smtp', 'memory', 'maildir' o 'local'
+        settings (Dict): Configuración (credenciales, host, rutas)
+
+    Returns:
+        EmailTransport: Transporte listo para usar
+
+    Raises:
+        ValueError: Si el método no es válido
+    """
+    if method == 'gmail':
+        return SMTPTransport(
+            'smtp.gmail.com', 465,
+            username=settings.get('GMAIL_USER'),
+            password=settings.get('GMAIL_APP_PASSWORD'),
+            use_ssl=True
+        )
+    if method == 'smtp':
+        return SMTPTransport(
+            settings.get('SMTP_HOST') or 'localhost',
+            int(settings.get('SMTP_PORT') or 25),
+            username=settings.get('SMTP_USER') or None,
+            password=settings.get('SMTP_PASSWORD') or None,
+            use_ssl=bool(settings.get('SMTP_SSL')),
+            starttls=bool(settings.get('SMTP_STARTTLS')),
+            timeout=float(settings.get('SMTP_TIMEOUT') or 10)
+        )
+    if method == 'memory':
+        return MemoryTransport()
+    if method == 'maildir':
+        return MaildirTransport(settings.get('EMAIL_MAILDIR_PATH') or os.path.join('tmp', 'maildir'))
+    if method == 'local':
+        return LocalSMTPTransport()
+    raise ValueError(f"Método de email no soportado: {method}")
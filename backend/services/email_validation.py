@@ -0,0 +1,225 @@
+"""
+Validación de emails
+
+Por defecto solo se valida la sintaxis: no hay red de por medio y dnspython
+ni siquiera se importa. Con EMAIL_CHECK_DELIVERABILITY=True además se
+comprueba que el dominio reciba correo (MX, o A/AAAA como respaldo). Los
+resultados por dominio se cachean con TTL (los negativos con un TTL propio) y
+las peticiones concurrentes para el mismo dominio comparten una sola
+resolución, que corre en un pool de hilos dedicado.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+INVALID_FORMAT_MESSAGE = "El formato del email no es válido"
+UNDELIVERABLE_MESSAGE = "El dominio del email no puede recibir correos"
+
+
+class EmailValidation:
+    """Pipeline de validación: sintaxis y, opcionalmente, entregabilidad del dominio"""
+
+    # dominio ASCII -> True (recibe correo) / False (no recibe)
+    _mx_cache = TTLCache(Config.EMAIL_MX_CACHE_SIZE, Config.EMAIL_MX_CACHE_TTL_SECONDS)
+    _lock = threading.Lock()
+    _in_flight: Dict[str, Future] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+    _resolver = None
+
+    @staticmethod
+    def check_syntax(email: str):
+        """
+        Valida solo la sintaxis del email (sin consultas DNS)
+
+        Args:
+            email (str): Email a validar
+
+        Returns:
+            Tuple[ValidatedEmail, Optional[str]]: (email validado o None, error)
+        """
+        # Import diferido: email_validator solo se carga al registrar usuarios
+        from email_validator import validate_email, EmailNotValidError
+        try:
+            return validate_email(email, check_deliverability=False), None
+        except EmailNotValidError as e:
+            return None, str(e)
+
+    @classmethod
+    def validate(cls, email: str) -> Tuple[bool, Optional[str]]:
+        """
+        Valida un email según la configuración
+
+        Si la resolución del dominio tarda más que EMAIL_DNS_TIMEOUT_SECONDS el
+        email se acepta; la resolución sigue en segundo plano y su resultado
+        queda en la caché para las siguientes peticiones.
+
+        Args:
+            email (str): Email a validar
+
+        Returns:
+            Tuple[bool, Optional[str]]: (es_válido, mensaje_error)
+        """
+        domain, verdict = cls.precheck(email)
+        if domain is None:
+            return verdict
+        return cls.deliverability(domain)
+
+    @classmethod
+    def deliverability(cls, domain: str) -> Tuple[bool, Optional[str]]:
+        """
+        Espera la resolución del dominio (compartida con otras peticiones)
+
+        Args:
+            domain (str): Dominio ASCII devuelto por precheck
+
+        Returns:
+            Tuple[bool, Optional[str]]: (es_válido, mensaje_error)
+        """
+        try:
+            deliverable = cls._lookup(domain).result(timeout=Config.EMAIL_DNS_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            logger.warning(f"⚠️ Resolución DNS lenta para {domain}: se acepta sin verificar")
+            return True, None
+        return cls._verdict(deliverable)
+
+    @classmethod
+    async def validate_async(cls, email: str) -> Tuple[bool, Optional[str]]:
+        """Igual que validate, sin bloquear el event loop mientras se resuelve el dominio"""
+        domain, verdict = cls.precheck(email)
+        if domain is None:
+            return verdict
+        return await cls.deliverability_async(domain)
+
+    @classmethod
+    async def deliverability_async(cls, domain: str) -> Tuple[bool, Optional[str]]:
+        """Igual que deliverability, sin bloquear el event loop"""
+        import asyncio
+
+        future = asyncio.wrap_future(cls._lookup(domain))
+        try:
+            # shield: el timeout de esta petición no cancela la resolución compartida
+            deliverable = await asyncio.wait_for(asyncio.shield(future), Config.EMAIL_DNS_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Resolución DNS lenta para {domain}: se acepta sin verificar")
+            return True, None
+        return cls._verdict(deliverable)
+
+    @classmethod
+    def precheck(cls, email: str) -> Tuple[Optional[str], Tuple[bool, Optional[str]]]:
+        """
+        Parte de la validación que no usa la red: sintaxis y caché de dominios
+
+        Si devuelve un dominio, falta comprobarlo con deliverability().
+
+        Returns:
+            Tuple: (dominio a resolver o None, resultado si ya está decidido)
+        """
+        validated, error = cls.check_syntax(email)
+        if validated is None:
+            logger.debug(f"Email rechazado por sintaxis: {error}")
+            return None, (False, INVALID_FORMAT_MESSAGE)
+
+        if not Config.EMAIL_CHECK_DELIVERABILITY:
+            return None, (True, None)
+
+        domain = validated.ascii_domain
+        deliverable = cls._mx_cache.get(domain)
+        if deliverable is not None:
+            return None, cls._verdict(deliverable)
+        return domain, (True, None)
+
+    @staticmethod
+    def _verdict(deliverable: Optional[bool]) -> Tuple[bool, Optional[str]]:
+        # None: el DNS no dio una respuesta concluyente, no se rechaza al usuario
+        if deliverable is False:
+            return False, UNDELIVERABLE_MESSAGE
+        return True, None
+
+    @classmethod
+    def _lookup(cls, domain: str) -> Future:
+        """Resolución en curso para el dominio (se crea si no hay ninguna)"""
+        with cls._lock:
+            future = cls._in_flight.get(domain)
+            if future is not None:
+                return future
+            future = cls._get_executor().submit(cls._resolve, domain)
+            cls._in_flight[domain] = future
+        # Fuera del lock: si ya terminó, el callback se ejecuta aquí mismo
+        future.add_done_callback(lambda f: cls._finish(domain, f))
+        return future
+
+    @classmethod
+    def _resolve(cls, domain: str) -> Optional[bool]:
+        """
+        Consulta si el dominio recibe correo (bloqueante, en el pool de DNS)
+
+        Returns:
+            Optional[bool]: True/False, o None si no hubo respuesta concluyente
+        """
+        from email_validator import EmailUndeliverableError
+        from email_validator.deliverability import validate_email_deliverability
+
+        try:
+            info = validate_email_deliverability(domain, domain, dns_resolver=cls._get_resolver())
+        except EmailUndeliverableError as e:
+            logger.info(f"📭 Dominio sin correo: {domain} ({e})")
+            return False
+        if 'unknown-deliverability' in info:
+            logger.warning(f"⚠️ Entregabilidad desconocida para {domain}: {info['unknown-deliverability']}")
+            return None
+        return True
+
+    @classmethod
+    def _finish(cls, domain: str, future: Future) -> None:
+        with cls._lock:
+            cls._in_flight.pop(domain, None)
+
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"❌ Error al resolver el dominio {domain}: {error}")
+            return
+
+        deliverable = future.result()
+        if deliverable is True:
+            cls._mx_cache.set(domain, True)
+        elif deliverable is False:
+            cls._mx_cache.set(domain, False, ttl_seconds=Config.EMAIL_MX_NEGATIVE_TTL_SECONDS)
+        # None (timeout, sin servidores de nombres) no se cachea
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=Config.EMAIL_DNS_WORKERS,
+                thread_name_prefix='mx-resolver'
+            )
+        return cls._executor
+
+    @classmethod
+    def _get_resolver(cls):
+        # Resolver propio: no se modifica el timeout del resolver global de dnspython
+        if cls._resolver is None:
+            from email_validator import caching_resolver
+            cls._resolver = caching_resolver(timeout=Config.EMAIL_DNS_TIMEOUT_SECONDS)
+        return cls._resolver
+
+    @classmethod
+    def cache_size(cls) -> int:
+        """Dominios con resultado cacheado"""
+        return len(cls._mx_cache)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Detiene el pool de resolución DNS (las consultas pendientes se descartan)"""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
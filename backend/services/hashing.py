@@ -0,0 +1,59 @@
+"""
+Ejecutor de hashing de contraseñas
+
+bcrypt es deliberadamente lento (decenas de ms por hash). La variante ASGI
+lo ejecuta en un pool de hilos dedicado para no bloquear el event loop.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config import Config
+
+
+class PasswordHasher:
+    """Hashing bcrypt en un ThreadPoolExecutor compartido por el proceso"""
+
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Hashea una contraseña (bloqueante)"""
+        import bcrypt
+        salt = bcrypt.gensalt()
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    @staticmethod
+    def verify_password(password: str, password_hash: str) -> bool:
+        """Verifica una contraseña contra su hash (bloqueante)"""
+        import bcrypt
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Obtiene (o crea) el pool de hilos de hashing"""
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=Config.HASHING_WORKERS,
+                thread_name_prefix='bcrypt'
+            )
+        return cls._executor
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """Hashea una contraseña sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.executor(), cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, password_hash: str) -> bool:
+        """Verifica una contraseña sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.executor(), cls.verify_password, password, password_hash)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Detiene el pool de hilos de hashing"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
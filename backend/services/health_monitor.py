@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from config import Config
+from database.connection import Database
+from utils.json_provider import PrecomputedJSON
+from utils.lifecycle import Lifecycle
+
+logger = logging.getLogger(__name__)
+
+_PROBE_QUERY = "SELECT 1"
+
+# Sonda opcional: no decide el estado (la tabla puede no existir todavía)
+_OUTBOX_PENDING_QUERY = "SELECT COUNT(*) AS pending FROM email_outbox WHERE status IN ('pending', 'sending')"
+
+LIVE = PrecomputedJSON({'status': 'ok'})
+
+_STARTING = PrecomputedJSON({
+    'status': 'not_ready',
+    'database': 'unknown',
+    'message': 'Verificación de salud pendiente'
+}, 503)
+
+_STALE = PrecomputedJSON({
+    'status': 'not_ready',
+    'database': 'unknown',
+    'message': 'La verificación de la base de datos no responde'
+}, 503)
+
+_SHUTTING_DOWN = PrecomputedJSON({
+    'status': 'not_ready',
+    'message': 'El proceso se está apagando'
+}, 503)
+
+_HEALTH_STALE = PrecomputedJSON({
+    'status': 'error',
+    'database': 'disconnected',
+    'message': 'Error de conexión a BD'
+}, 500)
+
+
+class HealthMonitor:
+    """Sondea la base de datos en segundo plano y cachea el estado de salud
+
+    Los endpoints /health y /readyz responden con el último resultado (bytes
+    ya serializados), sin consultar la base de datos. La sonda usa su propia
+    conexión con timeouts, así que una base de datos colgada no bloquea las
+    peticiones: si la sonda deja de actualizarse, el estado pasa a no listo.
+    """
+
+    _lock = threading.Lock()
+    _thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    _conn = None
+    _pool_stats: Callable[[], Optional[dict]] = Database.pool_stats
+
+    _checked_at: Optional[float] = None
+    _health: PrecomputedJSON = _STARTING
+    _ready: PrecomputedJSON = _STARTING
+
+    @classmethod
+    def _connect(cls):
+        from psycopg import connect
+        from psycopg.rows import dict_row
+
+        timeout_ms = int(Config.HEALTH_PROBE_TIMEOUT_SECONDS * 1000)
+        cls._conn = connect(
+            Config.get_db_url(),
+            autocommit=True,
+            row_factory=dict_row,
+            connect_timeout=max(1, int(Config.HEALTH_PROBE_TIMEOUT_SECONDS)),
+            options=f"-c statement_timeout={timeout_ms}"
+        )
+
+    @classmethod
+    def probe(cls) -> bool:
+        """
+        Ejecuta una sonda y actualiza el estado cacheado
+
+        Returns:
+            bool: True si la base de datos respondió
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            if cls._conn is None or cls._conn.closed:
+                cls._connect()
+            cls._conn.execute(_PROBE_QUERY)
+        except Exception as e:
+            error = str(e).strip() or e.__class__.__name__
+            if cls._conn is not None:
+                cls._conn.close()
+            cls._conn = None
+
+        db_ok = error is None
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        outbox_pending = cls._outbox_pending() if db_ok else None
+        checked_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+        health = PrecomputedJSON({
+            'status': 'ok' if db_ok else 'error',
+            'database': 'connected' if db_ok else 'disconnected',
+            'message': 'API Ánima funcionando correctamente' if db_ok else 'Error de conexión a BD'
+        }, 200 if db_ok else 500)
+
+        ready = PrecomputedJSON({
+            'status': 'ready' if db_ok else 'not_ready',
+            'database': {
+                'status': 'connected' if db_ok else 'disconnected',
+                'latency_ms': latency_ms,
+                'error': error,
+            },
+            'pool': cls._pool_stats(),
+            'email_outbox': {'pending': outbox_pending},
+            'checked_at': checked_at,
+        }, 200 if db_ok else 503)
+
+        with cls._lock:
+            cls._health = health
+            cls._ready = ready
+            cls._checked_at = time.monotonic()
+
+        if not db_ok:
+            logger.warning(f"⚠️ Sonda de salud: base de datos no disponible ({error})")
+        return db_ok
+
+    @classmethod
+    def _outbox_pending(cls) -> Optional[int]:
+        """Emails pendientes en la bandeja de salida (None si no se pudo contar)"""
+        try:
+            return cls._conn.execute(_OUTBOX_PENDING_QUERY).fetchone()['pending']
+        except Exception as e:
+            logger.debug(f"Sonda de la bandeja de emails no disponible: {e}")
+            return None
+
+    @classmethod
+    def _is_stale(cls) -> bool:
+        return cls._checked_at is not None and time.monotonic() - cls._checked_at > Config.HEALTH_STALE_SECONDS
+
+    @classmethod
+    def health(cls) -> PrecomputedJSON:
+        """Estado para /health (mismo contrato que la versión síncrona)"""
+        with cls._lock:
+            return _HEALTH_STALE if cls._is_stale() else cls._health
+
+    @classmethod
+    def readiness(cls) -> PrecomputedJSON:
+        """Estado para /readyz: base de datos, pool y cola de emails"""
+        if Lifecycle.is_shutting_down():
+            return _SHUTTING_DOWN
+        with cls._lock:
+            return _STALE if cls._is_stale() else cls._ready
+
+    @classmethod
+    def _run(cls) -> None:
+        while not cls._stop.wait(Config.HEALTH_PROBE_INTERVAL_SECONDS):
+            cls.probe()
+
+    @classmethod
+    def start(cls, pool_stats: Optional[Callable[[], Optional[dict]]] = None) -> None:
+        """
+        Ejecuta la primera sonda y arranca el sondeo periódico
+
+        Args:
+            pool_stats: Función que devuelve las estadísticas del pool a reportar
+                (por defecto las del pool síncrono)
+        """
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        if pool_stats is not None:
+            cls._pool_stats = pool_stats
+        cls.probe()
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=cls._run, name='health-monitor', daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Detiene el sondeo y cierra la conexión de la sonda"""
+        cls._stop.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=Config.HEALTH_PROBE_TIMEOUT_SECONDS + 1)
+            cls._thread = None
+        if cls._conn is not None:
+            cls._conn.close()
+            cls._conn = None
@@ -1,15 +1,32 @@
+import logging
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
 
+from config import Config
+from database.connection import Database
 from repositories.password_reset_repository import PasswordResetRepository
+from repositories.reset_attempt_repository import ResetAttemptRepository
 from repositories.user_repository import UserRepository
+from services.email_filter import EmailFilter
 from services.email_service import EmailService
-from services.user_service import UserService
+from services.hashing import PasswordHasher
+from services.reset_attempt_tracker import ResetAttemptTracker
+from utils.single_flight import MinIntervalGate, SingleFlight
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
 
 
 class PasswordResetService:
     """Servicio para gestionar la recuperación de contraseñas"""
 
+    # Peticiones concurrentes para el mismo email comparten una sola ejecución.
+    # Ambos son por proceso (solo deduplican dentro de un worker); entre workers
+    # la emisión se serializa en la BD con PasswordResetRepository.issued_recently
+    _flight = SingleFlight()
+    # Intervalo mínimo entre envíos reales al mismo email
+    _send_gate = MinIntervalGate(Config.PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS)
+
     @staticmethod
     def request_password_reset(email: str) -> Tuple[bool, Optional[str]]:
         """Solicita un código de recuperación y lo envía por email (si aplica)."""
@@ -17,19 +34,57 @@ class PasswordResetService:
             if not email or not email.strip():
                 return False, "El email es obligatorio"
 
-            user = UserRepository.find_by_email(email.lower().strip())
+            email_key = Validators.normalize_email(email)
+            result, _shared = PasswordResetService._flight.do(
+                email_key, PasswordResetService._request_password_reset, email_key
+            )
+            return result
 
-            # Por seguridad, no revelar si el email existe; devolver éxito simulando envío
-            if not user:
-                return True, None
+        except Exception as e:
+            logger.error(f"❌ Error en request_password_reset: {e}")
+            return False, "Error interno del servidor"
 
-            # Invalidar tokens anteriores
-            PasswordResetRepository.invalidate_old_tokens(user.id)
+    @staticmethod
+    def _request_password_reset(email_key: str) -> Tuple[bool, Optional[str]]:
+        """Genera y envía un código nuevo (se ejecuta una vez por grupo de peticiones)"""
+        # Envío reciente: no repetir escrituras en BD ni emails
+        if not PasswordResetService._send_gate.allow(email_key):
+            return True, None
 
-            token = PasswordResetRepository.create_reset_token(user.id)
-            if not token:
-                return False, "Error al generar código de recuperación"
+        # Email seguro inexistente: se responde sin consultar la base de datos
+        if not EmailFilter.might_exist(email_key):
+            return True, None
 
+        user = UserRepository.find_by_email(email_key)
+
+        # Por seguridad, no revelar si el email existe; devolver éxito simulando envío
+        if not user:
+            return True, None
+
+        # Token (y email, con la bandeja de salida) en la misma transacción: si el
+        # proceso muere antes del commit no queda ni el token ni el email
+        with Database.get_cursor(commit=True) as cursor:
+            # Doble clic que llegó a otro worker: el primero ya emitió el código
+            if PasswordResetRepository.issued_recently(
+                user.id, Config.PASSWORD_RESET_MIN_SEND_INTERVAL_SECONDS, cursor
+            ):
+                return True, None
+            PasswordResetRepository.invalidate_old_tokens(user.id, cursor=cursor)
+            token = PasswordResetRepository.create_reset_token(user.id, cursor=cursor)
+            if not token:
+                raise RuntimeError("No se generó el código de recuperación")
+            # Código nuevo: los intentos del anterior ya no cuentan
+            ResetAttemptRepository.clear(user.email, cursor=cursor)
+            if EmailService.uses_outbox():
+                EmailService.queue_password_reset_code(
+                    cursor,
+                    email=user.email,
+                    code=token,
+                    user_name=user.name or user.email,
+                )
+        ResetAttemptTracker.reset(user.email)
+
+        if not EmailService.uses_outbox():
             sent = EmailService.send_password_reset_code(
                 email=user.email,
                 code=token,
@@ -37,13 +92,38 @@ class PasswordResetService:
             )
 
             if not sent:
+                # Sin email no hay código reciente: un reintento inmediato debe poder emitir otro
+                PasswordResetRepository.invalidate_old_tokens(user.id)
                 return False, "Error al enviar el email"
 
-            return True, None
+        PasswordResetService._send_gate.mark(email_key)
+        return True, None
 
-        except Exception as e:
-            print(f"❌ Error en request_password_reset: {e}")
-            return False, "Error interno del servidor"
+    @staticmethod
+    def _check_code(email: str, code: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Verifica un código aplicando el límite de intentos
+
+        Args:
+            email (str): Email normalizado
+            code (str): Código recibido
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (user_id, mensaje_error)
+        """
+        # Bloqueado: se rechaza sin consultar la base de datos
+        if ResetAttemptTracker.is_locked(email):
+            return None, "Demasiados intentos fallidos. Solicita un nuevo código"
+
+        user_id = PasswordResetRepository.verify_token(email, code)
+        if user_id:
+            return user_id, None
+
+        if ResetAttemptTracker.record_failure(email):
+            PasswordResetRepository.invalidate_tokens_by_email(email)
+            return None, "Demasiados intentos fallidos. Solicita un nuevo código"
+
+        return None, "Código inválido o expirado"
 
     @staticmethod
     def verify_reset_code(email: str, code: str) -> Tuple[bool, Optional[str]]:
@@ -54,14 +134,14 @@ class PasswordResetService:
             if len(code.strip()) != 6:
                 return False, "El código debe tener 6 dígitos"
 
-            user_id = PasswordResetRepository.verify_token(email.lower().strip(), code.strip())
-            if not user_id:
-                return False, "Código inválido o expirado"
+            user_id, error = PasswordResetService._check_code(Validators.normalize_email(email), code.strip())
+            if error:
+                return False, error
 
             return True, None
 
         except Exception as e:
-            print(f"❌ Error en verify_reset_code: {e}")
+            logger.error(f"❌ Error en verify_reset_code: {e}")
             return False, "Error interno del servidor"
 
     @staticmethod
@@ -73,39 +153,38 @@ class PasswordResetService:
             if len(new_password) < 6:
                 return False, "La contraseña debe tener al menos 6 caracteres"
 
-            user_id = PasswordResetRepository.verify_token(email.lower().strip(), code.strip())
-            if not user_id:
-                return False, "Código inválido o expirado"
+            user_id, error = PasswordResetService._check_code(Validators.normalize_email(email), code.strip())
+            if error:
+                return False, error
 
             user = UserRepository.find_by_id(user_id)
             if not user:
                 return False, "Usuario no encontrado"
 
-            password_hash = UserService.hash_password(new_password)
-
-            # Actualizar contraseña
-            query = """
-                UPDATE users
-                SET password_hash = %s, updated_at = NOW()
-                WHERE id = %s
-            """
-            from database.connection import Database
+            password_hash = PasswordHasher.hash_password(new_password)
 
+            # Actualizar contraseña (invalida el usuario cacheado en todos los workers)
             with Database.get_cursor(commit=True) as cursor:
-                cursor.execute(query, (password_hash, user_id))
-                if cursor.rowcount == 0:
+                if not UserRepository.update_password(user_id, password_hash, cursor):
                     return False, "Error al actualizar la contraseña"
 
+                if EmailService.uses_outbox():
+                    EmailService.queue_password_changed_notification(
+                        cursor, email=user.email, user_name=user.name or user.email
+                    )
+
             # Marcar token como usado
             PasswordResetRepository.mark_token_as_used(user_id, code.strip())
+            ResetAttemptTracker.reset(Validators.normalize_email(email))
 
             # Notificar cambio
-            EmailService.send_password_changed_notification(email=user.email, user_name=user.name or user.email)
+            if not EmailService.uses_outbox():
+                EmailService.send_password_changed_notification(email=user.email, user_name=user.name or user.email)
 
             return True, None
 
         except Exception as e:
-            print(f"❌ Error en reset_password: {e}")
+            logger.error(f"❌ Error en reset_password: {e}")
             return False, "Error interno del servidor"
 
     @staticmethod
@@ -114,19 +193,45 @@ class PasswordResetService:
             if not email or not email.strip():
                 return False, "El email es obligatorio"
 
-            user = UserRepository.find_by_email(email.lower().strip())
-            if not user:
-                return True, None
-
-            active = PasswordResetRepository.get_active_token(user.id)
-            if active:
-                created_at = active.get('created_at') or active.get('createdat')
-                if created_at and (datetime.now() - created_at) < timedelta(minutes=2):
-                    EmailService.send_password_reset_code(email=user.email, code=active['token'], user_name=user.name or user.email)
-                    return True, None
-
-            return PasswordResetService.request_password_reset(email)
+            # Comparte la ejecución con reenvíos/solicitudes concurrentes del mismo email
+            email_key = Validators.normalize_email(email)
+            result, _shared = PasswordResetService._flight.do(
+                email_key, PasswordResetService._resend_code, email_key
+            )
+            return result
 
         except Exception as e:
-            print(f"❌ Error en resend_code: {e}")
+            logger.error(f"❌ Error en resend_code: {e}")
             return False, "Error interno del servidor"
+
+    @staticmethod
+    def _resend_code(email_key: str) -> Tuple[bool, Optional[str]]:
+        """Reenvía el código activo o genera uno nuevo"""
+        # Doble clic en "reenviar": el email ya salió hace instantes
+        if not PasswordResetService._send_gate.allow(email_key):
+            return True, None
+
+        # Email seguro inexistente: se responde sin consultar la base de datos
+        if not EmailFilter.might_exist(email_key):
+            return True, None
+
+        user = UserRepository.find_by_email(email_key)
+        if not user:
+            return True, None
+
+        active = PasswordResetRepository.get_active_token(user.id)
+        if active:
+            created_at = active.get('created_at') or active.get('createdat')
+            if created_at and (datetime.now() - created_at) < timedelta(minutes=2):
+                if EmailService.uses_outbox():
+                    with Database.get_cursor(commit=True) as cursor:
+                        EmailService.queue_password_reset_code(
+                            cursor, email=user.email, code=active['token'], user_name=user.name or user.email,
+                            expires_at=active['expires_at']
+                        )
+                else:
+                    EmailService.send_password_reset_code(email=user.email, code=active['token'], user_name=user.name or user.email)
+                PasswordResetService._send_gate.mark(email_key)
+                return True, None
+
+        return PasswordResetService._request_password_reset(email_key)
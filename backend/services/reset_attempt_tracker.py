@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config import Config
+from repositories.password_reset_repository import PasswordResetRepository
+from repositories.reset_attempt_repository import ResetAttemptRepository
+
+logger = logging.getLogger(__name__)
+
+
+class _AttemptEntry:
+    """Contador de intentos de un email (un solo código activo por email)"""
+
+    __slots__ = ('failures', 'unsynced', 'locked', 'updated_at')
+
+    def __init__(self, failures: int = 0, locked: bool = False):
+        self.failures = failures
+        self.unsynced = 0
+        self.locked = locked
+        self.updated_at = time.monotonic()
+
+
+class ResetAttemptTracker:
+    """Cuenta intentos fallidos de códigos de recuperación en memoria
+
+    Como cada email tiene un único código activo (los anteriores se invalidan al
+    emitir uno nuevo), el contador por email equivale al contador por
+    (email, código) y se reinicia cuando se emite un código nuevo. Tras
+    RESET_CODE_MAX_ATTEMPTS fallos el email queda bloqueado: los intentos se
+    rechazan sin consultar la base de datos y el código se invalida.
+
+    Los fallos se suman periódicamente a la tabla password_reset_attempts, lo que
+    comparte el límite entre workers y sobrevive a reinicios.
+    """
+
+    _entries: 'OrderedDict[str, _AttemptEntry]' = OrderedDict()
+    _lock = threading.Lock()
+    _flush_thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+
+    _counters = {
+        'verify_attempts_total': 0,
+        'verify_failures_total': 0,
+        'lockouts_total': 0,
+        'rejected_locked_total': 0,
+        'flushes_total': 0,
+    }
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        cls._counters[name] += 1
+
+    @classmethod
+    def _ttl_seconds(cls) -> float:
+        return Config.RESET_ATTEMPTS_TTL_MINUTES * 60
+
+    @classmethod
+    def is_locked(cls, email: str) -> bool:
+        """
+        Indica si el email está bloqueado (el intento no debe llegar a la BD)
+
+        Args:
+            email (str): Email normalizado
+
+        Returns:
+            bool: True si se deben rechazar los intentos
+        """
+        with cls._lock:
+            cls._count('verify_attempts_total')
+            entry = cls._entries.get(email)
+            if entry is None or not entry.locked:
+                return False
+            if time.monotonic() - entry.updated_at > cls._ttl_seconds():
+                del cls._entries[email]
+                return False
+            cls._count('rejected_locked_total')
+            return True
+
+    @classmethod
+    def record_failure(cls, email: str) -> bool:
+        """
+        Registra un intento fallido
+
+        Args:
+            email (str): Email normalizado
+
+        Returns:
+            bool: True si este fallo provocó el bloqueo (hay que invalidar el código)
+        """
+        with cls._lock:
+            cls._count('verify_failures_total')
+            entry = cls._entries.get(email)
+            if entry is None:
+                entry = _AttemptEntry()
+                cls._entries[email] = entry
+                cls._evict_overflow()
+            else:
+                cls._entries.move_to_end(email)
+
+            entry.failures += 1
+            entry.unsynced += 1
+            entry.updated_at = time.monotonic()
+
+            if not entry.locked and entry.failures >= Config.RESET_CODE_MAX_ATTEMPTS:
+                entry.locked = True
+                cls._count('lockouts_total')
+                return True
+            return False
+
+    @classmethod
+    def reset(cls, email: str) -> None:
+        """
+        Olvida el contador de un email (código nuevo o verificación exitosa)
+
+        Args:
+            email (str): Email normalizado
+        """
+        with cls._lock:
+            cls._entries.pop(email, None)
+
+    @classmethod
+    def _evict_overflow(cls) -> None:
+        """Descarta los contadores más antiguos si se supera el máximo"""
+        while len(cls._entries) > Config.RESET_ATTEMPTS_MAX_ENTRIES:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """
+        Contadores del rastreador de intentos
+
+        Returns:
+            Dict: Contadores acumulados y emails rastreados/bloqueados
+        """
+        with cls._lock:
+            snapshot = dict(cls._counters)
+            snapshot['tracked_emails'] = len(cls._entries)
+            snapshot['locked_emails'] = sum(1 for entry in cls._entries.values() if entry.locked)
+        return snapshot
+
+    @classmethod
+    def load(cls) -> None:
+        """Carga los contadores persistidos"""
+        rows = ResetAttemptRepository.load_active(Config.RESET_ATTEMPTS_TTL_MINUTES)
+        with cls._lock:
+            for row in rows:
+                cls._entries[row['email']] = _AttemptEntry(row['failed_attempts'], row['locked'])
+            cls._evict_overflow()
+
+    @classmethod
+    def flush(cls) -> None:
+        """Persiste los fallos pendientes y sincroniza con otros workers"""
+        now = time.monotonic()
+        ttl = cls._ttl_seconds()
+
+        with cls._lock:
+            # Descartar contadores vencidos
+            for email in [e for e, entry in cls._entries.items() if now - entry.updated_at > ttl]:
+                del cls._entries[email]
+
+            deltas = {
+                email: (entry.unsynced, entry.locked)
+                for email, entry in cls._entries.items() if entry.unsynced
+            }
+            for email in deltas:
+                cls._entries[email].unsynced = 0
+            locked = [email for email, entry in cls._entries.items() if entry.locked and email not in deltas]
+
+        totals = ResetAttemptRepository.add_failures(deltas)
+        if deltas and not totals:
+            # No se pudo persistir: conservar los fallos para el próximo intento
+            with cls._lock:
+                for email, (unsynced, _locked) in deltas.items():
+                    entry = cls._entries.get(email)
+                    if entry is not None:
+                        entry.unsynced += unsynced
+        # Si otro worker emitió un código nuevo, la fila ya no existe
+        still_locked = set(ResetAttemptRepository.existing(locked))
+
+        newly_locked = []
+        with cls._lock:
+            for row in totals:
+                entry = cls._entries.get(row['email'])
+                if entry is None:
+                    continue
+                entry.failures = row['failed_attempts'] + entry.unsynced
+                if not entry.locked and (row['locked'] or entry.failures >= Config.RESET_CODE_MAX_ATTEMPTS):
+                    entry.locked = True
+                    cls._count('lockouts_total')
+                    newly_locked.append(row['email'])
+            for email in locked:
+                if email not in still_locked:
+                    cls._entries.pop(email, None)
+            cls._count('flushes_total')
+
+        # El límite se alcanzó sumando los fallos de varios workers
+        for email in newly_locked:
+            PasswordResetRepository.invalidate_tokens_by_email(email)
+
+    @classmethod
+    def _run(cls) -> None:
+        while not cls._stop.wait(Config.RESET_ATTEMPTS_FLUSH_SECONDS):
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"❌ Error al sincronizar intentos de recuperación: {e}")
+
+    @classmethod
+    def start(cls) -> None:
+        """Carga el estado persistido y arranca la sincronización periódica"""
+        if cls._flush_thread is not None and cls._flush_thread.is_alive():
+            return
+        cls.load()
+        cls._stop.clear()
+        cls._flush_thread = threading.Thread(target=cls._run, name='reset-attempts-flush', daemon=True)
+        cls._flush_thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """Detiene la sincronización y persiste lo pendiente"""
+        cls._stop.set()
+        if cls._flush_thread is not None:
+            cls._flush_thread.join(timeout=5)
+            cls._flush_thread = None
+        cls.flush()
@@ -0,0 +1,130 @@
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import Config
+from database.notify_listener import NotifyListener
+from repositories.revoked_token_repository import REVOCATION_CHANNEL, RevokedTokenRepository
+from utils.revocation_set import RevocationSet
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocation:
+    """Lista de tokens JWT revocados (jti) consultada en memoria
+
+    verify_token no hace ninguna consulta: cada worker guarda los jti revocados
+    en un RevocationSet. Las revocaciones se guardan en revoked_tokens y se
+    anuncian con NOTIFY en la misma transacción; el NotifyListener del proceso
+    las agrega al conjunto local y, si la conexión se cayó, recarga la lista
+    completa. Cada entrada se descarta cuando el token habría vencido.
+    """
+
+    _revoked = RevocationSet(compact_threshold=Config.TOKEN_REVOCATION_COMPACT_THRESHOLD)
+    _started = False
+
+    @staticmethod
+    def _key(jti) -> Optional[bytes]:
+        try:
+            return uuid.UUID(str(jti)).bytes
+        except ValueError:
+            return None
+
+    @classmethod
+    def is_revoked(cls, jti) -> bool:
+        """
+        Indica si el token fue revocado (sin E/S)
+
+        Args:
+            jti: Identificador del token (los tokens anteriores no lo tienen)
+
+        Returns:
+            bool: True si se debe rechazar el token
+        """
+        if not jti:
+            return False
+        key = cls._key(jti)
+        return key is not None and key in cls._revoked
+
+    @classmethod
+    def _revoke_local(cls, payload: Dict) -> None:
+        cls._revoked.add(cls._key(payload['jti']), payload['exp'])
+
+    @classmethod
+    def _expires_at(cls, payload: Dict) -> datetime:
+        return datetime.fromtimestamp(payload['exp'], tz=timezone.utc)
+
+    @classmethod
+    def revoke(cls, payload: Dict) -> bool:
+        """
+        Revoca un token hasta su vencimiento
+
+        Args:
+            payload (Dict): Payload verificado del token (jti, user_id, exp)
+
+        Returns:
+            bool: True si la revocación quedó guardada
+        """
+        if not RevokedTokenRepository.revoke(payload['jti'], payload['user_id'], cls._expires_at(payload)):
+            return False
+        # Este worker no espera a su propia notificación
+        cls._revoke_local(payload)
+        return True
+
+    @classmethod
+    async def revoke_async(cls, payload: Dict) -> bool:
+        """Igual que revoke, con el pool asíncrono"""
+        if not await RevokedTokenRepository.revoke_async(payload['jti'], payload['user_id'], cls._expires_at(payload)):
+            return False
+        cls._revoke_local(payload)
+        return True
+
+    @classmethod
+    def _on_notify(cls, payload: str) -> None:
+        """Payload '<jti> <vencimiento epoch>' enviado por RevokedTokenRepository"""
+        jti, expires_at = payload.split(' ', 1)
+        key = cls._key(jti)
+        if key is not None:
+            cls._revoked.add(key, float(expires_at))
+
+    @classmethod
+    def load(cls) -> None:
+        """Reemplaza el conjunto local por las revocaciones vigentes de la BD"""
+        rows = RevokedTokenRepository.active()
+        cls._revoked.replace((row['jti'].bytes, row['expires_at'].timestamp()) for row in rows)
+        logger.info("🔒 Lista de tokens revocados cargada", extra={'revoked': len(cls._revoked)})
+
+    @classmethod
+    def prune(cls) -> None:
+        """Descarta localmente los tokens vencidos y borra sus filas"""
+        removed = cls._revoked.prune()
+        deleted = RevokedTokenRepository.delete_expired()
+        if removed or deleted:
+            logger.debug("🧹 Revocaciones vencidas descartadas", extra={'local': removed, 'deleted': deleted})
+
+    @classmethod
+    def metrics(cls) -> Dict[str, int]:
+        """Revocaciones en memoria y tamaño del bloque ordenado"""
+        return {'revoked': len(cls._revoked), 'memory_bytes': cls._revoked.memory_bytes()}
+
+    @classmethod
+    def start(cls) -> None:
+        """
+        Carga la lista y se suscribe a las revocaciones de otros workers
+
+        Si la carga inicial falla, la verificación falla abierta: hasta que el
+        listener conecte y recargue la lista, solo se rechazan los tokens
+        revocados desde este worker o anunciados por NOTIFY.
+        """
+        if cls._started:
+            return
+        cls._started = True
+        try:
+            cls.load()
+        except Exception as e:
+            # El listener la vuelve a cargar en cuanto conecte (on_reconnect)
+            logger.error(f"❌ No se pudo cargar la lista de tokens revocados; se aceptan hasta recargarla: {e}")
+        NotifyListener.subscribe(REVOCATION_CHANNEL, cls._on_notify, on_reconnect=cls.load)
+        NotifyListener.every(Config.TOKEN_REVOCATION_PRUNE_SECONDS, cls.prune)
+        NotifyListener.start()
@@ -1,11 +1,16 @@
+import logging
 from typing import Optional, Tuple
 from datetime import timedelta
-import bcrypt
-from email_validator import validate_email, EmailNotValidError
 from psycopg import errors as pg_errors
 
 from repositories.user_repository import UserRepository
 from models.user import User
+from services.email_filter import EmailFilter
+from services.email_validation import EmailValidation
+from services.hashing import PasswordHasher
+from utils.validators import Validators
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
@@ -13,55 +18,65 @@ class UserService:
 
     @staticmethod
     def validate_email_format(email: str) -> Tuple[bool, Optional[str]]:
-        try:
-            validate_email(email)
-            return True, None
-        except EmailNotValidError as e:
-            return False, str(e)
+        return EmailValidation.validate(email)
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-
-    @staticmethod
-    def create_user(name: str, email: str, password: str) -> Tuple[Optional[User], Optional[str]]:
-        """Valida y crea un usuario en la base de datos.
+    def prevalidate(name: str, email: str, password: str) -> Tuple[Optional[str], Optional[str]]:
+        """Única pasada de validación del registro (sin red)
 
         Returns:
-            (User, None) on success or (None, error_message) on failure
+            (dominio pendiente de comprobar por DNS o None, mensaje_error)
         """
         # Validar nombre
         if not name or len(name.strip()) < 2:
             return None, "El nombre debe tener al menos 2 caracteres"
 
-        # Validar email
-        is_valid, error_msg = UserService.validate_email_format(email)
+        # Validar email (sintaxis y dominios ya cacheados)
+        domain, (is_valid, error_msg) = EmailValidation.precheck(email)
         if not is_valid:
-            return None, "El formato del email no es válido"
+            return None, error_msg
 
         # Validar contraseña
         if not password or len(password) < 6:
             return None, "La contraseña debe tener al menos 6 caracteres"
 
-        # Verificar si el email ya existe
-        if UserRepository.email_exists(email):
-            return None, "Este correo electrónico ya está registrado"
+        return domain, None
+
+    @staticmethod
+    def create_user(name: str, email: str, password: str) -> Tuple[Optional[User], Optional[str]]:
+        """Valida y crea un usuario en la base de datos.
+
+        Una sola validación y un solo INSERT ... ON CONFLICT DO NOTHING: un email
+        duplicado no devuelve fila, sin consulta previa ni excepción. Si hay que
+        comprobar el dominio por DNS, bcrypt corre a la vez en el pool de hashing.
+
+        Returns:
+            (User, None) on success or (None, error_message) on failure
+        """
+        domain, error_msg = UserService.prevalidate(name, email, password)
+        if error_msg:
+            return None, error_msg
 
         try:
-            password_hash = UserService.hash_password(password)
-            user = UserRepository.create(name.strip(), email.lower().strip(), password_hash)
+            if domain is None:
+                password_hash = PasswordHasher.hash_password(password)
+            else:
+                hash_future = PasswordHasher.executor().submit(PasswordHasher.hash_password, password)
+                is_valid, error_msg = EmailValidation.deliverability(domain)
+                if not is_valid:
+                    hash_future.cancel()
+                    return None, error_msg
+                password_hash = hash_future.result()
+
+            user = UserRepository.create(name.strip(), Validators.normalize_email(email), password_hash)
             if not user:
-                return None, "Error al crear el usuario"
+                logger.warning(f"⚠️ Intento de registro con email duplicado: {email}")
+                return None, "Este correo electrónico ya está registrado"
+            EmailFilter.add(user.email)
             return user, None
-        except pg_errors.UniqueViolation:
-            # Captura específica para violación de constraint único (email duplicado)
-            print(f"⚠️ Intento de registro con email duplicado: {email}")
-            return None, "Este correo electrónico ya está registrado"
         except pg_errors.IntegrityError as e:
-            # Otros errores de integridad
-            print(f"❌ Error de integridad en UserService.create_user: {e}")
+            logger.error(f"❌ Error de integridad en UserService.create_user: {e}")
             return None, "Error de validación de datos"
         except Exception as e:
-            print(f"❌ Error inesperado en UserService.create_user: {e}")
-            return None, "Error interno del servidor"
\ No newline at end of file
+            logger.error(f"❌ Error inesperado en UserService.create_user: {e}")
+            return None, "Error interno del servidor"
@@ -16,6 +16,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from services.email_service import EmailService
+from utils.log import setup_logging
 
 def print_separator():
     print("\n" + "="*70)
@@ -226,4 +227,5 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
+    setup_logging()
     main()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Pruebas del buffer del registro de eventos de autenticación (sin base de datos)
+"""
+import threading
+from collections import deque
+
+import pytest
+
+from config import Config
+from repositories.auth_event_repository import AuthEventRepository
+from services.auth_event_log import AuthEventLog
+
+
+@pytest.fixture
+def log(monkeypatch):
+    """AuthEventLog con buffer de 4 eventos, lotes de 2 y estado limpio"""
+    monkeypatch.setattr(Config, 'AUTH_EVENTS_ENABLED', True)
+    monkeypatch.setattr(Config, 'AUTH_EVENTS_BUFFER_SIZE', 4)
+    monkeypatch.setattr(Config, 'AUTH_EVENTS_BATCH_SIZE', 2)
+    monkeypatch.setattr(AuthEventLog, '_high', deque())
+    monkeypatch.setattr(AuthEventLog, '_low', deque())
+    monkeypatch.setattr(AuthEventLog, '_wake', threading.Event())
+    monkeypatch.setattr(AuthEventLog, '_counters', {key: 0 for key in AuthEventLog._counters})
+    return AuthEventLog
+
+
+def _emails(rows):
+    return [row[4] for row in rows]
+
+
+def test_prioridad_alta_desplaza_a_la_baja_mas_antigua(log):
+    for i in range(4):
+        log.record('login_succeeded', True, email=f'low{i}')
+
+    log.record('login_failed', False, email='high0')
+
+    assert list(_emails(log._low)) == ['low1', 'low2', 'low3']
+    assert list(_emails(log._high)) == ['high0']
+    assert log.metrics()['dropped_low_total'] == 1
+
+
+def test_buffer_lleno_descarta_eventos_de_baja_nuevos(log):
+    for i in range(4):
+        log.record('login_succeeded', True, email=f'low{i}')
+
+    log.record('logout', True, email='nuevo')
+
+    assert 'nuevo' not in _emails(log._low)
+    assert log.metrics()['dropped_low_total'] == 1
+    assert log.metrics()['buffered'] == 4
+
+
+def test_buffer_lleno_solo_de_alta_descarta_el_nuevo(log):
+    for i in range(4):
+        log.record('login_failed', False, email=f'high{i}')
+
+    log.record('login_failed', False, email='high4')
+
+    assert _emails(log._high) == ['high0', 'high1', 'high2', 'high3']
+    assert log.metrics()['dropped_high_total'] == 1
+
+
+def test_lote_saca_primero_los_de_alta(log):
+    log.record('login_succeeded', True, email='low0')
+    log.record('login_failed', False, email='high0')
+    log.record('login_succeeded', True, email='low1')
+
+    assert _emails(log._take_batch()) == ['high0', 'low0']
+    assert _emails(log._take_batch()) == ['low1']
+    assert log._take_batch() == []
+
+
+def test_alcanzar_el_tamano_de_lote_despierta_al_escritor(log):
+    log.record('login_succeeded', True, email='a')
+    assert not log._wake.is_set()
+    log.record('login_succeeded', True, email='b')
+    assert log._wake.is_set()
+
+
+def test_flush_fallido_devuelve_el_lote_al_frente(log, monkeypatch):
+    def fail(rows):
+        raise RuntimeError('sin conexión')
+
+    monkeypatch.setattr(AuthEventRepository, 'copy_events', staticmethod(fail))
+    log.record('login_succeeded', True, email='low0')
+    log.record('login_failed', False, email='high0')
+    log.record('login_succeeded', True, email='low1')
+
+    assert log.flush() == 0
+
+    assert _emails(log._high) == ['high0']
+    assert _emails(log._low) == ['low0', 'low1']
+    assert log.metrics()['flush_failures_total'] == 1
+
+
+def test_requeue_respeta_el_limite_y_cuenta_descartes(log):
+    log.record('login_failed', False, email='high0')
+    log.record('login_succeeded', True, email='low0')
+    batch = log._take_batch()
+    # Mientras se escribía el lote llegaron eventos nuevos que llenan 3 de 4 lugares
+    for i in range(3):
+        log.record('login_succeeded', True, email=f'nuevo{i}')
+
+    log._requeue(batch)
+
+    # Solo queda un lugar: lo ocupa el de prioridad alta
+    assert _emails(log._high) == ['high0']
+    assert _emails(log._low) == ['nuevo0', 'nuevo1', 'nuevo2']
+    assert log.metrics()['dropped_low_total'] == 1
+
+
+def test_flush_escribe_en_lotes(log, monkeypatch):
+    written = []
+    monkeypatch.setattr(AuthEventRepository, 'copy_events', staticmethod(lambda rows: written.append(list(rows))))
+    for i in range(3):
+        log.record('login_succeeded', True, email=f'low{i}')
+
+    assert log.flush() == 3
+
+    assert [len(batch) for batch in written] == [2, 1]
+    metrics = log.metrics()
+    assert metrics['flushed_total'] == 3
+    assert metrics['batches_total'] == 2
+    assert metrics['buffered'] == 0
+
+
+def test_deshabilitado_no_registra(log, monkeypatch):
+    monkeypatch.setattr(Config, 'AUTH_EVENTS_ENABLED', False)
+    log.record('login_failed', False, email='a')
+    assert log.metrics()['recorded_total'] == 0
+
+
+def test_fallo_de_mantenimiento_no_impide_el_flush(log, monkeypatch):
+    written = []
+    stop = threading.Event()
+
+    def broken():
+        raise RuntimeError('sin permisos para crear particiones')
+
+    def copy(rows):
+        written.extend(rows)
+        stop.set()
+
+    monkeypatch.setattr(AuthEventLog, '_stop', stop)
+    monkeypatch.setattr(AuthEventLog, '_next_maintenance', 0.0)
+    monkeypatch.setattr(AuthEventLog, 'maintain_partitions', classmethod(lambda cls: broken()))
+    monkeypatch.setattr(AuthEventRepository, 'copy_events', staticmethod(copy))
+    monkeypatch.setattr(Config, 'AUTH_EVENTS_FLUSH_SECONDS', 0.01)
+    log.record('login_failed', False, email='high0')
+
+    thread = threading.Thread(target=log._run)
+    thread.start()
+    thread.join(5)
+
+    assert _emails(written) == ['high0']
+
+
+def test_mantenimiento_fallido_se_reprograma(log, monkeypatch):
+    def broken(months_ahead):
+        raise RuntimeError('sin conexión')
+
+    monkeypatch.setattr(AuthEventRepository, 'ensure_partitions', staticmethod(broken))
+    monkeypatch.setattr(AuthEventLog, '_next_maintenance', 0.0)
+
+    with pytest.raises(RuntimeError):
+        log.maintain_partitions()
+
+    assert log._next_maintenance > 0
@@ -0,0 +1,45 @@
+"""
+Pruebas del filtro de Bloom
+"""
+import math
+
+from utils.bloom import BloomFilter
+
+
+def test_sin_falsos_negativos():
+    bloom = BloomFilter(capacity=1000)
+    emails = [f"usuario{i}@example.com" for i in range(1000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(bloom.might_contain(email) for email in emails)
+    assert bloom.count == 1000
+
+
+def test_tasa_de_falsos_positivos_acotada():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"registrado{i}@example.com")
+
+    false_positives = sum(bloom.might_contain(f"ausente{i}@example.com") for i in range(20000))
+    # Margen amplio sobre el 1 % teórico para que la prueba no sea inestable
+    assert false_positives / 20000 < 0.02
+
+
+def test_filtro_vacio_no_contiene_nada():
+    bloom = BloomFilter(capacity=100)
+    assert not bloom.might_contain('a@example.com')
+
+
+def test_dimensionado():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    # m = -n ln p / (ln 2)^2 ~ 9.6 bits por clave, k = m/n ln 2 ~ 7
+    assert bloom.size_bits == math.ceil(-10000 * math.log(0.01) / math.log(2) ** 2)
+    assert bloom.hash_count == 7
+    assert bloom.memory_bytes() == (bloom.size_bits + 7) // 8
+
+
+def test_capacidad_minima():
+    bloom = BloomFilter(capacity=0)
+    bloom.add('a@example.com')
+    assert bloom.might_contain('a@example.com')
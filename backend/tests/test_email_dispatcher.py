@@ -0,0 +1,74 @@
+"""
+Pruebas del dispatcher de la bandeja de salida (repositorio falso)
+"""
+import pytest
+
+from config import Config
+from repositories.email_outbox_repository import EmailOutboxRepository
+from services.email_dispatcher import EmailDispatcher
+from services.email_service import EmailService
+
+
+class FakeOutbox:
+    def __init__(self, rows):
+        self.rows = rows
+        self.sent = []
+        self.failed = []
+        self.purges = 0
+
+    def claim_batch(self, worker_id, batch_size, stale_after_seconds):
+        rows, self.rows = self.rows[:batch_size], self.rows[batch_size:]
+        return rows
+
+    def mark_sent(self, ids):
+        self.sent.extend(ids)
+        return True
+
+    def mark_failed(self, outbox_id, error, retry_in_seconds, max_attempts):
+        self.failed.append((outbox_id, retry_in_seconds))
+        return True
+
+    def purge(self, retention_days):
+        self.purges += 1
+        return {'expired': 0, 'deleted': 0}
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    fake = FakeOutbox([
+        {'id': 1, 'template': 'password_reset', 'to_email': 'a@example.com', 'context': {}, 'attempts': 1},
+        {'id': 2, 'template': 'password_reset', 'to_email': 'falla@example.com', 'context': {}, 'attempts': 3},
+    ])
+    for name in ('claim_batch', 'mark_sent', 'mark_failed', 'purge'):
+        monkeypatch.setattr(EmailOutboxRepository, name, getattr(fake, name))
+    monkeypatch.setattr(EmailService, 'send_template',
+                        staticmethod(lambda template, email, context: not email.startswith('falla')))
+    monkeypatch.setattr(Config, 'EMAIL_RETRY_BASE_SECONDS', 30)
+    return fake
+
+
+def test_lote_marca_enviados_y_reprograma_fallidos(outbox):
+    dispatcher = EmailDispatcher(worker_id='prueba', batch_size=10)
+
+    assert dispatcher.dispatch_batch() == 2
+
+    assert outbox.sent == [1]
+    # Tercer intento: 30 * 2^2 segundos
+    assert outbox.failed == [(2, 120)]
+
+
+def test_backoff_con_tope():
+    dispatcher = EmailDispatcher(worker_id='prueba')
+    assert dispatcher._retry_delay(1) == Config.EMAIL_RETRY_BASE_SECONDS
+    assert dispatcher._retry_delay(30) == 3600
+
+
+def test_purga_respeta_el_intervalo(outbox, monkeypatch):
+    monkeypatch.setattr(Config, 'EMAIL_OUTBOX_PURGE_SECONDS', 3600)
+    dispatcher = EmailDispatcher(worker_id='prueba')
+
+    dispatcher.purge()
+    dispatcher.purge()
+
+    assert outbox.purges == 1
+
@@ -0,0 +1,59 @@
+"""
+Pruebas del filtro de emails registrados (sin base de datos)
+"""
+import pytest
+
+from database.notify_listener import NotifyListener
+from repositories.user_repository import UserRepository
+from services.email_filter import EmailFilter
+from utils.bloom import BloomFilter
+
+
+@pytest.fixture
+def email_filter(monkeypatch):
+    bloom = BloomFilter(1000, 0.01)
+    bloom.add('ana@example.com')
+    monkeypatch.setattr(EmailFilter, '_filter', bloom)
+    monkeypatch.setattr(EmailFilter, '_watermark', None)
+    monkeypatch.setattr(EmailFilter, '_listening_session', None)
+    monkeypatch.setattr(EmailFilter, '_synced_session', None)
+    monkeypatch.setattr(EmailFilter, '_counters', dict(EmailFilter._counters))
+    monkeypatch.setattr(UserRepository, 'emails_created_since', staticmethod(lambda since: []))
+    monkeypatch.setattr(NotifyListener, 'session', classmethod(lambda cls: 1))
+    return EmailFilter
+
+
+def test_sin_listener_los_descartes_van_a_la_base_de_datos(email_filter):
+    assert email_filter.might_exist('ana@example.com')
+    # El alta pudo hacerse en otro worker sin que llegara el aviso
+    assert email_filter.might_exist('nuevo@example.com')
+    assert email_filter._counters['unsynced_misses_total'] == 1
+
+
+def test_resincronizado_descarta_en_memoria(email_filter):
+    email_filter._on_reconnect()
+
+    assert not email_filter.might_exist('nadie@example.com')
+    assert email_filter._counters['definite_misses_total'] == 1
+
+
+def test_alta_de_otro_worker_por_notify(email_filter):
+    email_filter._on_reconnect()
+
+    email_filter._on_notify('Nuevo@Example.com')
+
+    assert email_filter.might_exist('nuevo@example.com')
+
+
+def test_reconexion_invalida_la_sincronizacion(email_filter, monkeypatch):
+    email_filter._on_reconnect()
+    monkeypatch.setattr(NotifyListener, 'session', classmethod(lambda cls: 2))
+
+    # Nueva conexión sin resincronizar: se pudieron perder avisos
+    assert email_filter.might_exist('nadie@example.com')
+
+
+def test_refresco_antes_de_escuchar_el_canal_no_sincroniza(email_filter):
+    email_filter.refresh()
+
+    assert not email_filter.is_live()
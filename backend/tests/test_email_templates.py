@@ -0,0 +1,54 @@
+"""
+Pruebas de las plantillas de email precompiladas
+"""
+import base64
+import email
+
+import pytest
+
+from services.email_templates import CompiledTemplate, EmailTemplate, EmailTemplates
+
+
+def test_render_sustituye_variables_con_y_sin_espacios():
+    template = CompiledTemplate('t', 'Hola {{ user_name }}, tu código es {{code}}.')
+    assert template.render({'user_name': 'Ana', 'code': '123456'}) == 'Hola Ana, tu código es 123456.'
+
+
+def test_render_conserva_llaves_literales():
+    template = CompiledTemplate('t', 'body { color: red; } {{ code }}')
+    assert template.render({'code': '1'}) == 'body { color: red; } 1'
+
+
+def test_render_html_escapa_los_valores():
+    template = CompiledTemplate('t.html', '<p>{{ user_name }}</p>', escape_html=True)
+    rendered = template.render({'user_name': '<script>alert("x")</script> & \'y\''})
+    assert rendered == '<p>&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; &#x27;y&#x27;</p>'
+
+
+def test_render_texto_no_escapa():
+    template = CompiledTemplate('t.txt', '{{ user_name }}')
+    assert template.render({'user_name': '<b>Ana</b>'}) == '<b>Ana</b>'
+
+
+def test_render_sin_variables_falla():
+    template = CompiledTemplate('t', '{{ user_name }} {{ code }}')
+    with pytest.raises(KeyError, match='code'):
+        template.render({'user_name': 'Ana'})
+
+
+def test_build_message_escapa_solo_la_parte_html():
+    template = EmailTemplate('prueba', 'Asunto ñ', 'Hola {{ user_name }}', '<p>Hola {{ user_name }}</p>')
+    raw = template.build_message('Anima <no-reply@anima.local>', 'ana@example.com', {'user_name': '<Ana>'})
+
+    message = email.message_from_bytes(raw)
+    text_part, html_part = message.get_payload()
+    assert base64.b64decode(text_part.get_payload()).decode('utf-8') == 'Hola <Ana>'
+    assert base64.b64decode(html_part.get_payload()).decode('utf-8') == '<p>Hola &lt;Ana&gt;</p>'
+    assert message['To'] == 'ana@example.com'
+
+
+def test_plantillas_reales_se_compilan():
+    EmailTemplates.preload()
+    rendered = EmailTemplates.get('password_reset').html.render({'user_name': 'A&B', 'code': '123456'})
+    assert 'A&amp;B' in rendered
+    assert '123456' in rendered
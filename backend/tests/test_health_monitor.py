@@ -0,0 +1,85 @@
+"""
+Pruebas de la sonda de salud (con una conexión falsa)
+"""
+import json
+
+import pytest
+
+from services.health_monitor import HealthMonitor
+
+
+class _Result:
+    def __init__(self, row):
+        self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+    closed = False
+
+    def __init__(self, select_fails=False, outbox_fails=False, pending=3):
+        self.select_fails = select_fails
+        self.outbox_fails = outbox_fails
+        self.pending = pending
+
+    def execute(self, query):
+        if 'email_outbox' in query:
+            if self.outbox_fails:
+                raise RuntimeError('relation "email_outbox" does not exist')
+            return _Result({'pending': self.pending})
+        if self.select_fails:
+            raise RuntimeError('server closed the connection')
+        return _Result({'?column?': 1})
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monkeypatch.setattr(HealthMonitor, '_pool_stats', staticmethod(lambda: None))
+    monkeypatch.setattr(HealthMonitor, '_checked_at', None)
+    monkeypatch.setattr(HealthMonitor, '_health', HealthMonitor._health)
+    monkeypatch.setattr(HealthMonitor, '_ready', HealthMonitor._ready)
+    return HealthMonitor
+
+
+def _ready(monitor):
+    response = monitor._ready
+    return response.status, json.loads(response.body)
+
+
+def test_base_de_datos_disponible(monitor, monkeypatch):
+    monkeypatch.setattr(HealthMonitor, '_conn', FakeConnection())
+
+    assert monitor.probe()
+
+    status, body = _ready(monitor)
+    assert status == 200
+    assert body['email_outbox'] == {'pending': 3}
+
+
+def test_fallo_de_la_bandeja_no_afecta_al_estado(monitor, monkeypatch):
+    monkeypatch.setattr(HealthMonitor, '_conn', FakeConnection(outbox_fails=True))
+
+    assert monitor.probe()
+
+    status, body = _ready(monitor)
+    assert status == 200
+    assert body['database']['status'] == 'connected'
+    assert body['email_outbox'] == {'pending': None}
+
+
+def test_base_de_datos_caida(monitor, monkeypatch):
+    conn = FakeConnection(select_fails=True)
+    monkeypatch.setattr(HealthMonitor, '_conn', conn)
+
+    assert not monitor.probe()
+
+    status, body = _ready(monitor)
+    assert status == 503
+    assert body['database']['status'] == 'disconnected'
+    assert body['email_outbox'] == {'pending': None}
+    assert conn.closed
@@ -0,0 +1,67 @@
+"""
+Pruebas de los ETag y las respuestas 304
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from flask import Flask, request
+
+from utils.http_cache import USER_CACHE_CONTROL, HTTPCache
+
+app = Flask(__name__)
+
+
+def _user(**changes):
+    values = {
+        'id': '3f1c0e4e-0000-4000-8000-000000000001',
+        'updated_at': datetime(2025, 1, 1, 12, 0),
+        'last_login': datetime(2025, 1, 2, 8, 30),
+    }
+    values.update(changes)
+    return SimpleNamespace(**values)
+
+
+def test_etag_estable_para_la_misma_version():
+    assert HTTPCache.user_etag(_user(), 'me') == HTTPCache.user_etag(_user(), 'me')
+
+
+def test_etag_cambia_con_la_version_y_la_representacion():
+    base = HTTPCache.user_etag(_user(), 'me')
+    assert HTTPCache.user_etag(_user(updated_at=datetime(2025, 1, 1, 12, 1)), 'me') != base
+    assert HTTPCache.user_etag(_user(last_login=None), 'me') != base
+    assert HTTPCache.user_etag(_user(), 'verify') != base
+
+
+def test_is_fresh_con_if_none_match():
+    etag = HTTPCache.user_etag(_user(), 'me')
+
+    with app.test_request_context(headers={'If-None-Match': f'"{etag}"'}):
+        assert HTTPCache.is_fresh(request, etag)
+    with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+        assert HTTPCache.is_fresh(request, etag)
+    with app.test_request_context(headers={'If-None-Match': '"otro", "' + etag + '"'}):
+        assert HTTPCache.is_fresh(request, etag)
+    with app.test_request_context(headers={'If-None-Match': '"otro"'}):
+        assert not HTTPCache.is_fresh(request, etag)
+    with app.test_request_context():
+        assert not HTTPCache.is_fresh(request, etag)
+
+
+def test_not_modified_sin_cuerpo_y_con_cabeceras():
+    with app.test_request_context():
+        response = HTTPCache.not_modified(app.response_class, 'abc')
+
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == '"abc"'
+    assert response.headers['Cache-Control'] == USER_CACHE_CONTROL
+    assert response.headers['Vary'] == 'Authorization'
+
+
+def test_tag_agrega_etag_a_la_respuesta():
+    with app.test_request_context():
+        response = HTTPCache.tag(app.response_class('{}', mimetype='application/json'), 'abc')
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] == '"abc"'
+    assert response.headers['Cache-Control'] == USER_CACHE_CONTROL
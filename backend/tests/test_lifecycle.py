@@ -0,0 +1,109 @@
+"""
+Pruebas del apagado ordenado
+"""
+import logging
+import threading
+
+import pytest
+
+from utils.lifecycle import Lifecycle
+
+
+@pytest.fixture
+def lifecycle(monkeypatch):
+    """Lifecycle con estado limpio (el real es global del proceso)"""
+    lock = threading.Lock()
+    monkeypatch.setattr(Lifecycle, '_hooks', [])
+    monkeypatch.setattr(Lifecycle, '_lock', lock)
+    monkeypatch.setattr(Lifecycle, '_idle', threading.Condition(lock))
+    monkeypatch.setattr(Lifecycle, '_in_flight', 0)
+    monkeypatch.setattr(Lifecycle, '_shutting_down', threading.Event())
+    monkeypatch.setattr(Lifecycle, '_done', False)
+    return Lifecycle
+
+
+def test_hooks_por_fase_y_en_orden_de_registro(lifecycle):
+    calls = []
+    lifecycle.register('logging', lambda: calls.append('logging'), phase='final')
+    lifecycle.register('database', lambda: calls.append('database'), phase='close')
+    lifecycle.register('auth_events', lambda: calls.append('auth_events'), phase='flush')
+    lifecycle.register('listener', lambda: calls.append('listener'), phase='stop')
+    lifecycle.register('hashing', lambda: calls.append('hashing'), phase='flush')
+
+    lifecycle.shutdown(drain_seconds=0)
+
+    assert calls == ['listener', 'auth_events', 'hashing', 'database', 'logging']
+
+
+def test_registro_duplicado_se_ignora(lifecycle):
+    calls = []
+    lifecycle.register('database', lambda: calls.append(1), phase='close')
+    lifecycle.register('database', lambda: calls.append(2), phase='close')
+
+    lifecycle.shutdown(drain_seconds=0)
+
+    assert calls == [1]
+
+
+def test_shutdown_es_idempotente_y_sigue_tras_un_error(lifecycle):
+    calls = []
+
+    def broken():
+        raise RuntimeError('boom')
+
+    lifecycle.register('broken', broken, phase='stop')
+    lifecycle.register('database', lambda: calls.append('database'), phase='close')
+
+    lifecycle.shutdown(drain_seconds=0)
+    lifecycle.shutdown(drain_seconds=0)
+
+    assert calls == ['database']
+
+
+def test_resumen_antes_de_los_hooks_finales(lifecycle, caplog):
+    order = []
+    lifecycle.register('logging', lambda: order.append('logging'), phase='final')
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            if 'Apagado completo' in record.getMessage():
+                order.append('summary')
+
+    handler = Recorder()
+    logging.getLogger('utils.lifecycle').addHandler(handler)
+    try:
+        with caplog.at_level(logging.INFO, logger='utils.lifecycle'):
+            lifecycle.shutdown(drain_seconds=0)
+    finally:
+        logging.getLogger('utils.lifecycle').removeHandler(handler)
+
+    assert order == ['summary', 'logging']
+    summary = next(r for r in caplog.records if 'Apagado completo' in r.getMessage())
+    # La duración va en el mensaje (formato texto) y en extra (formato JSON)
+    assert ' ms' in summary.getMessage()
+    assert summary.total_ms >= 0
+
+
+def test_rechaza_peticiones_nuevas_al_apagar(lifecycle):
+    assert lifecycle.request_started()
+    lifecycle.request_finished()
+
+    lifecycle.shutdown(drain_seconds=0)
+
+    assert lifecycle.is_shutting_down()
+    assert not lifecycle.request_started()
+
+
+def test_espera_a_las_peticiones_en_curso(lifecycle):
+    assert lifecycle.request_started()
+    timer = threading.Timer(0.05, lifecycle.request_finished)
+    timer.start()
+
+    assert lifecycle.wait_for_in_flight(timeout=2)
+    assert lifecycle.in_flight() == 0
+
+
+def test_plazo_de_drenado_agotado(lifecycle):
+    assert lifecycle.request_started()
+    assert not lifecycle.wait_for_in_flight(timeout=0.01)
+    lifecycle.request_finished()
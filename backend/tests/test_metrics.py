@@ -0,0 +1,42 @@
+"""
+Pruebas de la exportación de métricas de los componentes en memoria
+"""
+from prometheus_client import CollectorRegistry, generate_latest
+
+from middlewares import metrics
+from middlewares.metrics import ComponentCollector
+from services.auth_event_log import AuthEventLog
+
+
+def _render(collector):
+    registry = CollectorRegistry()
+    registry.register(collector)
+    return generate_latest(registry).decode()
+
+
+def test_exporta_contadores_y_gauges_de_los_componentes():
+    body = _render(ComponentCollector())
+
+    assert '# TYPE auth_events_dropped_low_total counter' in body
+    assert '# TYPE auth_events_buffered gauge' in body
+    assert '# TYPE reset_attempts_lockouts_total counter' in body
+    assert '# TYPE notify_listener_reconnects_total counter' in body
+    assert '# TYPE log_records_dropped_total counter' in body
+
+
+def test_valores_del_snapshot(monkeypatch):
+    monkeypatch.setattr(AuthEventLog, 'metrics', classmethod(lambda cls: {'dropped_high_total': 7, 'buffered': 3}))
+
+    body = _render(ComponentCollector({'pid': '42'}))
+
+    assert 'auth_events_dropped_high_total{pid="42"} 7.0' in body
+    assert 'auth_events_buffered{pid="42"} 3.0' in body
+
+
+def test_un_componente_que_falla_no_impide_los_demas(monkeypatch):
+    monkeypatch.setitem(metrics.COMPONENTS, 'roto', ('modulo.inexistente', 'Nada'))
+
+    body = _render(ComponentCollector())
+
+    assert 'roto_' not in body
+    assert 'log_records_dropped_total' in body
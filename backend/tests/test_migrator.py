@@ -0,0 +1,143 @@
+"""
+Pruebas del ejecutor de migraciones (sin base de datos)
+"""
+import pytest
+from psycopg import errors as pg_errors
+
+from config import Config
+from database.migrator import Migration, MigrationRunner, _plan_indexes, split_statements
+
+
+def test_split_statements_basico():
+    sql = "CREATE TABLE a (id int);\nCREATE INDEX i ON a (id);\n"
+    assert split_statements(sql) == ["CREATE TABLE a (id int)", "CREATE INDEX i ON a (id)"]
+
+
+def test_split_statements_respeta_comillas_y_comentarios():
+    sql = """
+        -- comentario; con punto y coma
+        INSERT INTO t VALUES ('a;b', 'it''s; ok');
+        /* bloque; de comentario */
+        SELECT "col;rara" FROM t;
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 2
+    assert "'a;b', 'it''s; ok'" in statements[0]
+    assert statements[1].endswith('SELECT "col;rara" FROM t')
+
+
+def test_split_statements_respeta_cuerpos_dollar_quoted():
+    sql = """
+        CREATE FUNCTION f() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'no'; RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        CREATE FUNCTION g() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql;
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 2
+    assert 'RETURN NULL;' in statements[0]
+    assert '$body$ SELECT 1; $body$' in statements[1]
+
+
+def test_split_statements_omite_vacias_y_solo_comentarios():
+    assert split_statements(";;\n-- nada\n;") == []
+
+
+def test_migraciones_del_repositorio_se_dividen_y_clasifican():
+    migrations = MigrationRunner.discover()
+    assert [m.version for m in migrations] == sorted(m.version for m in migrations)
+    for migration in migrations:
+        assert migration.statements()
+    by_name = {m.name: m for m in migrations}
+    assert by_name['drop_redundant_indexes'].concurrent
+    assert not by_name['auth_events'].concurrent
+
+
+def test_plan_indexes_recorre_los_hijos():
+    plan = {
+        'Node Type': 'Update',
+        'Plans': [{'Node Type': 'Limit', 'Plans': [
+            {'Node Type': 'Index Scan', 'Index Name': 'idx_a'},
+            {'Node Type': 'Bitmap Index Scan', 'Index Name': 'idx_b'},
+        ]}],
+    }
+    assert _plan_indexes(plan) == {'idx_a', 'idx_b'}
+
+
+class _Result:
+    def __init__(self, row=None):
+        self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeConnection:
+    """Conexión en autocommit que simula lock_timeout e índices INVALID"""
+
+    def __init__(self, lock_failures=0, leaves_invalid=False):
+        self.lock_failures = lock_failures
+        self.leaves_invalid = leaves_invalid
+        self.invalid = set()
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        self.executed.append(statement.strip().split('\n')[0])
+        if 'indisvalid' in statement:
+            return _Result({'invalid': True} if params[0] in self.invalid else None)
+        if statement.startswith('DROP INDEX CONCURRENTLY'):
+            self.invalid.discard(statement.split('"')[1])
+            return _Result()
+        if statement.startswith('CREATE INDEX CONCURRENTLY'):
+            name = statement.split()[6]
+            if self.lock_failures:
+                # Construcción interrumpida: el índice queda INVALID
+                self.lock_failures -= 1
+                self.invalid.add(name)
+                raise pg_errors.LockNotAvailable('lock timeout')
+            if self.leaves_invalid:
+                self.invalid.add(name)
+        return _Result()
+
+
+@pytest.fixture
+def concurrent_migration(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'MIGRATION_LOCK_RETRIES', 3)
+    monkeypatch.setattr(Config, 'MIGRATION_RETRY_BACKOFF_SECONDS', 0)
+    path = tmp_path / '0099_idx.sql'
+    path.write_text("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prueba ON users (created_at);\n")
+    return Migration('0099', 'idx', str(path))
+
+
+def test_reintento_borra_el_indice_invalido_antes_de_cada_intento(concurrent_migration):
+    conn = FakeConnection(lock_failures=2)
+
+    MigrationRunner._apply(conn, concurrent_migration)
+
+    creates = [i for i, s in enumerate(conn.executed) if s.startswith('CREATE INDEX')]
+    drops = [i for i, s in enumerate(conn.executed) if s.startswith('DROP INDEX')]
+    assert len(creates) == 3
+    # Los intentos 2 y 3 empiezan borrando lo que dejó el anterior
+    assert len(drops) == 2
+    assert drops[0] < creates[1] and drops[1] < creates[2]
+    assert not conn.invalid
+
+
+def test_reintentos_agotados_no_dejan_indice_invalido(concurrent_migration):
+    conn = FakeConnection(lock_failures=5)
+
+    with pytest.raises(pg_errors.LockNotAvailable):
+        MigrationRunner._apply(conn, concurrent_migration)
+
+    assert not conn.invalid
+
+
+def test_indice_invalido_tras_crearse_hace_fallar_la_migracion(concurrent_migration):
+    conn = FakeConnection(leaves_invalid=True)
+
+    with pytest.raises(RuntimeError, match='idx_prueba'):
+        MigrationRunner._apply(conn, concurrent_migration)
+
+    assert not conn.invalid
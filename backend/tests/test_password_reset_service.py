@@ -0,0 +1,87 @@
+"""
+Pruebas de la emisión de códigos de recuperación (repositorios falsos)
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from database.connection import Database
+from repositories.password_reset_repository import PasswordResetRepository
+from repositories.reset_attempt_repository import ResetAttemptRepository
+from repositories.user_repository import UserRepository
+from services.email_filter import EmailFilter
+from services.email_service import EmailService
+from services.password_reset_service import PasswordResetService
+from utils.single_flight import MinIntervalGate
+
+
+class FakeTokens:
+    def __init__(self, recent=False):
+        self.recent = recent
+        self.created = []
+        self.invalidated = 0
+
+    def issued_recently(self, user_id, min_interval_seconds, cursor):
+        return self.recent
+
+    def invalidate_old_tokens(self, user_id, cursor=None):
+        self.invalidated += 1
+        return True
+
+    def create_reset_token(self, user_id, expiration_minutes=15, cursor=None):
+        self.created.append(user_id)
+        return '123456'
+
+
+@pytest.fixture
+def reset(monkeypatch):
+    tokens = FakeTokens()
+    sent = []
+
+    @contextmanager
+    def fake_cursor(commit=False, row_factory=None):
+        yield object()
+
+    user = SimpleNamespace(id='u-1', email='ana@example.com', name='Ana')
+    monkeypatch.setattr(Database, 'get_cursor', staticmethod(fake_cursor))
+    monkeypatch.setattr(UserRepository, 'find_by_email', staticmethod(lambda email: user))
+    monkeypatch.setattr(EmailFilter, 'might_exist', classmethod(lambda cls, email: True))
+    monkeypatch.setattr(ResetAttemptRepository, 'clear', staticmethod(lambda email, cursor=None: True))
+    for name in ('issued_recently', 'invalidate_old_tokens', 'create_reset_token'):
+        monkeypatch.setattr(PasswordResetRepository, name, getattr(tokens, name))
+    monkeypatch.setattr(EmailService, 'uses_outbox', staticmethod(lambda: False))
+    monkeypatch.setattr(EmailService, 'send_password_reset_code',
+                        staticmethod(lambda email, code, user_name: sent.append(code) or True))
+    monkeypatch.setattr(PasswordResetService, '_send_gate', MinIntervalGate(30))
+    return tokens, sent
+
+
+def test_emite_y_envia_un_codigo_nuevo(reset):
+    tokens, sent = reset
+
+    assert PasswordResetService.request_password_reset('Ana@Example.com') == (True, None)
+
+    assert tokens.created == ['u-1']
+    assert sent == ['123456']
+
+
+def test_codigo_reciente_emitido_por_otro_worker(reset):
+    tokens, sent = reset
+    tokens.recent = True
+
+    assert PasswordResetService.request_password_reset('ana@example.com') == (True, None)
+
+    assert tokens.created == []
+    assert sent == []
+
+
+def test_envio_fallido_invalida_el_codigo(reset, monkeypatch):
+    tokens, _sent = reset
+    monkeypatch.setattr(EmailService, 'send_password_reset_code',
+                        staticmethod(lambda email, code, user_name: False))
+
+    assert PasswordResetService.request_password_reset('ana@example.com') == (False, "Error al enviar el email")
+
+    # Uno antes de crear el token y otro tras el fallo del envío
+    assert tokens.invalidated == 2
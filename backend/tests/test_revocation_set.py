@@ -0,0 +1,90 @@
+"""
+Pruebas del conjunto compacto de tokens revocados
+"""
+import time
+import uuid
+
+import pytest
+
+from utils.revocation_set import RevocationSet
+
+
+def _key():
+    return uuid.uuid4().bytes
+
+
+def test_agregar_y_consultar():
+    revoked = RevocationSet(compact_threshold=1024)
+    key = _key()
+    revoked.add(key, time.time() + 60)
+
+    assert key in revoked
+    assert _key() not in revoked
+    assert len(revoked) == 1
+
+
+def test_compactacion_conserva_todas_las_claves():
+    revoked = RevocationSet(compact_threshold=8)
+    keys = [_key() for _ in range(50)]
+    for key in keys:
+        revoked.add(key, time.time() + 60)
+
+    assert all(key in revoked for key in keys)
+    assert len(revoked) == 50
+    # Las altas se fusionaron en el bloque ordenado (24 bytes por entrada)
+    assert revoked.memory_bytes() >= 24 * 48
+
+
+def test_busqueda_binaria_en_los_extremos():
+    revoked = RevocationSet(compact_threshold=1)
+    keys = [bytes([value]) * 16 for value in (0x00, 0x10, 0x80, 0xff)]
+    for key in keys:
+        revoked.add(key, time.time() + 60)
+
+    assert all(key in revoked for key in keys)
+    assert bytes([0x11]) * 16 not in revoked
+
+
+def test_prune_descarta_las_vencidas():
+    revoked = RevocationSet(compact_threshold=1024)
+    now = time.time()
+    vigente, vencida = _key(), _key()
+    revoked.add(vigente, now + 60)
+    revoked.add(vencida, now - 1)
+
+    assert revoked.prune(now) == 1
+    assert vigente in revoked
+    assert vencida not in revoked
+
+
+def test_se_conserva_el_vencimiento_mas_tardio():
+    revoked = RevocationSet(compact_threshold=1024)
+    now = time.time()
+    key = _key()
+    revoked.add(key, now + 60)
+    revoked.add(key, now - 10)
+
+    assert revoked.prune(now) == 0
+    assert key in revoked
+
+
+def test_replace_carga_completa_y_conserva_altas_recientes():
+    revoked = RevocationSet(compact_threshold=1024)
+    now = time.time()
+    local, old = _key(), _key()
+    revoked.add(local, now + 60)
+    revoked.add(old, now + 60)
+    loaded = [(_key(), now + 60) for _ in range(10)]
+
+    revoked.replace(loaded + [(_key(), now - 1)])
+
+    assert all(key in revoked for key, _expires in loaded)
+    # Lo agregado localmente mientras se cargaba no se pierde
+    assert local in revoked
+    assert len(revoked) == 12
+
+
+def test_clave_de_tamano_invalido():
+    revoked = RevocationSet()
+    with pytest.raises(ValueError):
+        revoked.add(b'corta', time.time() + 60)
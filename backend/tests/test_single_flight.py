@@ -0,0 +1,97 @@
+"""
+Pruebas de la coalescencia de operaciones concurrentes
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import AsyncSingleFlight, MinIntervalGate, SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """Lanza callers hilos con la misma clave y devuelve sus (resultado, compartido)"""
+    results = []
+    lock = threading.Lock()
+
+    def call():
+        outcome = flight.do(key, fn)
+        with lock:
+            results.append(outcome)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_llamadas_concurrentes_ejecutan_una_sola_vez():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return 'ok'
+
+    threads, results = _run_concurrently(flight, 'a@example.com', slow, 5)
+    # Dar tiempo a que todos se unan a la llamada en curso
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('ok', False)] + [('ok', True)] * 4
+    assert flight.in_flight() == 0
+
+
+def test_claves_distintas_no_se_comparten():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+
+
+def test_excepcion_se_propaga_y_libera_la_clave():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flight.do('a', fail)
+    assert flight.in_flight() == 0
+    assert flight.do('a', lambda: 'de nuevo') == ('de nuevo', False)
+
+
+def test_async_single_flight_comparte_el_resultado():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'ok'
+
+    async def main():
+        return await asyncio.gather(*(flight.do('k', slow) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert sorted(results) == [('ok', False), ('ok', True), ('ok', True)]
+
+
+def test_min_interval_gate():
+    gate = MinIntervalGate(interval_seconds=60)
+    assert gate.allow('a')
+    gate.mark('a')
+    assert not gate.allow('a')
+    assert gate.allow('b')
+
+
+def test_min_interval_gate_desactivado():
+    gate = MinIntervalGate(interval_seconds=0)
+    gate.mark('a')
+    assert gate.allow('a')
@@ -0,0 +1,47 @@
+"""
+Pruebas de la lista de tokens revocados en memoria (sin base de datos)
+"""
+import logging
+import time
+import uuid
+
+import pytest
+
+from database.notify_listener import NotifyListener
+from services.token_revocation import TokenRevocation
+from utils.revocation_set import RevocationSet
+
+
+@pytest.fixture
+def revocation(monkeypatch):
+    monkeypatch.setattr(TokenRevocation, '_revoked', RevocationSet())
+    monkeypatch.setattr(TokenRevocation, '_started', False)
+    for name in ('subscribe', 'every', 'start'):
+        monkeypatch.setattr(NotifyListener, name, classmethod(lambda cls, *args, **kwargs: None))
+    return TokenRevocation
+
+
+def test_notificacion_revoca_el_token(revocation):
+    jti = str(uuid.uuid4())
+    assert not revocation.is_revoked(jti)
+
+    revocation._on_notify(f"{jti} {int(time.time()) + 60}")
+
+    assert revocation.is_revoked(jti)
+
+
+def test_tokens_sin_jti_o_con_jti_invalido(revocation):
+    assert not revocation.is_revoked(None)
+    assert not revocation.is_revoked('no-es-un-uuid')
+
+
+def test_carga_inicial_fallida_se_registra(revocation, monkeypatch, caplog):
+    def broken():
+        raise RuntimeError('sin conexión')
+
+    monkeypatch.setattr(TokenRevocation, 'load', classmethod(lambda cls: broken()))
+
+    with caplog.at_level(logging.ERROR, logger='services.token_revocation'):
+        revocation.start()
+
+    assert any('sin conexión' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,85 @@
+"""
+Pruebas de la caché con expiración
+"""
+import pytest
+
+from utils import ttl_cache
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', fake.monotonic)
+    return fake
+
+
+def test_devuelve_el_valor_hasta_que_vence(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set('a', 1)
+
+    clock.now += 59
+    assert cache.get('a') == 1
+
+    clock.now += 1
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_por_entrada(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set('corto', 1, ttl_seconds=5)
+    cache.set('largo', 2)
+
+    clock.now += 10
+    assert cache.get('corto', 'vencido') == 'vencido'
+    assert cache.get('largo') == 2
+
+
+def test_expulsa_la_menos_usada(clock):
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_ttl_o_tamano_cero_no_guarda(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=0)
+    cache.set('a', 1)
+    assert len(cache) == 0
+
+    cache = TTLCache(max_size=0, ttl_seconds=60)
+    cache.set('a', 1)
+    assert len(cache) == 0
+
+
+def test_delete_y_clear(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    assert cache.delete('a')
+    assert not cache.delete('a')
+    assert cache.get('a') is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_valores_falsos_se_cachean(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set('sin_mx', False)
+    assert cache.get('sin_mx', 'ausente') is False
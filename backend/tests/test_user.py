@@ -0,0 +1,15 @@
+"""
+Pruebas del modelo de usuario
+"""
+from models.user import User
+
+
+def test_to_dict_devuelve_una_copia():
+    user = User(id='u-1', name='Ana', email='ana@example.com', password_hash='hash')
+
+    data = user.to_dict()
+    data['email'] = 'otro@example.com'
+
+    assert user.to_dict()['email'] == 'ana@example.com'
+    assert 'password_hash' not in user.to_dict()
+    assert user.to_dict(include_password=True)['password_hash'] == 'hash'
@@ -0,0 +1,65 @@
+"""
+Filtro de Bloom en memoria
+"""
+import math
+import threading
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Conjunto probabilístico: sin falsos negativos, con falsos positivos acotados
+
+    might_contain() devuelve False solo si la clave nunca se agregó. Las
+    lecturas no toman lock; add() sí, porque activar un bit es leer y
+    escribir un byte y dos hilos podrían pisarse.
+    """
+
+    __slots__ = ('capacity', 'size_bits', 'hash_count', 'count', '_bits', '_lock')
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity (int): Claves esperadas
+            error_rate (float): Tasa de falsos positivos con esa cantidad de claves
+        """
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de un solo digest
+        digest = blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self.size_bits
+        return [(h1 + i * h2) % m for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Agrega una clave"""
+        positions = self._positions(key)
+        bits = self._bits
+        with self._lock:
+            for position in positions:
+                bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def might_contain(self, key: str) -> bool:
+        """
+        Indica si la clave puede estar en el conjunto
+
+        Returns:
+            bool: False si seguro no está; True si probablemente está
+        """
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def memory_bytes(self) -> int:
+        """Tamaño del arreglo de bits"""
+        return len(self._bits)
@@ -0,0 +1,83 @@
+"""
+Utilidades de caché HTTP (ETag y peticiones condicionales)
+"""
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+# Respuestas por usuario: ningún proxy compartido debe guardarlas y el
+# navegador revalida siempre (barato gracias a If-None-Match)
+USER_CACHE_CONTROL = 'private, no-cache'
+
+
+def _version(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else '-'
+
+
+class HTTPCache:
+    """ETags derivados de la versión de un recurso y respuestas 304"""
+
+    @staticmethod
+    def user_etag(user, variant: str = '') -> str:
+        """
+        Calcula el ETag de una representación del usuario
+
+        updated_at lo actualiza un trigger en cada UPDATE de users (incluido el
+        de last_login), así que cambia siempre que cambia el cuerpo.
+
+        Args:
+            user (User): Usuario
+            variant (str): Distingue representaciones distintas (p. ej. 'me', 'verify')
+
+        Returns:
+            str: ETag sin comillas
+        """
+        version = f"{user.id}|{_version(user.updated_at)}|{_version(user.last_login)}|{variant}"
+        return hashlib.blake2b(version.encode('utf-8'), digest_size=12).hexdigest()
+
+    @staticmethod
+    def is_fresh(request, etag: str) -> bool:
+        """
+        Indica si el cliente ya tiene esta versión (If-None-Match)
+
+        Args:
+            request: Petición actual (Flask o Quart)
+            etag (str): ETag actual sin comillas
+
+        Returns:
+            bool: True si se puede responder 304
+        """
+        return request.if_none_match.contains_weak(etag)
+
+    @staticmethod
+    def tag(response, etag: str, cache_control: str = USER_CACHE_CONTROL):
+        """
+        Agrega ETag y cabeceras de caché a una respuesta
+
+        Args:
+            response: Respuesta Flask o Quart
+            etag (str): ETag sin comillas
+            cache_control (str): Valor de Cache-Control
+
+        Returns:
+            Response: La misma respuesta
+        """
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        response.headers['Vary'] = 'Authorization'
+        return response
+
+    @staticmethod
+    def not_modified(response_class, etag: str, cache_control: str = USER_CACHE_CONTROL):
+        """
+        Respuesta 304 sin cuerpo (no se serializa nada)
+
+        Args:
+            response_class: Clase de respuesta de la aplicación
+            etag (str): ETag sin comillas
+            cache_control (str): Valor de Cache-Control
+
+        Returns:
+            Response: Respuesta 304
+        """
+        return HTTPCache.tag(response_class(status=304), etag, cache_control)
@@ -0,0 +1,79 @@
+"""
+Serialización JSON con orjson
+"""
+import dataclasses
+import decimal
+from typing import Any
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+# Claves no str (p. ej. UUID) permitidas, igual que con el proveedor por defecto
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Tipos que orjson no serializa por sí mismo"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serializa a JSON (UTF-8)
+
+    datetime, date y UUID se serializan de forma nativa: las fechas en
+    ISO 8601, igual que datetime.isoformat().
+    """
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+class OrjsonProvider(JSONProvider):
+    """Proveedor JSON de Flask (y Quart) respaldado por orjson"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Respuesta JSON sin pasar por str: orjson ya devuelve bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+class PrecomputedJSON:
+    """Cuerpo JSON constante serializado una sola vez al importar
+
+    Cada petición crea una respuesta nueva (los after_request, como CORS,
+    modifican sus cabeceras) pero reutiliza los bytes ya codificados.
+    """
+
+    __slots__ = ('body', 'status')
+
+    def __init__(self, payload: Any, status: int = 200):
+        self.body = dumps_bytes(payload)
+        self.status = status
+
+    def response(self, response_class=Response):
+        """
+        Crea la respuesta con el cuerpo precalculado
+
+        Args:
+            response_class: Clase de respuesta (quart.Response en la variante ASGI)
+
+        Returns:
+            Response: Respuesta con el cuerpo y el estado fijos
+        """
+        return response_class(self.body, status=self.status, mimetype='application/json')
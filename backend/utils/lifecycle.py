@@ -0,0 +1,173 @@
+"""
+Ciclo de vida del proceso: drenado de peticiones y apagado ordenado
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Orden de las fases de apagado ('final' corre después del resumen: el logging)
+PHASES = ('stop', 'flush', 'close', 'final')
+
+
+class Lifecycle:
+    """Apagado ordenado del proceso
+
+    Al apagar: se dejan de aceptar peticiones (503 y /readyz no listo), se
+    espera a las peticiones en curso hasta SHUTDOWN_DRAIN_SECONDS y se ejecutan
+    los hooks registrados por fase: 'stop' (hilos de fondo), 'flush' (estado en
+    memoria pendiente) y 'close' (pools y conexiones). Cada paso se mide y se
+    registra en el log; los hooks 'final' (detener el logging) corren después
+    del resumen para que este llegue a escribirse.
+    """
+
+    _hooks: List[Tuple[int, int, str, Callable[[], None]]] = []
+    _lock = threading.Lock()
+    _idle = threading.Condition(_lock)
+    _in_flight = 0
+    _shutting_down = threading.Event()
+    _done = False
+
+    @classmethod
+    def register(cls, name: str, fn: Callable[[], None], phase: str = 'flush') -> None:
+        """
+        Registra un hook de apagado
+
+        Args:
+            name (str): Nombre para el log
+            fn (Callable): Función sin argumentos
+            phase (str): 'stop', 'flush', 'close' o 'final' (dentro de una fase, en orden de registro)
+        """
+        with cls._lock:
+            if any(hook_name == name for _p, _s, hook_name, _fn in cls._hooks):
+                return
+            cls._hooks.append((PHASES.index(phase), len(cls._hooks), name, fn))
+
+    @classmethod
+    def is_shutting_down(cls) -> bool:
+        """Indica si el proceso está apagándose"""
+        return cls._shutting_down.is_set()
+
+    @classmethod
+    def request_started(cls) -> bool:
+        """
+        Registra una petición en curso
+
+        Returns:
+            bool: False si el proceso ya no acepta peticiones
+        """
+        if cls._shutting_down.is_set():
+            return False
+        with cls._lock:
+            cls._in_flight += 1
+        return True
+
+    @classmethod
+    def request_finished(cls) -> None:
+        """Registra el fin de una petición"""
+        with cls._lock:
+            cls._in_flight -= 1
+            if cls._in_flight <= 0:
+                cls._idle.notify_all()
+
+    @classmethod
+    def in_flight(cls) -> int:
+        """Peticiones en curso"""
+        with cls._lock:
+            return cls._in_flight
+
+    @classmethod
+    def wait_for_in_flight(cls, timeout: float) -> bool:
+        """
+        Espera a que terminen las peticiones en curso
+
+        Returns:
+            bool: True si se drenaron antes del plazo
+        """
+        deadline = time.monotonic() + timeout
+        with cls._lock:
+            while cls._in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                cls._idle.wait(remaining)
+        return True
+
+    @classmethod
+    def shutdown(cls, drain_seconds: float = None) -> None:
+        """
+        Apaga el proceso de forma ordenada (idempotente)
+
+        Args:
+            drain_seconds (float): Plazo para las peticiones en curso
+        """
+        with cls._lock:
+            if cls._done:
+                return
+            cls._done = True
+            hooks = sorted(cls._hooks)
+
+        started = time.perf_counter()
+        cls._shutting_down.set()
+        pending = cls.in_flight()
+        logger.info(f"⏹️  Apagando: {pending} peticiones en curso")
+
+        drain_seconds = Config.SHUTDOWN_DRAIN_SECONDS if drain_seconds is None else drain_seconds
+        if cls.wait_for_in_flight(drain_seconds):
+            # La duración va también en el mensaje: el formato texto no muestra extra=
+            drain_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"✅ Peticiones drenadas en {drain_ms} ms", extra={'drain_ms': drain_ms})
+        else:
+            logger.warning(f"⚠️ Plazo de drenado agotado con {cls.in_flight()} peticiones en curso")
+
+        final = PHASES.index('final')
+        timings = cls._run_hooks(hook for hook in hooks if hook[0] < final)
+
+        total_ms = round((time.perf_counter() - started) * 1000, 1)
+        detail = ', '.join(f"{name} {ms} ms" for name, ms in timings.items())
+        logger.info(f"🔒 Apagado completo en {total_ms} ms ({detail})", extra={
+            'total_ms': total_ms,
+            'hooks_ms': timings,
+        })
+
+        cls._run_hooks(hook for hook in hooks if hook[0] == final)
+
+    @staticmethod
+    def _run_hooks(hooks) -> Dict[str, float]:
+        """Ejecuta los hooks en orden y devuelve la duración de cada uno en ms"""
+        timings = {}
+        for _phase, _seq, name, fn in hooks:
+            hook_started = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                logger.error(f"❌ Error en hook de apagado '{name}': {e}")
+            timings[name] = round((time.perf_counter() - hook_started) * 1000, 1)
+        return timings
+
+    @classmethod
+    def init_app(cls, app) -> None:
+        """
+        Cuenta las peticiones en curso de una aplicación Flask y rechaza
+        las nuevas durante el apagado
+
+        Args:
+            app (Flask): Aplicación
+        """
+        from flask import g
+        from utils.static_responses import SHUTTING_DOWN
+
+        @app.before_request
+        def _lifecycle_start():
+            if not cls.request_started():
+                return SHUTTING_DOWN.response()
+            g._lifecycle_counted = True
+
+        @app.teardown_request
+        def _lifecycle_finish(_error=None):
+            if g.pop('_lifecycle_counted', False):
+                cls.request_finished()
@@ -0,0 +1,172 @@
+"""
+Logging estructurado y no bloqueante
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import Config
+
+# Atributos estándar de LogRecord: lo demás viene de extra= y va al JSON
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de extra= incluidos"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and key != 'sample_rate':
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar solo una fracción de los mensajes de alto volumen
+
+    La tasa se toma de extra={'sample_rate': 0.01} o, para INFO y DEBUG, de
+    LOG_SAMPLE_RATES por módulo. Las advertencias y errores nunca se muestrean.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate_for(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = getattr(record, 'sample_rate', None)
+        if rate is None:
+            rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+        return random.random() < rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que descarta (y cuenta) registros si la cola está llena
+
+    Así un stdout lento nunca bloquea a los hilos que atienden peticiones.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resuelve el mensaje y la traza en el hilo que registra (sin formatear)"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+def _parse_pairs(value: str) -> Dict[str, str]:
+    """'a=1,b.c=2' -> {'a': '1', 'b.c': '2'}"""
+    pairs = {}
+    for item in value.split(','):
+        if '=' in item:
+            key, _, val = item.partition('=')
+            pairs[key.strip()] = val.strip()
+    return pairs
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_pid: Optional[int] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging() -> None:
+    """
+    Configura el logging del proceso actual (idempotente)
+
+    Los registros pasan por una cola en memoria y un hilo en segundo plano los
+    escribe en stdout. Se llama en cada worker: el hilo escritor no sobrevive
+    a un fork.
+    """
+    global _listener, _setup_pid
+
+    with _setup_lock:
+        if _setup_pid == os.getpid():
+            return
+
+        if Config.LOG_FORMAT == 'json':
+            formatter = JSONFormatter()
+        else:
+            formatter = logging.Formatter('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(formatter)
+
+        log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter({
+            name: float(rate) for name, rate in _parse_pairs(Config.LOG_SAMPLE_RATES).items()
+        }))
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(Config.LOG_LEVEL.upper())
+
+        # Niveles por módulo: LOG_LEVELS=repositories=WARNING,services.email_service=DEBUG
+        for name, level in _parse_pairs(Config.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        _setup_pid = os.getpid()
+
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Escribe los registros pendientes y detiene el hilo escritor"""
+    global _listener, _setup_pid
+
+    with _setup_lock:
+        if _listener is not None and _setup_pid == os.getpid():
+            _listener.stop()
+        _listener = None
+        _setup_pid = None
+
+
+def dropped_records() -> int:
+    """Registros descartados por cola llena desde el arranque"""
+    return DroppingQueueHandler.dropped
@@ -31,17 +31,16 @@ class APIResponse:
         return jsonify(response), status_code
     
     @staticmethod
-    def error(message: str = "Error en la operación", status_code: int = 400, errors: Optional[Dict] = None):
+    def error_body(message: str = "Error en la operación", errors: Optional[Dict] = None) -> Dict:
         """
-        Respuesta de error
+        Cuerpo de una respuesta de error (sin serializar)
         
         Args:
             message: Mensaje de error
-            status_code: Código HTTP
             errors: Errores adicionales
             
         Returns:
-            Response: Respuesta Flask
+            Dict: Cuerpo de la respuesta
         """
         response = {
             'success': False,
@@ -51,7 +50,22 @@ class APIResponse:
         if errors:
             response['errors'] = errors
         
-        return jsonify(response), status_code
+        return response
+    
+    @staticmethod
+    def error(message: str = "Error en la operación", status_code: int = 400, errors: Optional[Dict] = None):
+        """
+        Respuesta de error
+        
+        Args:
+            message: Mensaje de error
+            status_code: Código HTTP
+            errors: Errores adicionales
+            
+        Returns:
+            Response: Respuesta Flask
+        """
+        return jsonify(APIResponse.error_body(message, errors)), status_code
     
     @staticmethod
     def created(data: Any, message: str = "Recurso creado exitosamente"):
@@ -107,18 +121,19 @@ class APIResponse:
         return APIResponse.error(message, 404)
     
     @staticmethod
-    def validation_error(message: str = "Error de validación", errors: Optional[Dict] = None):
+    def validation_error(message: str = "Error de validación", errors: Optional[Dict] = None, status_code: int = 400):
         """
         Respuesta de error de validación
         
         Args:
             message: Mensaje de error
-            errors: Errores de validación
+            errors: Errores de validación por campo
+            status_code: Código HTTP (413 si el cuerpo es demasiado grande)
             
         Returns:
             Response: Respuesta Flask
         """
-        return APIResponse.error(message, 422, errors)
+        return APIResponse.error(message, status_code, errors)
     
     @staticmethod
     def internal_error(message: str = "Error interno del servidor"):
@@ -0,0 +1,113 @@
+"""
+Conjunto compacto de identificadores con vencimiento
+"""
+import struct
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+# Registro: clave de 16 bytes (UUID) + vencimiento en segundos epoch (8 bytes)
+_KEY_SIZE = 16
+_RECORD = struct.Struct('>16sQ')
+
+
+class RevocationSet:
+    """Conjunto de claves de 16 bytes ordenado en un único bloque de bytes
+
+    Cada entrada ocupa 24 bytes (frente a ~200 de un UUID en un set de Python)
+    y la búsqueda es binaria sobre el bloque. Las altas recientes van a un
+    diccionario pequeño que se fusiona con el bloque al superar
+    compact_threshold o al podar las entradas vencidas.
+
+    Las consultas no toman el lock: el bloque se reemplaza entero (nunca se
+    modifica) y el diccionario de altas se vacía después de publicar el bloque
+    nuevo, así que una clave nunca deja de verse.
+    """
+
+    def __init__(self, compact_threshold: int = 1024):
+        self.compact_threshold = compact_threshold
+        self._blob = b''
+        self._recent: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: bytes, expires_at: float) -> None:
+        """
+        Agrega una clave hasta su vencimiento
+
+        Args:
+            key (bytes): Clave de 16 bytes
+            expires_at (float): Vencimiento en segundos epoch
+        """
+        if len(key) != _KEY_SIZE:
+            raise ValueError(f"La clave debe tener {_KEY_SIZE} bytes")
+        with self._lock:
+            self._recent[key] = max(int(expires_at), self._recent.get(key, 0))
+            if len(self._recent) >= self.compact_threshold:
+                self._compact(time.time())
+
+    def __contains__(self, key: bytes) -> bool:
+        if key in self._recent:
+            return True
+        blob = self._blob
+        lo, hi = 0, len(blob) // _RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * _RECORD.size
+            current = blob[start:start + _KEY_SIZE]
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._blob) // _RECORD.size + len(self._recent)
+
+    def prune(self, now: float = None) -> int:
+        """
+        Quita las claves vencidas
+
+        Args:
+            now (float): Instante de referencia en segundos epoch
+
+        Returns:
+            int: Entradas eliminadas
+        """
+        with self._lock:
+            before = len(self)
+            self._compact(time.time() if now is None else now)
+            return before - len(self)
+
+    def replace(self, entries: Iterable[Tuple[bytes, float]]) -> None:
+        """
+        Reemplaza todo el contenido (carga completa desde la base de datos)
+
+        Args:
+            entries: Pares (clave, vencimiento en segundos epoch)
+        """
+        merged: Dict[bytes, int] = {}
+        for key, expires_at in entries:
+            merged[key] = max(int(expires_at), merged.get(key, 0))
+        blob = b''.join(_RECORD.pack(key, merged[key]) for key in sorted(merged))
+        with self._lock:
+            # Lo agregado durante la carga ya está en el diccionario y se conserva
+            self._blob = blob
+            self._compact(time.time())
+
+    def memory_bytes(self) -> int:
+        """Tamaño aproximado del bloque ordenado"""
+        return len(self._blob)
+
+    def _compact(self, now: float) -> None:
+        """Fusiona las altas recientes con el bloque descartando lo vencido (con el lock)"""
+        merged = dict(self._recent)
+        for key, expires_at in _RECORD.iter_unpack(self._blob):
+            if expires_at > merged.get(key, 0):
+                merged[key] = expires_at
+        blob = b''.join(
+            _RECORD.pack(key, merged[key]) for key in sorted(merged) if merged[key] > now
+        )
+        self._blob = blob
+        self._recent = {}
@@ -0,0 +1,179 @@
+"""
+Validación declarativa del cuerpo JSON de las peticiones
+
+Los esquemas se construyen una sola vez al importar los controladores y se
+aplican con un decorador: el tamaño del cuerpo se comprueba antes de leerlo
+y de parsearlo, y cualquier error responde 400 (413 si es demasiado grande)
+con el formato de APIResponse.validation_error, sin llegar a los servicios.
+"""
+from functools import wraps
+from typing import Any, Dict, Optional
+
+import orjson
+
+from config import Config
+from utils.responses import APIResponse
+
+NO_DATA_MESSAGE = "No se recibieron datos"
+NOT_JSON_MESSAGE = "El cuerpo de la petición debe ser JSON"
+INVALID_JSON_MESSAGE = "El cuerpo de la petición no es un JSON válido"
+NOT_OBJECT_MESSAGE = "El cuerpo de la petición debe ser un objeto JSON"
+TOO_LARGE_MESSAGE = "El cuerpo de la petición es demasiado grande"
+INVALID_DATA_MESSAGE = "Datos inválidos"
+
+FIELD_REQUIRED = "Campo obligatorio"
+FIELD_NOT_TEXT = "Debe ser texto"
+
+
+class SchemaError(Exception):
+    """Cuerpo rechazado por un esquema"""
+
+    def __init__(self, message: str, errors: Optional[Dict[str, str]] = None, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors
+        self.status_code = status_code
+
+
+class Field:
+    """Campo de texto de un esquema"""
+
+    __slots__ = ('name', 'required', 'strip', 'max_length')
+
+    def __init__(self, name: str, required: bool = True, strip: bool = True, max_length: int = 255):
+        self.name = name
+        self.required = required
+        self.strip = strip
+        self.max_length = max_length
+
+
+class Schema:
+    """Conjunto de campos esperados en el cuerpo de una petición
+
+    Args:
+        *fields (Field): Campos del cuerpo (los demás se ignoran)
+        required_message (str): Mensaje si falta algún campo obligatorio
+        max_bytes (int): Tamaño máximo del cuerpo (por defecto MAX_JSON_BODY_BYTES)
+    """
+
+    def __init__(self, *fields: Field, required_message: str = INVALID_DATA_MESSAGE, max_bytes: Optional[int] = None):
+        # Se recorre una tupla de valores ya resueltos en cada petición
+        self._fields = tuple((f.name, f.required, f.strip, f.max_length) for f in fields)
+        self.required_message = required_message
+        self.max_bytes = max_bytes or Config.MAX_JSON_BODY_BYTES
+
+    def load(self, raw: bytes) -> Dict[str, Any]:
+        """
+        Parsea y valida el cuerpo
+
+        Args:
+            raw (bytes): Cuerpo de la petición (ya acotado a max_bytes)
+
+        Returns:
+            Dict[str, Any]: Valores de los campos del esquema ('' si son opcionales y faltan)
+
+        Raises:
+            SchemaError: Si el cuerpo no cumple el esquema
+        """
+        if len(raw) > self.max_bytes:
+            raise SchemaError(TOO_LARGE_MESSAGE, status_code=413)
+        if not raw.strip():
+            raise SchemaError(NO_DATA_MESSAGE)
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            raise SchemaError(INVALID_JSON_MESSAGE)
+        if not data:
+            raise SchemaError(NO_DATA_MESSAGE)
+        if not isinstance(data, dict):
+            raise SchemaError(NOT_OBJECT_MESSAGE)
+
+        values = {}
+        errors = {}
+        missing = False
+        for name, required, strip, max_length in self._fields:
+            value = data.get(name)
+            if value is None:
+                value = ''
+            elif type(value) is not str:
+                errors[name] = FIELD_NOT_TEXT
+                continue
+            elif strip:
+                value = value.strip()
+
+            if not value and required:
+                errors[name] = FIELD_REQUIRED
+                missing = True
+            elif len(value) > max_length:
+                errors[name] = f"Máximo {max_length} caracteres"
+            else:
+                values[name] = value
+
+        if errors:
+            raise SchemaError(self.required_message if missing else INVALID_DATA_MESSAGE, errors)
+        return values
+
+
+def validate_body(schema: Schema):
+    """
+    Decorador para vistas Flask: pasa el cuerpo validado como primer argumento
+
+    Args:
+        schema (Schema): Esquema del cuerpo
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            try:
+                body = schema.load(_read_body(schema.max_bytes))
+            except SchemaError as e:
+                return APIResponse.validation_error(e.message, e.errors, e.status_code)
+            return f(body, *args, **kwargs)
+        return decorated
+    return decorator
+
+
+def validate_body_async(schema: Schema):
+    """Igual que validate_body, para vistas de Quart (variante ASGI)"""
+    def decorator(f):
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            from quart import jsonify
+            try:
+                body = schema.load(await _read_body_async(schema.max_bytes))
+            except SchemaError as e:
+                return jsonify(APIResponse.error_body(e.message, e.errors)), e.status_code
+            return await f(body, *args, **kwargs)
+        return decorated
+    return decorator
+
+
+def _read_body(max_bytes: int) -> bytes:
+    """Lee como mucho max_bytes + 1 del cuerpo (Flask)"""
+    from flask import request
+
+    if not request.is_json:
+        raise SchemaError(NOT_JSON_MESSAGE)
+    # Content-Length declarado: se rechaza sin leer nada
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise SchemaError(TOO_LARGE_MESSAGE, status_code=413)
+    return request.stream.read(max_bytes + 1)
+
+
+async def _read_body_async(max_bytes: int) -> bytes:
+    """Lee como mucho max_bytes + 1 del cuerpo (Quart)"""
+    from quart import request
+
+    if not request.is_json:
+        raise SchemaError(NOT_JSON_MESSAGE)
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise SchemaError(TOO_LARGE_MESSAGE, status_code=413)
+
+    chunks = []
+    size = 0
+    async for chunk in request.body:
+        size += len(chunk)
+        chunks.append(chunk)
+        if size > max_bytes:
+            break
+    return b''.join(chunks)
@@ -0,0 +1,157 @@
+"""
+Coalescencia de operaciones concurrentes
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Tuple
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class _Call:
+    """Operación en curso compartida por todos los que piden la misma clave"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Ejecuta una sola vez las llamadas concurrentes con la misma clave
+
+    Mientras una operación está en curso, las llamadas con la misma clave
+    esperan y reciben su mismo resultado (o su misma excepción) en lugar de
+    ejecutarla otra vez.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Ejecuta fn o se une a la ejecución en curso para la clave
+
+        Args:
+            key: Clave de coalescencia
+            fn: Función a ejecutar
+
+        Returns:
+            Tuple[Any, bool]: (resultado, compartido) donde compartido indica
+                que el resultado vino de otra llamada
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Cantidad de operaciones en curso"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Versión para asyncio de SingleFlight (un solo event loop por instancia)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, 'asyncio.Future'] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Ejecuta la corrutina fn o espera la ejecución en curso para la clave
+
+        Returns:
+            Tuple[Any, bool]: (resultado, compartido)
+        """
+        # asyncio solo lo necesita la variante ASGI: no cargarlo en los workers WSGI
+        import asyncio
+
+        future = self._calls.get(key)
+        if future is not None:
+            # shield: si se cancela quien espera, no se cancela la operación
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evitar el aviso de excepción no recuperada si nadie esperaba
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+class MinIntervalGate:
+    """Recuerda cuándo se hizo una acción por clave para espaciarla"""
+
+    def __init__(self, interval_seconds: float, max_keys: int = 100000):
+        self.interval_seconds = interval_seconds
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._last: 'OrderedDict[Hashable, float]' = OrderedDict()
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Indica si ya pasó el intervalo mínimo desde la última acción
+
+        Args:
+            key: Clave de la acción
+
+        Returns:
+            bool: True si se puede volver a ejecutar
+        """
+        if self.interval_seconds <= 0:
+            return True
+        with self._lock:
+            last = self._last.get(key)
+            return last is None or time.monotonic() - last >= self.interval_seconds
+
+    def mark(self, key: Hashable) -> None:
+        """Registra que la acción se ejecutó ahora"""
+        if self.interval_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last[key] = now
+            self._last.move_to_end(key)
+            # Las entradas más antiguas quedan al principio
+            while self._last and (len(self._last) > self.max_keys
+                                  or now - next(iter(self._last.values())) >= self.interval_seconds):
+                self._last.popitem(last=False)
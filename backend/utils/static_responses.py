@@ -0,0 +1,73 @@
+"""
+Respuestas constantes, serializadas una sola vez al arrancar
+"""
+from utils.json_provider import PrecomputedJSON
+
+ROOT_INDEX = PrecomputedJSON({
+    'message': 'API Ánima - Backend',
+    'version': '1.0.0',
+    'endpoints': {
+        'health': '/health',
+        'livez': '/livez',
+        'readyz': '/readyz',
+        'metrics': '/metrics',
+        'auth': {
+            'register': '/auth/register',
+            'login': '/auth/login',
+            'logout': '/auth/logout',
+            'verify': '/auth/verify',
+            'me': '/auth/me'
+        },
+        'password_reset': {
+            'request': '/auth/password/request-reset',
+            'verify': '/auth/password/verify-code',
+            'reset': '/auth/password/reset-password',
+            'resend': '/auth/password/resend-code'
+        }
+    }
+})
+
+NOT_FOUND = PrecomputedJSON({
+    'success': False,
+    'message': 'Endpoint no encontrado'
+}, 404)
+
+INTERNAL_ERROR = PrecomputedJSON({
+    'success': False,
+    'message': 'Error interno del servidor'
+}, 500)
+
+NO_DATA = PrecomputedJSON({
+    'success': False,
+    'message': 'No se recibieron datos'
+}, 400)
+
+EMAIL_REQUIRED = PrecomputedJSON({
+    'success': False,
+    'message': 'El email es obligatorio'
+}, 400)
+
+INVALID_TOKEN_FORMAT = PrecomputedJSON({
+    'success': False,
+    'message': 'Formato de token inválido'
+}, 401)
+
+TOKEN_REQUIRED = PrecomputedJSON({
+    'success': False,
+    'message': 'Token de autenticación requerido'
+}, 401)
+
+TOKEN_INVALID = PrecomputedJSON({
+    'success': False,
+    'message': 'Token inválido o expirado'
+}, 401)
+
+USER_NOT_FOUND = PrecomputedJSON({
+    'success': False,
+    'message': 'Usuario no encontrado'
+}, 401)
+
+SHUTTING_DOWN = PrecomputedJSON({
+    'success': False,
+    'message': 'El servidor se está reiniciando, intenta de nuevo'
+}, 503)
@@ -7,6 +7,22 @@ from typing import Tuple
 class Validators:
     """Clase con métodos de validación reutilizables"""
     
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        """
+        Forma canónica de un email: sin espacios y en minúsculas
+        
+        Es la forma en que se guarda y la que esperan los índices sobre
+        lower(email), así que toda búsqueda por email debe pasar por aquí.
+        
+        Args:
+            email (str): Email tal como llegó
+            
+        Returns:
+            str: Email normalizado
+        """
+        return email.strip().lower() if email else ""
+    
     @staticmethod
     def validate_email(email: str) -> Tuple[bool, str]:
         """
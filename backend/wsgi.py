@@ -0,0 +1,6 @@
+"""
+Punto de entrada WSGI para servidores de producción
+"""
+from app import create_app
+
+app = create_app()
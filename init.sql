@@ -21,8 +21,7 @@ CREATE TABLE IF NOT EXISTS password_reset_tokens (
     token VARCHAR(6) NOT NULL,
     expires_at TIMESTAMP NOT NULL,
     used BOOLEAN DEFAULT false,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES users(id)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Tabla de análisis de emociones
@@ -49,16 +48,71 @@ CREATE TABLE IF NOT EXISTS music_recommendations (
     CONSTRAINT fk_user_recommendation FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Intentos fallidos de códigos de recuperación (persistencia periódica)
+CREATE TABLE IF NOT EXISTS password_reset_attempts (
+    email VARCHAR(255) PRIMARY KEY,
+    failed_attempts INTEGER NOT NULL DEFAULT 0,
+    locked BOOLEAN NOT NULL DEFAULT false,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bandeja de salida de emails (se escribe en la misma transacción que el token)
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    template VARCHAR(64) NOT NULL,
+    to_email VARCHAR(255) NOT NULL,
+    context JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP,
+    locked_by VARCHAR(128),
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    expires_at TIMESTAMP
+);
+
+-- Eventos de autenticación: solo inserciones, particionada por mes (services/auth_event_log.py)
+CREATE TABLE IF NOT EXISTS auth_events (
+    occurred_at TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(40) NOT NULL,
+    success BOOLEAN NOT NULL,
+    user_id UUID,
+    email VARCHAR(255),
+    ip INET,
+    user_agent VARCHAR(255),
+    detail VARCHAR(255)
+) PARTITION BY RANGE (occurred_at);
+
+CREATE TABLE IF NOT EXISTS auth_events_default PARTITION OF auth_events DEFAULT;
+
+-- Tokens JWT revocados antes de vencer (services/token_revocation.py)
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    revoked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Índices para mejorar el rendimiento
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_active ON users(is_active);
+-- Búsquedas por email sin distinguir mayúsculas (database/migrations/0001_users_email_lower_index.sql)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_lower ON users (lower(email));
+-- Refresco incremental del filtro de emails (services/email_filter.py)
+CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at);
 CREATE INDEX IF NOT EXISTS idx_password_tokens_user ON password_reset_tokens(user_id);
 CREATE INDEX IF NOT EXISTS idx_password_tokens_token ON password_reset_tokens(token);
 CREATE INDEX IF NOT EXISTS idx_password_tokens_expires ON password_reset_tokens(expires_at);
+CREATE INDEX IF NOT EXISTS idx_email_outbox_pending ON email_outbox(id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_email_outbox_sending ON email_outbox(locked_at) WHERE status = 'sending';
+CREATE INDEX IF NOT EXISTS idx_email_outbox_done ON email_outbox(created_at) WHERE status IN ('sent', 'failed', 'expired');
 CREATE INDEX IF NOT EXISTS idx_emotion_analyses_user ON emotion_analyses(user_id);
 CREATE INDEX IF NOT EXISTS idx_emotion_analyses_created ON emotion_analyses(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_music_recommendations_user ON music_recommendations(user_id);
 CREATE INDEX IF NOT EXISTS idx_music_recommendations_analysis ON music_recommendations(analysis_id);
+CREATE INDEX IF NOT EXISTS idx_auth_events_occurred ON auth_events USING brin (occurred_at);
+CREATE INDEX IF NOT EXISTS idx_auth_events_user ON auth_events (user_id, occurred_at) WHERE user_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens (expires_at);
 
 -- Función para actualizar updated_at automáticamente
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -75,6 +129,19 @@ CREATE TRIGGER update_users_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- auth_events solo admite inserciones (la retención borra particiones enteras)
+CREATE OR REPLACE FUNCTION auth_events_append_only()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'auth_events solo admite inserciones';
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER auth_events_no_changes
+    BEFORE UPDATE OR DELETE ON auth_events
+    FOR EACH ROW
+    EXECUTE FUNCTION auth_events_append_only();
+
 -- Función para limpiar tokens expirados (se puede ejecutar con un cron job)
 CREATE OR REPLACE FUNCTION clean_expired_tokens()
 RETURNS void AS $$